@@ -0,0 +1,342 @@
+import argparse
+import copy
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, replace
+from math import sqrt
+from pathlib import Path
+
+from sim.model import Creature, Food
+from sim.simulation import Simulation, SimulationConfig
+
+
+# Creatures per square world unit, the same as the default 50 in 20 x 20.
+CREATURE_DENSITY = 50 / (20.0 * 20.0)
+CREATURE_COUNTS = (10, 100, 1_000, 10_000, 50_000)
+QUICK_CREATURE_COUNTS = (10, 100, 1_000)
+FOOD_PER_CREATURE = (1.0, 5.0)
+DEFAULT_REPEATS = 3
+DEFAULT_TOLERANCE = 0.25
+DRAW_WIDTH_PX = 800
+MEMORY_SAMPLE_SIZE = 100_000
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """Best time of one benchmark over `repeats` runs; `items` is the work done per run."""
+
+    name: str
+    creatures: int
+    food: int
+    items: int
+    repeats: int
+    seconds: float
+
+    @property
+    def key(self) -> tuple[str, int, int]:
+        return self.name, self.creatures, self.food
+
+
+@dataclass(frozen=True)
+class Regression:
+    result: BenchResult
+    baseline: BenchResult
+
+    @property
+    def slowdown(self) -> float:
+        return self.result.seconds / self.baseline.seconds
+
+
+def bench_config(creatures: int, food_per_creature: float, seed: int = 7) -> SimulationConfig:
+    """Return a config whose world grows with the population so density stays fixed."""
+    side = sqrt(creatures / CREATURE_DENSITY)
+    return SimulationConfig(
+        width=side,
+        height=side,
+        seed=seed,
+        creatures=creatures,
+        food=int(creatures * food_per_creature),
+    )
+
+
+def _warm(sim: Simulation) -> Simulation:
+    # A few ticks in, creatures have eaten and differ in size like a real run.
+    for _ in range(3):
+        sim.step()
+    return sim
+
+
+def bench_step(sim: Simulation) -> tuple[Callable[[], None], int]:
+    return sim.step, len(sim.creatures)
+
+
+def _with_grids(sim: Simulation, query: Callable[[object], object]) -> tuple[Callable[[], None], int]:
+    # Building the grids is timed too, since step() pays for it every tick.
+    def run() -> None:
+        sim._build_neighbor_grids()
+        try:
+            for creature in sim.creatures:
+                query(creature)
+        finally:
+            sim._food_grid = None
+            sim._creature_grid = None
+
+    return run, len(sim.creatures)
+
+
+def bench_movement_angle(sim: Simulation) -> tuple[Callable[[], None], int]:
+    return _with_grids(sim, sim.movement_angle)
+
+
+def bench_nearest_food(sim: Simulation) -> tuple[Callable[[], None], int]:
+    return _with_grids(sim, sim.nearest_food)
+
+
+def bench_nearest_smaller_creature(sim: Simulation) -> tuple[Callable[[], None], int]:
+    return _with_grids(sim, sim.nearest_smaller_creature)
+
+
+def bench_nearest_larger_creature(sim: Simulation) -> tuple[Callable[[], None], int]:
+    return _with_grids(sim, sim.nearest_larger_creature)
+
+
+def bench_eat_overlapping_food(sim: Simulation) -> tuple[Callable[[], None], int]:
+    def run() -> None:
+        sim._build_neighbor_grids()
+        food_grid = sim._food_grid
+        try:
+            for creature in sim.creatures:
+                sim._eat_overlapping_food(creature, food_grid)
+        finally:
+            sim._food_grid = None
+            sim._creature_grid = None
+
+    return run, len(sim.creatures)
+
+
+def bench_resolve_creature_overlaps(sim: Simulation) -> tuple[Callable[[], None], int]:
+    return sim._resolve_creature_overlaps, len(sim.creatures)
+
+
+def bench_draw_frame(sim: Simulation) -> tuple[Callable[[], None], int]:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from sim.pygame_view import PANEL_WIDTH, build_buttons, draw_frame
+    from sim.render_cache import RenderCache
+
+    pygame.init()
+    scale = max(1, int(DRAW_WIDTH_PX // sim.world.width))
+    world_width_px = int(sim.world.width * scale)
+    screen = pygame.Surface((world_width_px + PANEL_WIDTH, int(sim.world.height * scale)))
+    buttons = build_buttons(world_width_px, 300)
+    font = pygame.font.Font(None, 28)
+    small_font = pygame.font.Font(None, 24)
+    cache = RenderCache()
+
+    def run() -> None:
+        draw_frame(screen, sim, scale, 8, buttons, font, small_font, 60, True, "", cache=cache)
+
+    return run, len(sim.creatures) + len(sim.food)
+
+
+def bench_heatmap_frame(sim: Simulation) -> tuple[Callable[[], None], int]:
+    """Time a `LayeredRenderer` frame after a pellet was eaten, which redraws the food heatmap."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+
+    from sim.lod import DEFAULT_LEVEL_OF_DETAIL
+    from sim.pygame_view import PANEL_WIDTH, LayeredRenderer, build_buttons
+
+    pygame.init()
+    scale = max(1, int(DRAW_WIDTH_PX // sim.world.width))
+    world_width_px = int(sim.world.width * scale)
+    screen = pygame.Surface((world_width_px + PANEL_WIDTH, int(sim.world.height * scale)))
+    buttons = build_buttons(world_width_px, 300)
+    font = pygame.font.Font(None, 28)
+    small_font = pygame.font.Font(None, 24)
+    # Draw food as a heatmap at every population, so small sweeps time it too.
+    renderer = LayeredRenderer(lod=replace(DEFAULT_LEVEL_OF_DETAIL, heatmap_min_food=0))
+    renderer.draw(screen, sim, scale, 8, buttons, font, small_font, 60, True, "")
+
+    def run() -> None:
+        sim.remove_food()
+        renderer.draw(screen, sim, scale, 8, buttons, font, small_font, 60, True, "")
+
+    return run, len(sim.food)
+
+
+# Each entry builds the timed callable for a warmed-up simulation, plus
+# whether the callable changes the simulation and so needs a fresh copy.
+BENCHMARKS: dict[str, tuple[Callable[[Simulation], tuple[Callable[[], None], int]], bool]] = {
+    "step": (bench_step, True),
+    "movement_angle": (bench_movement_angle, False),
+    "nearest_food": (bench_nearest_food, False),
+    "nearest_smaller_creature": (bench_nearest_smaller_creature, False),
+    "nearest_larger_creature": (bench_nearest_larger_creature, False),
+    "eat_overlapping_food": (bench_eat_overlapping_food, True),
+    "resolve_creature_overlaps": (bench_resolve_creature_overlaps, True),
+    "draw_frame": (bench_draw_frame, False),
+    "heatmap_frame": (bench_heatmap_frame, True),
+}
+
+
+def entity_bytes(make: Callable[[int], object], count: int = MEMORY_SAMPLE_SIZE) -> float:
+    """Return the bytes allocated per entity when `count` of them are kept in a list.
+
+    This includes the list slot and the boxed field values, so it is what
+    each extra pellet or creature really costs.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        entities = [make(index) for index in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return allocated / count
+
+
+def memory_lines(count: int = MEMORY_SAMPLE_SIZE) -> list[str]:
+    creature = entity_bytes(lambda index: Creature(x=index * 0.5, y=index * 0.25, mass=1.5, id=index), count)
+    food = entity_bytes(lambda index: Food(x=index * 0.5, y=index * 0.25, id=index), count)
+    return [f"Creature {creature:8.1f} bytes/entity", f"Food     {food:8.1f} bytes/entity"]
+
+
+def run_benchmark(name: str, config: SimulationConfig, repeats: int = DEFAULT_REPEATS) -> BenchResult:
+    make, mutates = BENCHMARKS[name]
+    warmed = _warm(Simulation(config))
+    best = float("inf")
+    items = 0
+    for _ in range(repeats):
+        sim = copy.deepcopy(warmed) if mutates else warmed
+        run, items = make(sim)
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return BenchResult(
+        name=name, creatures=config.creatures, food=config.food, items=items, repeats=repeats, seconds=best
+    )
+
+
+def run_benchmarks(
+    names: Iterable[str] | None = None,
+    creature_counts: Sequence[int] = CREATURE_COUNTS,
+    food_per_creature: Sequence[float] = FOOD_PER_CREATURE,
+    repeats: int = DEFAULT_REPEATS,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> list[BenchResult]:
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"unknown benchmark: {', '.join(unknown)}")
+    results = []
+    for creatures in creature_counts:
+        for ratio in food_per_creature:
+            config = bench_config(creatures, ratio)
+            for name in names:
+                result = run_benchmark(name, config, repeats)
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return results
+
+
+def write_results(results: Sequence[BenchResult], path: str | Path) -> None:
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [asdict(result) for result in results],
+    }
+    Path(path).write_text(json.dumps(document, indent=2) + "\n")
+
+
+def load_results(path: str | Path) -> list[BenchResult]:
+    document = json.loads(Path(path).read_text())
+    return [BenchResult(**result) for result in document["results"]]
+
+
+def compare_results(
+    results: Iterable[BenchResult],
+    baseline: Iterable[BenchResult],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[Regression]:
+    """Return every result more than `tolerance` slower than the baseline run of the same case."""
+    baseline_by_key = {result.key: result for result in baseline}
+    regressions = []
+    for result in results:
+        previous = baseline_by_key.get(result.key)
+        if previous is not None and result.seconds > previous.seconds * (1.0 + tolerance):
+            regressions.append(Regression(result=result, baseline=previous))
+    return regressions
+
+
+def format_result(result: BenchResult) -> str:
+    per_item_us = 1e6 * result.seconds / max(result.items, 1)
+    return (
+        f"{result.name:<26} creatures={result.creatures:<6} food={result.food:<7} "
+        f"{1e3 * result.seconds:10.3f} ms  {per_item_us:8.3f} us/item"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Time the simulation hot paths over a sweep of creature counts and food densities. "
+            "With --baseline, exit with status 1 when any case got slower than --tolerance allows."
+        )
+    )
+    parser.add_argument("names", nargs="*", help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--creatures", type=int, nargs="+", default=None, help="Creature counts to sweep")
+    parser.add_argument(
+        "--food-per-creature", type=float, nargs="+", default=list(FOOD_PER_CREATURE), help="Food densities to sweep"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help=f"Only sweep {', '.join(map(str, QUICK_CREATURE_COUNTS))} creatures"
+    )
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Runs per case; the best one counts")
+    parser.add_argument("--output", type=str, default=None, help="Write results to this JSON file")
+    parser.add_argument("--memory", action="store_true", help="Also print the memory used per creature and pellet")
+    parser.add_argument("--baseline", type=str, default=None, help="Compare against results in this JSON file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown against --baseline before failing (0.25 = 25%%)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    creature_counts = args.creatures or (QUICK_CREATURE_COUNTS if args.quick else CREATURE_COUNTS)
+    results = run_benchmarks(
+        args.names,
+        creature_counts=creature_counts,
+        food_per_creature=args.food_per_creature,
+        repeats=args.repeats,
+        progress=lambda result: print(format_result(result), flush=True),
+    )
+    if args.output:
+        write_results(results, args.output)
+    if args.memory:
+        print("\n".join(memory_lines()))
+
+    if not args.baseline:
+        return 0
+    regressions = compare_results(results, load_results(args.baseline), args.tolerance)
+    for regression in regressions:
+        print(f"SLOWER x{regression.slowdown:.2f}: {format_result(regression.result)}")
+    if regressions:
+        return 1
+    print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import os
+import struct
+from array import array
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+from sim.model import Creature, Food
+from sim.simulation import Simulation, SimulationConfig
+
+
+CHECKPOINT_MAGIC = b"EVOCKPT3"
+# magic, width, height, seed, speed, creatures, food, wrap distance,
+# engine name length, tick, next creature id, next food id, creature count,
+# food count, RNG version, has gauss_next, gauss_next, RNG word count.
+HEADER = struct.Struct("<8sddqdqqqqqqqqqqqdq")
+# Settings that never change results are not kept.
+RUNTIME_SETTINGS = ("workers", "neighbor_index", "chunk_size", "worker_hosts")
+# RNG version marking a NumPy PCG64 state (the numpy engine); Random's versions are positive.
+# Its words are the 128-bit state and increment, least significant word first, then has_uint32 and uinteger.
+NUMPY_PCG64_VERSION = -1
+PCG64_WORDS = 4
+
+
+def _rng_state(rng: Any) -> tuple[int, list[int], float | None]:
+    """Return (version, 32-bit words, gauss_next) for a Random or a NumPy PCG64 generator."""
+    if hasattr(rng, "getstate"):
+        version, words, gauss_next = rng.getstate()
+        return version, list(words), gauss_next
+    state = rng.bit_generator.state
+    if state["bit_generator"] != "PCG64":
+        raise ValueError(f"cannot checkpoint a {state['bit_generator']} generator")
+    words = [
+        (value >> (32 * index)) & 0xFFFFFFFF
+        for value in (state["state"]["state"], state["state"]["inc"])
+        for index in range(PCG64_WORDS)
+    ]
+    return NUMPY_PCG64_VERSION, [*words, state["has_uint32"], state["uinteger"]], None
+
+
+def _pcg64_state(words: array) -> dict:
+    state, inc = (
+        sum(word << (32 * index) for index, word in enumerate(words[start : start + PCG64_WORDS]))
+        for start in (0, PCG64_WORDS)
+    )
+    has_uint32, uinteger = words[2 * PCG64_WORDS :]
+    return {
+        "bit_generator": "PCG64",
+        "state": {"state": state, "inc": inc},
+        "has_uint32": has_uint32,
+        "uinteger": uinteger,
+    }
+
+
+def snapshot(sim: Simulation) -> bytes:
+    """Pack creatures, food, tick, config and RNG state into bytes."""
+    config = sim.config
+    engine = config.engine.encode()
+    rng_version, rng_words, gauss_next = _rng_state(sim._rng)
+    header = HEADER.pack(
+        CHECKPOINT_MAGIC,
+        config.width,
+        config.height,
+        config.seed,
+        config.speed,
+        config.creatures,
+        config.food,
+        config.wrap_distance,
+        len(engine),
+        sim.tick,
+        sim._next_creature_id,
+        sim._next_food_id,
+        len(sim.creatures),
+        len(sim.food),
+        rng_version,
+        gauss_next is not None,
+        gauss_next or 0.0,
+        len(rng_words),
+    )
+    creatures = sim.creatures
+    parts = [
+        header,
+        engine,
+        array("I", rng_words).tobytes(),
+        array("d", [creature.x for creature in creatures]).tobytes(),
+        array("d", [creature.y for creature in creatures]).tobytes(),
+        array("d", [creature.mass for creature in creatures]).tobytes(),
+        array("q", [creature.food_eaten for creature in creatures]).tobytes(),
+        array("q", [creature.id for creature in creatures]).tobytes(),
+        array("d", [pellet.x for pellet in sim.food]).tobytes(),
+        array("d", [pellet.y for pellet in sim.food]).tobytes(),
+        array("q", [pellet.id for pellet in sim.food]).tobytes(),
+    ]
+    return b"".join(parts)
+
+
+def _read_array(data: memoryview, offset: int, typecode: str, count: int) -> tuple[array, int]:
+    values = array(typecode)
+    end = offset + values.itemsize * count
+    values.frombytes(data[offset:end])
+    return values, end
+
+
+def restore(
+    data: bytes, simulation_class: type[Simulation] | None = None, settings: SimulationConfig | None = None
+) -> Simulation:
+    """Rebuild a simulation bit for bit from `snapshot()` bytes.
+
+    Without `simulation_class`, the class follows the saved engine name.
+    The unsaved runtime-only settings (workers, neighbor index, chunk size,
+    worker hosts) come from `settings`, or are the defaults without it.
+    """
+    view = memoryview(data)
+    (
+        magic,
+        width,
+        height,
+        seed,
+        speed,
+        creature_config,
+        food_config,
+        wrap_distance,
+        engine_length,
+        tick,
+        next_creature_id,
+        next_food_id,
+        creature_count,
+        food_count,
+        rng_version,
+        has_gauss_next,
+        gauss_next,
+        rng_word_count,
+    ) = HEADER.unpack_from(view)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError("not a simulation checkpoint")
+    offset = HEADER.size
+    engine = bytes(view[offset : offset + engine_length]).decode()
+    offset += engine_length
+    rng_words, offset = _read_array(view, offset, "I", rng_word_count)
+    xs, offset = _read_array(view, offset, "d", creature_count)
+    ys, offset = _read_array(view, offset, "d", creature_count)
+    masses, offset = _read_array(view, offset, "d", creature_count)
+    food_eaten, offset = _read_array(view, offset, "q", creature_count)
+    ids, offset = _read_array(view, offset, "q", creature_count)
+    food_xs, offset = _read_array(view, offset, "d", food_count)
+    food_ys, offset = _read_array(view, offset, "d", food_count)
+    food_ids, offset = _read_array(view, offset, "q", food_count)
+    if simulation_class is None:
+        simulation_class = Simulation
+        if engine == "numpy":
+            from sim.numpy_engine import NumpySimulation
+
+            simulation_class = NumpySimulation
+        elif engine == "parallel":
+            from sim.parallel import ParallelSimulation
+
+            simulation_class = ParallelSimulation
+        elif engine == "chunked":
+            from sim.chunks import ChunkedSimulation
+
+            simulation_class = ChunkedSimulation
+        elif engine == "distributed":
+            from sim.distributed import DistributedSimulation
+
+            simulation_class = DistributedSimulation
+
+    config = SimulationConfig(
+        width=width,
+        height=height,
+        seed=seed,
+        speed=speed,
+        creatures=creature_config,
+        food=food_config,
+        engine=engine,
+        wrap_distance=bool(wrap_distance),
+    )
+    if settings is not None:
+        config = replace(config, **{name: getattr(settings, name) for name in RUNTIME_SETTINGS})
+    return simulation_class.from_state(
+        config=config,
+        tick=tick,
+        creatures=[
+            Creature(x=x, y=y, mass=mass, food_eaten=eaten, id=creature_id)
+            for x, y, mass, eaten, creature_id in zip(xs, ys, masses, food_eaten, ids)
+        ],
+        food=[Food(x=x, y=y, id=food_id) for x, y, food_id in zip(food_xs, food_ys, food_ids)],
+        rng_state=(
+            _pcg64_state(rng_words)
+            if rng_version == NUMPY_PCG64_VERSION
+            else (rng_version, tuple(rng_words), gauss_next if has_gauss_next else None)
+        ),
+        next_creature_id=next_creature_id,
+        next_food_id=next_food_id,
+    )
+
+
+def branch(sim: Simulation) -> Simulation:
+    """Return an independent copy of `sim` for what-if experiments."""
+    return restore(snapshot(sim), simulation_class=type(sim))
+
+
+def save_checkpoint(sim: Simulation, path: str | Path) -> None:
+    """Write a checkpoint so a crash mid-write never leaves a broken file."""
+    path = Path(path)
+    temporary_path = path.with_name(path.name + ".tmp")
+    with open(temporary_path, "wb") as out:
+        out.write(snapshot(sim))
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path: str | Path, settings: SimulationConfig | None = None) -> Simulation:
+    return restore(Path(path).read_bytes(), settings=settings)
+
+
+class Checkpointer:
+    """Save a checkpoint every `every` ticks during a long run."""
+
+    def __init__(self, path: str | Path, every: int) -> None:
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.path = Path(path)
+        self.every = every
+        self.saved_tick: int | None = None
+
+    def record(self, sim: Simulation) -> None:
+        if sim.tick % self.every == 0 and sim.tick != self.saved_tick:
+            save_checkpoint(sim, self.path)
+            self.saved_tick = sim.tick
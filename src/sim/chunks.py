@@ -0,0 +1,109 @@
+from sim.model import Creature, Food
+from sim.simulation import Simulation, SimulationConfig
+from sim.spatial import SpatialGrid
+
+
+class ChunkedSimulation(Simulation):
+    """A simulation for large, mostly empty worlds, split into square chunks.
+
+    Food and creatures live in chunks of `config.chunk_size` units that
+    persist from tick to tick. A creature is handed to its new chunk as it
+    moves, and an eaten pellet leaves its chunk right away. Nothing is rebuilt
+    from the whole world each tick, so a tick only touches the creatures and
+    the chunks around them; chunks without creatures are never visited, and
+    their food simply waits.
+
+    Every item's order is its id, which is also its position in the lists of
+    `Simulation`, so results are the same as `Simulation` with plain grids.
+    `food` is assembled from the chunks when read. After moving creatures by
+    hand, call `rebuild_chunks()`.
+    """
+
+    def _reset_state(self, config: SimulationConfig) -> None:
+        if config.chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        super()._reset_state(config)
+
+    @property
+    def creatures(self) -> list[Creature]:
+        return self._creatures
+
+    @creatures.setter
+    def creatures(self, creatures: list[Creature]) -> None:
+        self._creatures = creatures
+        self.rebuild_chunks()
+
+    @property
+    def food(self) -> list[Food]:
+        return sorted(self.food_chunks, key=self.food_chunks.order_of)
+
+    @food.setter
+    def food(self, pellets: list[Food]) -> None:
+        self.food_chunks = SpatialGrid(self.world, self.config.chunk_size, distance=self._distance)
+        for pellet in pellets:
+            self.food_chunks.insert(pellet, pellet.id)
+        self.food_changed()
+
+    def rebuild_chunks(self) -> None:
+        """Put every creature back into the chunk matching its position."""
+        self.creature_chunks = SpatialGrid(self.world, self.config.chunk_size, distance=self._distance)
+        for creature in self.creatures:
+            self.creature_chunks.insert(creature, creature.id)
+
+    def active_chunks(self) -> list[tuple[int, int]]:
+        """Return the (column, row) of every chunk a tick has to visit: those with creatures."""
+        return self.creature_chunks.occupied_cells()
+
+    def _build_neighbor_grids(self) -> None:
+        # Creatures added or removed behind our back leave the counts out of step.
+        if len(self.creature_chunks) != len(self.creatures):
+            self.rebuild_chunks()
+        self._food_grid = self.food_chunks
+        self._creature_grid = self.creature_chunks
+
+    def _remove_eaten_food(self, eaten_food: list[Food]) -> None:
+        # Eaten pellets already left their chunks while the tick ran.
+        if eaten_food:
+            self.food_changed()
+
+    def _resolve_creature_overlaps(self) -> None:
+        everyone = list(self.creatures)
+        super()._resolve_creature_overlaps()
+        if len(self.creatures) == len(everyone):
+            return
+        survivors = {id(creature) for creature in self.creatures}
+        for creature in everyone:
+            if id(creature) not in survivors and creature in self.creature_chunks:
+                self.creature_chunks.remove(creature)
+
+    def add_creature(self) -> None:
+        super().add_creature()
+        creature = self.creatures[-1]
+        self.creature_chunks.insert(creature, creature.id)
+
+    def remove_creature(self) -> None:
+        if len(self.creatures) <= 1:
+            return
+        creature = self.creatures[-1]
+        super().remove_creature()
+        if creature in self.creature_chunks:
+            self.creature_chunks.remove(creature)
+
+    def add_food(self) -> None:
+        pellet = self._spawn_food()
+        self.food_chunks.insert(pellet, pellet.id)
+        self.food_changed()
+        self.config.food = len(self.food_chunks)
+
+    def remove_food(self) -> None:
+        if not len(self.food_chunks):
+            return
+        self.food_chunks.remove(max(self.food_chunks, key=self.food_chunks.order_of))
+        self.food_changed()
+        self.config.food = len(self.food_chunks)
+
+    def respawn_food(self) -> None:
+        while len(self.food_chunks) < self.config.food:
+            pellet = self._spawn_food()
+            self.food_chunks.insert(pellet, pellet.id)
+            self.food_changed()
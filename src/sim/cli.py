@@ -1,6 +1,9 @@
 import argparse
+import os
+import sys
+from pathlib import Path
 
-from sim.simulation import Simulation, SimulationConfig
+from sim.simulation import Simulation, SimulationConfig, create_simulation
 from sim.text_render import format_creature_position
 
 
@@ -8,9 +11,12 @@ def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run a tiny deterministic creature sim.")
     parser.add_argument(
         "--mode",
-        choices=("text", "pygame"),
+        choices=("text", "pygame", "replay", "sweep", "video", "worker"),
         default="pygame",
-        help="Run in text mode or pygame graphics mode",
+        help=(
+            "Run in text mode, pygame graphics mode, replay a --replay file, a headless parameter sweep, "
+            "render a headless video, or serve distributed-engine strips on --listen"
+        ),
     )
     parser.add_argument("--width", type=float, default=40.0, help="World width (continuous units)")
     parser.add_argument("--height", type=float, default=30.0, help="World height (continuous units)")
@@ -19,8 +25,49 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--speed", type=float, default=0.08, help="Movement speed in world units per tick")
     parser.add_argument("--creatures", type=int, default=50, help="Number of creatures")
     parser.add_argument("--food", type=int, default=250, help="Number of food pellets")
+    parser.add_argument(
+        "--engine",
+        choices=("reference", "numpy", "parallel", "chunked", "distributed"),
+        default="reference",
+        help=(
+            "Step engine: reference Python loop, batched NumPy arrays, steering split across --workers processes, "
+            "persistent chunks for large sparse worlds, or world strips on --workers processes or --worker-hosts"
+        ),
+    )
+    parser.add_argument(
+        "--chunk-size", type=float, default=16.0, help="Chunk side in world units for the chunked engine"
+    )
+    parser.add_argument(
+        "--neighbor-index",
+        choices=("grid", "kdtree"),
+        default="grid",
+        help="Neighbor lookups in the reference engines: uniform grid or k-d tree (same results)",
+    )
+    parser.add_argument(
+        "--wrap-distance",
+        action="store_true",
+        help="Measure distances across the wrapping world edges instead of the legacy plain distances",
+    )
     parser.add_argument("--scale", type=int, default=30, help="Pixels per world unit in pygame mode")
     parser.add_argument("--fps", type=int, default=120, help="Frames per second in pygame mode")
+    parser.add_argument(
+        "--ticks-per-frame",
+        type=int,
+        default=1,
+        help="Simulation ticks per drawn frame in pygame and video modes (0 = as many as fit in each frame)",
+    )
+    parser.add_argument(
+        "--background",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Step the simulation in a separate process in pygame mode so drawing never waits on it",
+    )
+    parser.add_argument(
+        "--level-of-detail",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Draw huge populations with points, no labels and a food heatmap in pygame mode (default: true)",
+    )
     parser.add_argument("--radius", type=int, default=8, help="Creature circle radius in pixels")
     parser.add_argument(
         "--screenshot-dir",
@@ -32,13 +79,83 @@ def build_parser() -> argparse.ArgumentParser:
         "--show-coords",
         action=argparse.BooleanOptionalAction,
         default=True,
-        help="Print x, y coordinates each tick in text mode (default: true)",
+        help="Print x, y coordinates each tick in text mode (default: true, skipped with --metrics)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each phase of a tick; text mode prints a summary, pygame mode shows it in the panel",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        default=None,
+        help="Stream population metrics to this file in text mode (.csv or NDJSON, .gz to compress)",
+    )
+    parser.add_argument("--metrics-every", type=int, default=1000, help="Write a --metrics row every N ticks")
+    parser.add_argument(
+        "--metrics-format",
+        choices=("ndjson", "csv"),
+        default=None,
+        help="Format for --metrics (default: from the file name)",
+    )
+    parser.add_argument("--record", type=str, default=None, help="Write a binary trajectory file in text mode")
+    parser.add_argument("--record-stride", type=int, default=1, help="Record every Nth tick with --record")
+    parser.add_argument("--checkpoint", type=str, default=None, help="Checkpoint file for text mode runs")
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=100000, help="Save --checkpoint every N ticks in text mode"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from --checkpoint if it exists; --ticks still counts from tick 0",
+    )
+    parser.add_argument("--replay", type=str, default=None, help="Trajectory file to show in replay mode")
+    parser.add_argument("--sweep-seeds", type=int, default=10, help="Seeds per sweep setting, counting up from --seed")
+    parser.add_argument("--sweep-speeds", type=float, nargs="+", help="Speeds to try in sweep mode (default: --speed)")
+    parser.add_argument(
+        "--sweep-creatures", type=int, nargs="+", help="Creature counts to try in sweep mode (default: --creatures)"
+    )
+    parser.add_argument("--sweep-food", type=int, nargs="+", help="Food counts to try in sweep mode (default: --food)")
+    parser.add_argument(
+        "--video-dir", type=str, default="frames", help="Directory for numbered PNG frames in video mode"
+    )
+    parser.add_argument(
+        "--video-pipe",
+        type=str,
+        default=None,
+        help="Encoder command that reads raw RGB24 frames on stdin in video mode; may use {width} and {height}",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes in sweep mode or for the parallel and distributed engines (default: all cores)",
+    )
+    parser.add_argument(
+        "--worker-hosts",
+        nargs="+",
+        metavar="HOST:PORT",
+        help="Run the distributed engine on workers started with --mode worker, one strip each",
+    )
+    parser.add_argument(
+        "--listen",
+        type=str,
+        default="127.0.0.1:7878",
+        metavar="HOST:PORT",
+        help="Address a --mode worker process listens on; only listen on trusted networks",
     )
     return parser
 
 
 def main() -> None:
     args = build_parser().parse_args()
+    if args.mode == "worker":
+        from sim.distributed import parse_address, serve_tcp
+
+        serve_tcp(*parse_address(args.listen))
+        return
+
     config = SimulationConfig(
         width=args.width,
         height=args.height,
@@ -46,12 +163,55 @@ def main() -> None:
         speed=args.speed,
         creatures=args.creatures,
         food=args.food,
+        engine=args.engine,
+        workers=args.workers or os.cpu_count() or 1,
+        neighbor_index=args.neighbor_index,
+        wrap_distance=args.wrap_distance,
+        chunk_size=args.chunk_size,
+        worker_hosts=tuple(args.worker_hosts or ()),
     )
-    sim = Simulation(config)
 
-    if args.mode == "pygame":
+    if args.mode == "sweep":
+        from sim.sweep import run_sweep, sweep_configs, write_summaries_csv
+
+        configs = sweep_configs(
+            config,
+            seeds=range(args.seed, args.seed + args.sweep_seeds),
+            speeds=args.sweep_speeds,
+            creatures=args.sweep_creatures,
+            food=args.sweep_food,
+        )
+        write_summaries_csv(run_sweep(configs, ticks=args.ticks, workers=args.workers), sys.stdout)
+        return
+
+    if args.resume and args.record and Path(args.record).exists():
+        # A finished trajectory cannot be extended, and opening it for writing would wipe the earlier ticks.
+        raise SystemExit(f"--record {args.record} already exists; record a resumed run to a new file")
+
+    if args.resume and args.checkpoint and Path(args.checkpoint).exists():
+        from sim.checkpoint import load_checkpoint
+
+        # The checkpoint picks the engine and world; how it runs still follows the command line.
+        sim = load_checkpoint(args.checkpoint, settings=config)
+        config = sim.config
+    else:
+        sim = create_simulation(config)
+
+    try:
+        run_mode(args, sim, config)
+    finally:
+        # Stops the worker processes or connections of the parallel and distributed engines.
+        sim.close()
+
+
+def run_mode(args: argparse.Namespace, sim: Simulation, config: SimulationConfig) -> None:
+    """Show, record or print `sim` as the parsed command line asks."""
+    if args.mode in ("pygame", "replay"):
         from sim.pygame_view import run_pygame
 
+        if args.mode == "replay" and not args.replay:
+            raise SystemExit("--mode replay needs --replay PATH")
+
         run_pygame(
             sim=sim,
             config=config,
@@ -60,7 +220,28 @@ def main() -> None:
             fps=args.fps,
             radius_px=args.radius,
             screenshot_dir=args.screenshot_dir,
+            replay_path=args.replay if args.mode == "replay" else None,
+            ticks_per_frame=args.ticks_per_frame,
+            background=args.background,
+            level_of_detail=args.level_of_detail,
+            profile=args.profile,
+        )
+        return
+
+    if args.mode == "video":
+        from sim.video import export_video
+
+        frames = export_video(
+            sim,
+            ticks=args.ticks,
+            scale=args.scale,
+            radius_px=args.radius,
+            frame_dir=None if args.video_pipe else args.video_dir,
+            pipe_command=args.video_pipe,
+            ticks_per_frame=max(args.ticks_per_frame, 1),
+            level_of_detail=args.level_of_detail,
         )
+        print(f"Wrote {frames} frames to {args.video_pipe or args.video_dir}")
         return
 
     first_creature = sim.creatures[0]
@@ -69,10 +250,55 @@ def main() -> None:
         f"world={sim.world.width:.1f}x{sim.world.height:.1f}, seed={args.seed}, "
         f"speed={args.speed}, creatures={len(sim.creatures)}"
     )
-    for _ in range(args.ticks):
-        sim.step()
-        if args.show_coords:
-            print(f"Tick {sim.tick:>2}: {format_creature_position(sim.creatures[0])}")
+    recorder = None
+    metrics = None
+    try:
+        if args.record:
+            from sim.trajectory import TrajectoryRecorder
+
+            out = open(args.record, "wb")
+            try:
+                recorder = TrajectoryRecorder(out, stride=args.record_stride)
+            except BaseException:
+                out.close()
+                raise
+            recorder.record(sim)
+        checkpointer = None
+        if args.checkpoint:
+            from sim.checkpoint import Checkpointer
+
+            checkpointer = Checkpointer(args.checkpoint, every=args.checkpoint_every)
+        if args.metrics:
+            from sim.metrics import MetricsWriter
+
+            metrics = MetricsWriter(args.metrics, every=args.metrics_every, metrics_format=args.metrics_format)
+            metrics.record(sim)
+        profiler = None
+        if args.profile:
+            from sim.profiler import TickProfiler
+
+            profiler = TickProfiler()
+            sim.observer = profiler
+        for _ in range(args.ticks - sim.tick):
+            sim.step()
+            if recorder is not None:
+                recorder.record(sim)
+            if checkpointer is not None:
+                checkpointer.record(sim)
+            if metrics is not None:
+                metrics.record(sim)
+            elif args.show_coords:
+                print(f"Tick {sim.tick:>2}: {format_creature_position(sim.creatures[0])}")
+    finally:
+        if recorder is not None:
+            try:
+                recorder.close()
+            finally:
+                recorder.out.close()
+        if metrics is not None:
+            metrics.close()
+    if profiler is not None:
+        print("\n".join(profiler.summary_lines()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,727 @@
+import os
+import pickle
+import socket
+import struct
+import traceback
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from math import cos, inf, sin, sqrt
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from time import perf_counter
+from typing import Any, Protocol
+
+from sim.model import Creature, Food, World
+from sim.parallel import ParallelSimulation
+from sim.simulation import FOOD_RADIUS, MAX_CREATURE_AWARENESS_MULTIPLIER, Simulation, SimulationConfig
+from sim.spatial import SpatialGrid, distance_for
+from sim.stats import PopulationStats
+
+
+# x, y, mass, food_eaten, id of a creature and x, y, id of a pellet, as sent between processes.
+CreatureRow = tuple[float, float, float, int, int]
+FoodRow = tuple[float, float, int]
+# Strip bounds are computed in floating point on both ends, so halos reach a hair further than needed.
+HALO_SLACK = 1e-6
+# Food halo width in mean pellet spacings; a nearest pellet further out than that is looked up on every worker.
+FOOD_HALO_SPACINGS = 3.0
+# Message length prefix on TCP connections.
+FRAME_HEADER = struct.Struct("<Q")
+WORKER_COMMANDS = (
+    "load_creatures",
+    "load_food",
+    "gather_creatures",
+    "gather_food",
+    "add",
+    "remove",
+    "bands",
+    "steer",
+    "nearest_food",
+    "finish_steer",
+    "eat",
+    "prey",
+)
+
+
+def strip_of(x: float, width: float, strips: int) -> int:
+    """Return the strip owning `x`; strip k covers [k * width / strips, (k + 1) * width / strips)."""
+    return min(int(x * strips / width), strips - 1)
+
+
+def strip_gap(x: float, strip: int, width: float, strips: int) -> float:
+    """Return how far `x` lies from a strip along the wrapping x axis, or 0 inside it."""
+    left = strip * width / strips
+    right = (strip + 1) * width / strips
+    if left <= x <= right:
+        return 0.0
+    return min((left - x) % width, (x - right) % width)
+
+
+def _creature_row(creature: Creature) -> CreatureRow:
+    return creature.x, creature.y, creature.mass, creature.food_eaten, creature.id
+
+
+def _creature_from_row(row: CreatureRow) -> Creature:
+    x, y, mass, food_eaten, creature_id = row
+    return Creature(x=x, y=y, mass=mass, food_eaten=food_eaten, id=creature_id)
+
+
+def _food_row(pellet: Food) -> FoodRow:
+    return pellet.x, pellet.y, pellet.id
+
+
+def _food_from_row(row: FoodRow) -> Food:
+    x, y, food_id = row
+    return Food(x=x, y=y, id=food_id)
+
+
+def _by_id(item: Creature | Food) -> int:
+    return item.id
+
+
+class Transport(Protocol):
+    """A message channel between the coordinator and one worker; messages are picklable objects."""
+
+    def send(self, message: Any) -> None: ...
+
+    def recv(self) -> Any: ...
+
+    def close(self) -> None: ...
+
+
+class PipeTransport:
+    """Messages over a multiprocessing pipe, to a worker process on this machine."""
+
+    def __init__(self, connection: Connection, process: Process | None = None) -> None:
+        self.connection = connection
+        self.process = process
+        self._started_by = os.getpid()
+
+    def send(self, message: Any) -> None:
+        self.connection.send(message)
+
+    def recv(self) -> Any:
+        return self.connection.recv()
+
+    def close(self) -> None:
+        self.connection.close()
+        # Only the process that started the worker can join it, not a forked copy of this transport.
+        if self.process is not None and os.getpid() == self._started_by:
+            self.process.join(timeout=5.0)
+
+
+class SocketTransport:
+    """Length-prefixed pickled messages over a TCP connection.
+
+    Pickle runs whatever the other end sends, so only connect coordinators
+    and workers over a network you trust.
+    """
+
+    def __init__(self, connection: socket.socket, process: Process | None = None) -> None:
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connection = connection
+        self.process = process
+        self._started_by = os.getpid()
+
+    def send(self, message: Any) -> None:
+        data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        self.connection.sendall(FRAME_HEADER.pack(len(data)) + data)
+
+    def _read(self, size: int) -> bytearray:
+        data = bytearray(size)
+        view = memoryview(data)
+        received = 0
+        while received < size:
+            count = self.connection.recv_into(view[received:])
+            if not count:
+                raise EOFError("connection closed")
+            received += count
+        return data
+
+    def recv(self) -> Any:
+        (size,) = FRAME_HEADER.unpack(self._read(FRAME_HEADER.size))
+        return pickle.loads(self._read(size))
+
+    def close(self) -> None:
+        self.connection.close()
+        # Only the process that started the worker can join it, not a forked copy of this transport.
+        if self.process is not None and os.getpid() == self._started_by:
+            self.process.join(timeout=5.0)
+
+
+class _StripView(ParallelSimulation):
+    """A strip's own creatures and food plus ghost copies of its neighbors', for one phase of a tick."""
+
+    def _reset_state(self, config: SimulationConfig) -> None:
+        super()._reset_state(config)
+        # Nearest pellet per creature id, found before steering; some come from other workers.
+        self.food_targets: dict[int, Food | None] = {}
+
+    def nearest_food(self, creature: Creature) -> Food | None:
+        return self.food_targets[creature.id]
+
+
+class StripWorker:
+    """The creatures and food of one strip of the world and the parts of a tick that run on them.
+
+    Each method is a command the coordinator sends. Creatures and food are
+    kept in id order; ghosts from other strips only live for one command.
+    """
+
+    def __init__(self, config: SimulationConfig, strip: int, strips: int) -> None:
+        self.config = config
+        self.strip = strip
+        self.strips = strips
+        self.world = World(width=config.width, height=config.height)
+        self._distance = distance_for(self.world, config.wrap_distance)
+        self.left = strip * config.width / strips
+        self.right = (strip + 1) * config.width / strips
+        self.creatures: list[Creature] = []
+        self.food: list[Food] = []
+        self._steering: _StripView | None = None
+
+    def _owns(self, x: float) -> bool:
+        return strip_of(x, self.world.width, self.strips) == self.strip
+
+    def _max_radius(self) -> float:
+        return max((creature.radius for creature in self.creatures), default=0.0)
+
+    def _view(self, tick: int, ghost_creatures: Iterable[CreatureRow], ghost_food: Iterable[FoodRow]) -> _StripView:
+        view = _StripView.__new__(_StripView)
+        view._reset_state(self.config)
+        view.tick = tick
+        view.creatures = sorted([*self.creatures, *map(_creature_from_row, ghost_creatures)], key=_by_id)
+        view.food = sorted([*self.food, *map(_food_from_row, ghost_food)], key=_by_id)
+        return view
+
+    def load_creatures(self, rows: list[CreatureRow]) -> None:
+        self.creatures = sorted(map(_creature_from_row, rows), key=_by_id)
+
+    def load_food(self, rows: list[FoodRow]) -> None:
+        self.food = sorted(map(_food_from_row, rows), key=_by_id)
+
+    def gather_creatures(self) -> list[CreatureRow]:
+        return [_creature_row(creature) for creature in self.creatures]
+
+    def gather_food(self) -> list[FoodRow]:
+        return [_food_row(pellet) for pellet in self.food]
+
+    def add(self, creature_rows: list[CreatureRow], food_rows: list[FoodRow]) -> None:
+        if creature_rows:
+            self.creatures.extend(map(_creature_from_row, creature_rows))
+            self.creatures.sort(key=_by_id)
+        if food_rows:
+            self.food.extend(map(_food_from_row, food_rows))
+            self.food.sort(key=_by_id)
+
+    def remove(self, creature_ids: list[int], food_ids: list[int]) -> None:
+        if creature_ids:
+            self.creatures = [creature for creature in self.creatures if creature.id not in creature_ids]
+        if food_ids:
+            self.food = [pellet for pellet in self.food if pellet.id not in food_ids]
+
+    def bands(
+        self,
+        arrivals: list[CreatureRow],
+        creature_width: float,
+        food_width: float | None,
+    ) -> tuple[list[CreatureRow], list[FoodRow]]:
+        """Take in creatures that moved here, then return own items within the widths of the strip edges."""
+        self.add(arrivals, [])
+        if self.strips == 1:
+            return [], []
+        left, right = self.left, self.right
+
+        def in_band(x: float, width: float) -> bool:
+            return min(x - left, right - x) <= width + HALO_SLACK
+
+        creatures = [_creature_row(creature) for creature in self.creatures if in_band(creature.x, creature_width)]
+        if food_width is None:
+            return creatures, []
+        return creatures, [_food_row(pellet) for pellet in self.food if in_band(pellet.x, food_width)]
+
+    def _food_limit(self, x: float, food_width: float) -> float:
+        """Return the distance within which a nearest pellet from this strip's view is certainly the nearest."""
+        if self.strips == 1 or 2 * food_width >= self.world.width - (self.right - self.left):
+            return inf
+        # Unseen pellets lie beyond the food halo on either side.
+        return min(x - self.left, self.right - x) + food_width - HALO_SLACK
+
+    def steer(
+        self,
+        tick: int,
+        ghost_creatures: list[CreatureRow],
+        ghost_food: list[FoodRow],
+        food_width: float,
+    ) -> tuple[list[tuple[int, float, float]], list[CreatureRow]]:
+        """Steer own creatures from the start-of-tick state.
+
+        Returns the (id, x, y) of creatures whose nearest pellet may lie
+        beyond the food halo, and, if there are none, the creatures that
+        moved off this strip. Otherwise the moves wait for `finish_steer`.
+        """
+        view = self._view(tick, ghost_creatures, ghost_food)
+        view._build_neighbor_grids()
+        food_grid = view._food_grid
+        unresolved = []
+        for creature in self.creatures:
+            target = food_grid.nearest(creature.x, creature.y)
+            limit = self._food_limit(creature.x, food_width)
+            if limit == inf or (
+                target is not None and self._distance((creature.x, creature.y), (target.x, target.y)) < limit
+            ):
+                view.food_targets[creature.id] = target
+            else:
+                unresolved.append((creature.id, creature.x, creature.y))
+        self._steering = view
+        if unresolved:
+            return unresolved, []
+        return [], self._finish_steering()
+
+    def nearest_food(self, points: list[tuple[float, float]]) -> list[tuple[float, int, float, float] | None]:
+        """Return the (distance, id, x, y) of the nearest own pellet to each point."""
+        grid = SpatialGrid(self.world, distance=self._distance)
+        for pellet in self.food:
+            grid.insert(pellet, pellet.id)
+        answers: list[tuple[float, int, float, float] | None] = []
+        for x, y in points:
+            pellet = grid.nearest(x, y)
+            if pellet is None:
+                answers.append(None)
+            else:
+                answers.append((self._distance((x, y), (pellet.x, pellet.y)), pellet.id, pellet.x, pellet.y))
+        return answers
+
+    def finish_steer(self, targets: dict[int, FoodRow | None]) -> list[CreatureRow]:
+        """Steer with the nearest pellets found on all workers and return the creatures that left."""
+        if self._steering is None:
+            return []
+        for creature_id, row in targets.items():
+            self._steering.food_targets[creature_id] = None if row is None else _food_from_row(row)
+        return self._finish_steering()
+
+    def _finish_steering(self) -> list[CreatureRow]:
+        view = self._steering
+        self._steering = None
+        moves = []
+        try:
+            for creature in self.creatures:
+                angle = view.movement_angle(creature)
+                speed = view.movement_speed(creature)
+                moves.append((speed * cos(angle), speed * sin(angle)))
+        finally:
+            view._food_grid = None
+            view._creature_grid = None
+        for creature, (dx, dy) in zip(self.creatures, moves):
+            creature.move(self.world, dx, dy)
+
+        staying = [creature for creature in self.creatures if self._owns(creature.x)]
+        if len(staying) == len(self.creatures):
+            return []
+        leaving = [_creature_row(creature) for creature in self.creatures if not self._owns(creature.x)]
+        self.creatures = staying
+        return leaving
+
+    def eat(self, ghost_creatures: list[CreatureRow], ghost_food: list[FoodRow]) -> tuple[int, float]:
+        """Give every pellet a creature reaches to the lowest id reaching it.
+
+        Returns how many own pellets were eaten and the largest own radius.
+        """
+        view = self._view(0, ghost_creatures, ghost_food)
+        grid = SpatialGrid(self.world, distance=self._distance)
+        for pellet in view.food:
+            grid.insert(pellet, pellet.id)
+        eaters: dict[int, Creature] = {}
+        for creature in view.creatures:
+            reach = creature.radius + FOOD_RADIUS
+            for pellet in grid.within(creature.x, creature.y, reach):
+                if self._distance((creature.x, creature.y), (pellet.x, pellet.y)) <= reach:
+                    eaters.setdefault(pellet.id, creature)
+
+        meals = Counter(eater.id for eater in eaters.values())
+        for creature in self.creatures:
+            if meals[creature.id]:
+                view.feed_creature(creature, meals[creature.id])
+        remaining = [pellet for pellet in self.food if pellet.id not in eaters]
+        eaten = len(self.food) - len(remaining)
+        self.food = remaining
+        return eaten, self._max_radius()
+
+    def prey(self, ghost_creatures: list[CreatureRow], max_radius: float) -> tuple[int, int, float]:
+        """Let each creature be eaten by the biggest overlapping creature bigger than itself.
+
+        Everyone is judged from the sizes at the start of this phase, so it
+        does not matter which strip decides. Returns how many own creatures
+        were eaten, how many are left and the largest own radius.
+        """
+        view = self._view(0, ghost_creatures, [])
+        grid = SpatialGrid(self.world, distance=self._distance)
+        for creature in view.creatures:
+            grid.insert(creature, creature.id)
+        size = view.creature_size
+        eater_of: dict[int, Creature] = {}
+        for creature in view.creatures:
+            eater = None
+            for other in grid.within(creature.x, creature.y, creature.radius + max_radius):
+                if size(other) <= size(creature) or not view._can_eat_each_other(creature, other):
+                    continue
+                if eater is None or (size(other), -other.id) > (size(eater), -eater.id):
+                    eater = other
+            if eater is not None:
+                eater_of[creature.id] = eater
+
+        meals: Counter[int] = Counter()
+        for creature in view.creatures:
+            eater = eater_of.get(creature.id)
+            if eater is not None:
+                meals[eater.id] += 1 + creature.food_eaten // 2
+        survivors = [creature for creature in self.creatures if creature.id not in eater_of]
+        for creature in survivors:
+            if meals[creature.id]:
+                view.feed_creature(creature, meals[creature.id])
+        eaten = len(self.creatures) - len(survivors)
+        self.creatures = survivors
+        return eaten, len(survivors), self._max_radius()
+
+
+def serve(transport: Transport) -> None:
+    """Run worker commands from a coordinator until it sends "stop" or hangs up."""
+    worker: StripWorker | None = None
+    while True:
+        try:
+            command, *arguments = transport.recv()
+        except (EOFError, OSError):
+            break
+        if command == "stop":
+            break
+        try:
+            if command == "setup":
+                worker = StripWorker(*arguments)
+                reply = None
+            elif command not in WORKER_COMMANDS:
+                raise ValueError(f"unknown worker command: {command}")
+            elif worker is None:
+                raise ValueError(f"worker got {command} before setup")
+            else:
+                reply = getattr(worker, command)(*arguments)
+        except Exception:
+            transport.send(("error", traceback.format_exc()))
+        else:
+            transport.send(("ok", reply))
+    transport.close()
+
+
+def _serve_pipe(connection: Connection) -> None:
+    serve(PipeTransport(connection))
+
+
+def _serve_listener_once(listener: socket.socket) -> None:
+    connection, _ = listener.accept()
+    listener.close()
+    serve(SocketTransport(connection))
+
+
+def start_pipe_workers(count: int) -> list[PipeTransport]:
+    """Start `count` local worker processes connected by pipes."""
+    transports = []
+    for _ in range(count):
+        parent, child = Pipe()
+        process = Process(target=_serve_pipe, args=(child,), daemon=True)
+        process.start()
+        child.close()
+        transports.append(PipeTransport(parent, process))
+    return transports
+
+
+def start_tcp_workers(count: int, host: str = "127.0.0.1") -> list[SocketTransport]:
+    """Start `count` local worker processes on free TCP ports and connect to them."""
+    transports = []
+    for _ in range(count):
+        listener = socket.create_server((host, 0))
+        process = Process(target=_serve_listener_once, args=(listener,), daemon=True)
+        process.start()
+        address = listener.getsockname()[:2]
+        listener.close()
+        transports.append(SocketTransport(socket.create_connection(address), process))
+    return transports
+
+
+def connect_tcp_workers(addresses: Iterable[tuple[str, int]]) -> list[SocketTransport]:
+    """Connect to workers started elsewhere with `serve_tcp`, one strip per address."""
+    return [SocketTransport(socket.create_connection(address)) for address in addresses]
+
+
+def serve_tcp(host: str, port: int) -> None:
+    """Serve coordinators connecting to host:port, one at a time, until killed."""
+    with socket.create_server((host, port)) as listener:
+        while True:
+            connection, _ = listener.accept()
+            serve(SocketTransport(connection))
+
+
+def parse_address(text: str) -> tuple[str, int]:
+    """Split "HOST:PORT" into a (host, port) pair."""
+    host, separator, port = text.rpartition(":")
+    if not separator or not host or not port.isdigit():
+        raise ValueError(f"expected HOST:PORT, got {text!r}")
+    return host, int(port)
+
+
+class DistributedSimulation(Simulation):
+    """A simulation whose world is split into vertical strips, each owned by a worker.
+
+    Workers hold the creatures and food of their strip and run each tick
+    side by side; the coordinator only routes messages. Before every phase,
+    items near a strip's edges are copied to the workers next to it as
+    ghosts, wide enough for all neighbor queries that phase makes, and
+    creatures that move into another strip are handed to its worker.
+
+    Steering works like `ParallelSimulation`, from the positions at the
+    start of the tick with per-creature wander. Eating and predation are
+    decided from the state at the start of their phase, so a strip can
+    settle the creatures near its border without waiting for its
+    neighbors: a pellet goes to the lowest-id creature reaching it, and a
+    creature overlapping bigger ones is eaten by the biggest (lowest id on
+    ties). Results are bit-identical for any number of workers, but differ
+    from `ParallelSimulation`, where eating and predation run in list order.
+
+    Workers are `config.workers` local processes on pipes, the
+    `config.worker_hosts` started with `serve_tcp`, or the `transports`
+    given (see `start_tcp_workers`), one strip per transport. `creatures` and
+    `food` are copies gathered from the workers; assign the lists to change
+    them. Call `close()` to stop the workers.
+    """
+
+    def __init__(self, config: SimulationConfig, transports: Sequence[Transport] | None = None) -> None:
+        self._transports = None if transports is None else list(transports)
+        super().__init__(config)
+
+    def _reset_state(self, config: SimulationConfig) -> None:
+        if config.workers < 1:
+            raise ValueError("workers must be at least 1")
+        if getattr(self, "_transports", None) is None:
+            if config.worker_hosts:
+                self._transports = connect_tcp_workers(map(parse_address, config.worker_hosts))
+            else:
+                self._transports = start_pipe_workers(config.workers)
+        if not self._transports:
+            raise ValueError("need at least one worker transport")
+        self.strips = len(self._transports)
+        self._request("setup", [(config, strip, self.strips) for strip in range(self.strips)])
+        self._creature_copies: list[Creature] | None = None
+        self._food_copies: list[Food] | None = None
+        self._stats_stale = True
+        # Upper bound on every creature's radius, which sets the halo widths.
+        self._max_radius = 0.0
+        self._creature_count = 0
+        self._food_count = 0
+        super()._reset_state(config)
+
+    def __reduce__(self) -> tuple[Any, tuple[bytes, type, SimulationConfig]]:
+        # Workers and their connections cannot be copied; a copy starts its own from a snapshot.
+        from sim.checkpoint import restore
+
+        return restore, (self.snapshot(), type(self), self.config)
+
+    def _request(self, command: str, arguments: Sequence[tuple]) -> list[Any]:
+        """Send each worker its command, then collect the replies, so workers run side by side."""
+        for transport, worker_arguments in zip(self._transports, arguments):
+            transport.send((command, *worker_arguments))
+        replies = [transport.recv() for transport in self._transports]
+        for status, reply in replies:
+            if status == "error":
+                raise RuntimeError(f"worker failed on {command}:\n{reply}")
+        return [reply for _, reply in replies]
+
+    def _route(self, rows: Iterable[CreatureRow | FoodRow]) -> list[list]:
+        routed: list[list] = [[] for _ in range(self.strips)]
+        for row in rows:
+            routed[strip_of(row[0], self.config.width, self.strips)].append(row)
+        return routed
+
+    def _changed(self) -> None:
+        self._creature_copies = None
+        self._food_copies = None
+        self._stats_stale = True
+        self.food_changed()
+
+    @property
+    def creatures(self) -> list[Creature]:
+        if self._creature_copies is None:
+            parts = self._request("gather_creatures", [()] * self.strips)
+            self._creature_copies = sorted((_creature_from_row(row) for part in parts for row in part), key=_by_id)
+        return self._creature_copies
+
+    @creatures.setter
+    def creatures(self, creatures: list[Creature]) -> None:
+        routed = self._route(_creature_row(creature) for creature in creatures)
+        self._request("load_creatures", [(rows,) for rows in routed])
+        self._creature_count = len(creatures)
+        self._max_radius = max((creature.radius for creature in creatures), default=0.0)
+        self._changed()
+
+    @property
+    def food(self) -> list[Food]:
+        if self._food_copies is None:
+            parts = self._request("gather_food", [()] * self.strips)
+            self._food_copies = sorted((_food_from_row(row) for part in parts for row in part), key=_by_id)
+        return self._food_copies
+
+    @food.setter
+    def food(self, pellets: list[Food]) -> None:
+        routed = self._route(_food_row(pellet) for pellet in pellets)
+        self._request("load_food", [(rows,) for rows in routed])
+        self._food_count = len(pellets)
+        self._changed()
+
+    @property
+    def stats(self) -> PopulationStats:
+        if self._stats_stale:
+            self._stats.recompute(self.creatures)
+            self._stats_stale = False
+        return self._stats
+
+    @stats.setter
+    def stats(self, stats: PopulationStats) -> None:
+        self._stats = stats
+        self._stats_stale = True
+
+    def _add(self, creatures: list[Creature], food: list[Food]) -> None:
+        creature_rows = self._route(_creature_row(creature) for creature in creatures)
+        food_rows = self._route(_food_row(pellet) for pellet in food)
+        self._request("add", list(zip(creature_rows, food_rows)))
+        self._creature_count += len(creatures)
+        self._food_count += len(food)
+        self._max_radius = max([self._max_radius, *(creature.radius for creature in creatures)])
+        self._changed()
+
+    def _remove(self, creature_ids: list[int], food_ids: list[int]) -> None:
+        self._request("remove", [(creature_ids, food_ids)] * self.strips)
+        self._creature_count -= len(creature_ids)
+        self._food_count -= len(food_ids)
+        self._changed()
+
+    def add_creature(self) -> None:
+        self._add([self._spawn_creature()], [])
+        self.config.creatures = self._creature_count
+
+    def remove_creature(self) -> None:
+        if self._creature_count <= 1:
+            return
+        self._remove([self.creatures[-1].id], [])
+        self.config.creatures = self._creature_count
+
+    def add_food(self) -> None:
+        self._add([], [self._spawn_food()])
+        self.config.food = self._food_count
+
+    def remove_food(self) -> None:
+        if not self._food_count:
+            return
+        self._remove([], [self.food[-1].id])
+        self.config.food = self._food_count
+
+    def respawn_food(self) -> None:
+        missing = self.config.food - self._food_count
+        if missing > 0:
+            self._add([], [self._spawn_food() for _ in range(missing)])
+
+    def _exchange(
+        self,
+        arrivals: list[list[CreatureRow]],
+        creature_width: float,
+        food_width: float | None,
+    ) -> list[tuple[list[CreatureRow], list[FoodRow]]]:
+        """Hand over arriving creatures, then return the ghosts each worker needs within the given widths."""
+        bands = self._request("bands", [(rows, creature_width, food_width) for rows in arrivals])
+        width = self.config.width
+        ghosts = []
+        for strip in range(self.strips):
+            creatures = []
+            food = []
+            for other, (creature_rows, food_rows) in enumerate(bands):
+                if other == strip:
+                    continue
+                creatures.extend(
+                    row
+                    for row in creature_rows
+                    if strip_gap(row[0], strip, width, self.strips) <= creature_width + HALO_SLACK
+                )
+                if food_width is not None:
+                    food.extend(
+                        row
+                        for row in food_rows
+                        if strip_gap(row[0], strip, width, self.strips) <= food_width + HALO_SLACK
+                    )
+            ghosts.append((creatures, food))
+        return ghosts
+
+    def _steer(self) -> tuple[list[list[CreatureRow]], int]:
+        """Steer and move every creature; return the creatures changing strips and how many remote lookups ran."""
+        creature_width = MAX_CREATURE_AWARENESS_MULTIPLIER * self._max_radius
+        spacing = sqrt(self.config.width * self.config.height / max(self._food_count, 1))
+        food_width = max(creature_width, FOOD_HALO_SPACINGS * spacing)
+        ghosts = self._exchange([[] for _ in range(self.strips)], creature_width, food_width)
+        replies = self._request("steer", [(self.tick, creatures, food, food_width) for creatures, food in ghosts])
+        leaving = [row for _, rows in replies for row in rows]
+        queries = [(strip, query) for strip, (unresolved, _) in enumerate(replies) for query in unresolved]
+        if queries:
+            points = [(x, y) for _, (_, x, y) in queries]
+            answers = self._request("nearest_food", [(points,)] * self.strips)
+            targets: list[dict[int, FoodRow | None]] = [{} for _ in range(self.strips)]
+            for index, (strip, (creature_id, _, _)) in enumerate(queries):
+                found = [answer[index] for answer in answers if answer[index] is not None]
+                best = min(found, default=None)
+                targets[strip][creature_id] = None if best is None else (best[2], best[3], best[1])
+            finished = self._request("finish_steer", [(strip_targets,) for strip_targets in targets])
+            leaving.extend(row for rows in finished for row in rows)
+        return self._route(leaving), len(queries)
+
+    def _eat(self, arrivals: list[list[CreatureRow]]) -> int:
+        reach = self._max_radius + FOOD_RADIUS
+        # A claimant of a pellet near the strip may sit one more reach further out.
+        ghosts = self._exchange(arrivals, 2 * reach, reach)
+        replies = self._request("eat", ghosts)
+        eaten = sum(count for count, _ in replies)
+        self._food_count -= eaten
+        self._max_radius = max(radius for _, radius in replies)
+        return eaten
+
+    def _hunt(self) -> None:
+        # Deciding who eats a creature at the border needs that creature's own neighbors too.
+        ghosts = self._exchange([[] for _ in range(self.strips)], 4 * self._max_radius, None)
+        replies = self._request("prey", [(creatures, self._max_radius) for creatures, _ in ghosts])
+        self.predation_events += sum(eaten for eaten, _, _ in replies)
+        self._creature_count = sum(count for _, count, _ in replies)
+        self._max_radius = max(radius for _, _, radius in replies)
+
+    def step(self) -> None:
+        observer = self.observer
+        started = perf_counter()
+        arrivals, remote_lookups = self._steer()
+        steered = perf_counter()
+        eaten = self._eat(arrivals)
+        ate = perf_counter()
+        predation_before = self.predation_events
+        self._hunt()
+        self.tick += 1
+        self._changed()
+        if observer is not None:
+            observer.phase("steering", steered - started)
+            observer.phase("eating", ate - steered)
+            observer.phase("overlaps", perf_counter() - ate)
+            observer.count("remote_food_lookups", remote_lookups)
+            observer.count("migrations", sum(len(rows) for rows in arrivals))
+            observer.count("eats", eaten)
+            observer.count("predation", self.predation_events - predation_before)
+            observer.tick_done(self.tick)
+
+    def close(self) -> None:
+        """Stop the workers and close their connections."""
+        for transport in self._transports:
+            try:
+                transport.send(("stop",))
+            except OSError:
+                pass
+            transport.close()
+        self._transports = []
@@ -0,0 +1,260 @@
+from collections.abc import Callable, Iterable, Sequence
+from heapq import heappush, heapreplace
+from math import hypot, inf
+
+from sim.model import World
+from sim.spatial import HasPosition, Point, distance_for
+
+
+LEAF_SIZE = 8
+# Boxes are only skipped when clearly out of reach, so rounding in the box
+# distance never hides an item lying exactly on the search radius.
+PRUNE_SLACK = 1e-9
+
+
+def _axis_gap(value: float, low: float, high: float, period: float) -> float:
+    """Distance from `value` to the interval [low, high], going around the axis when `period` is set."""
+    if value < low:
+        gap = low - value
+        return min(gap, value + period - high) if period else gap
+    if value > high:
+        gap = value - high
+        return min(gap, low + period - value) if period else gap
+    return 0.0
+
+
+class PeriodicKDTree:
+    """A 2-d tree over the items of a World for nearest-neighbor queries.
+
+    With `wrap` on, distances are measured across the world edges, the way
+    `Creature.move` wraps positions; with it off they are plain Euclidean
+    like the legacy scans. It answers the same queries as SpatialGrid
+    (`nearest`, `within`, `order_of`, `remove`, `update`) plus `k_nearest`.
+    An item's order is its position in the list the tree was built from, and
+    ties on distance go to the lowest order.
+
+    There are no batch forms of the queries. `Simulation.step` steers and
+    feeds creatures one at a time, so each query must see the pellets eaten
+    before it, and grouping queries in Python measured no faster than
+    asking them one by one.
+
+    The tree is built once. `update` leaves a moved item in its leaf and
+    grows the boxes around it to cover the new position, so queries stay
+    exact but get slower the further items drift; build a new tree each tick.
+    """
+
+    def __init__(
+        self,
+        world: World,
+        items: Sequence[HasPosition],
+        wrap: bool = True,
+        leaf_size: int = LEAF_SIZE,
+    ) -> None:
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be at least 1")
+        self.world = world
+        self.wrap = wrap
+        self.distance = distance_for(world, wrap)
+        self.leaf_size = leaf_size
+        self._period_x = world.width if wrap else 0.0
+        self._period_y = world.height if wrap else 0.0
+        self._items = list(items)
+        self._order = {id(item): order for order, item in enumerate(self._items)}
+        self._slots = list(range(len(self._items)))
+        self._leaf_of: dict[int, int] = {}
+        # One entry per node; leaves have no children (-1) and own the slots start..end-1.
+        self._low_x: list[float] = []
+        self._high_x: list[float] = []
+        self._low_y: list[float] = []
+        self._high_y: list[float] = []
+        self._left: list[int] = []
+        self._right: list[int] = []
+        self._parent: list[int] = []
+        self._start: list[int] = []
+        self._end: list[int] = []
+        self._alive: list[int] = []
+        if self._items:
+            xs = [item.x for item in self._items]
+            ys = [item.y for item in self._items]
+            self._build(0, len(self._items), -1, xs, ys)
+
+    def _build(self, start: int, end: int, parent: int, xs: list[float], ys: list[float]) -> int:
+        node = len(self._left)
+        slots = self._slots[start:end]
+        node_xs = [xs[slot] for slot in slots]
+        node_ys = [ys[slot] for slot in slots]
+        self._low_x.append(min(node_xs))
+        self._high_x.append(max(node_xs))
+        self._low_y.append(min(node_ys))
+        self._high_y.append(max(node_ys))
+        self._left.append(-1)
+        self._right.append(-1)
+        self._parent.append(parent)
+        self._start.append(start)
+        self._end.append(end)
+        self._alive.append(end - start)
+        if end - start <= self.leaf_size:
+            for slot in slots:
+                self._leaf_of[id(self._items[slot])] = node
+            return node
+
+        # Split the wider side of the box at the median.
+        wide_x = self._high_x[node] - self._low_x[node] >= self._high_y[node] - self._low_y[node]
+        slots.sort(key=(xs if wide_x else ys).__getitem__)
+        self._slots[start:end] = slots
+        middle = (start + end) // 2
+        self._left[node] = self._build(start, middle, node, xs, ys)
+        self._right[node] = self._build(middle, end, node, xs, ys)
+        return node
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, item: HasPosition) -> bool:
+        return id(item) in self._order
+
+    def order_of(self, item: HasPosition) -> int:
+        return self._order[id(item)]
+
+    def remove(self, item: HasPosition) -> None:
+        del self._order[id(item)]
+        node = self._leaf_of.pop(id(item))
+        while node != -1:
+            self._alive[node] -= 1
+            node = self._parent[node]
+
+    def update(self, item: HasPosition) -> None:
+        """Grow the boxes around an item's leaf to cover its current x, y."""
+        x, y = item.x, item.y
+        node = self._leaf_of[id(item)]
+        while node != -1:
+            grew = False
+            if x < self._low_x[node]:
+                self._low_x[node] = x
+                grew = True
+            elif x > self._high_x[node]:
+                self._high_x[node] = x
+                grew = True
+            if y < self._low_y[node]:
+                self._low_y[node] = y
+                grew = True
+            elif y > self._high_y[node]:
+                self._high_y[node] = y
+                grew = True
+            if not grew:
+                # Every parent box already covers this one.
+                break
+            node = self._parent[node]
+
+    def _query_point(self, x: float, y: float) -> Point:
+        if self.wrap:
+            return x % self.world.width, y % self.world.height
+        return x, y
+
+    def _gap(self, node: int, x: float, y: float) -> float:
+        return hypot(
+            _axis_gap(x, self._low_x[node], self._high_x[node], self._period_x),
+            _axis_gap(y, self._low_y[node], self._high_y[node], self._period_y),
+        )
+
+    def _push_children(self, stack: list[tuple[float, int]], node: int, x: float, y: float) -> None:
+        # The nearer child goes on top so it is searched first.
+        left, right = self._left[node], self._right[node]
+        left_gap, right_gap = self._gap(left, x, y), self._gap(right, x, y)
+        if left_gap <= right_gap:
+            stack.append((right_gap, right))
+            stack.append((left_gap, left))
+        else:
+            stack.append((left_gap, left))
+            stack.append((right_gap, right))
+
+    def _leaf_items(self, node: int) -> Iterable[tuple[HasPosition, int]]:
+        for slot in self._slots[self._start[node] : self._end[node]]:
+            item = self._items[slot]
+            order = self._order.get(id(item))
+            if order is not None:
+                yield item, order
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        accept: Callable[[HasPosition], bool] | None = None,
+    ) -> HasPosition | None:
+        """Return the closest accepted item, or None."""
+        if not self._order:
+            return None
+        x, y = self._query_point(x, y)
+        distance = self.distance
+        best: HasPosition | None = None
+        best_distance = inf
+        best_order = 0
+        stack = [(0.0, 0)]
+        while stack:
+            gap, node = stack.pop()
+            if not self._alive[node] or gap > best_distance + PRUNE_SLACK:
+                continue
+            if self._left[node] >= 0:
+                self._push_children(stack, node, x, y)
+                continue
+            for item, order in self._leaf_items(node):
+                if accept is not None and not accept(item):
+                    continue
+                item_distance = distance((x, y), (item.x, item.y))
+                if item_distance < best_distance or (item_distance == best_distance and order < best_order):
+                    best, best_distance, best_order = item, item_distance, order
+        return best
+
+    def k_nearest(
+        self,
+        x: float,
+        y: float,
+        k: int,
+        accept: Callable[[HasPosition], bool] | None = None,
+    ) -> list[HasPosition]:
+        """Return up to `k` accepted items, closest first."""
+        if k < 1 or not self._order:
+            return []
+        x, y = self._query_point(x, y)
+        distance = self.distance
+        # A max-heap of the best k so far: the worst of them sits on top.
+        best: list[tuple[float, int, HasPosition]] = []
+        stack = [(0.0, 0)]
+        while stack:
+            gap, node = stack.pop()
+            if not self._alive[node] or (len(best) == k and gap > -best[0][0] + PRUNE_SLACK):
+                continue
+            if self._left[node] >= 0:
+                self._push_children(stack, node, x, y)
+                continue
+            for item, order in self._leaf_items(node):
+                if accept is not None and not accept(item):
+                    continue
+                entry = (-distance((x, y), (item.x, item.y)), -order, item)
+                if len(best) < k:
+                    heappush(best, entry)
+                elif entry[:2] > best[0][:2]:
+                    heapreplace(best, entry)
+        return [item for _, _, item in sorted(best, key=lambda entry: (-entry[0], -entry[1]))]
+
+    def within(self, x: float, y: float, radius: float) -> list[HasPosition]:
+        """Return every item at most `radius` away, in order."""
+        if not self._order:
+            return []
+        x, y = self._query_point(x, y)
+        distance = self.distance
+        found: list[tuple[int, HasPosition]] = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not self._alive[node] or self._gap(node, x, y) > radius + PRUNE_SLACK:
+                continue
+            if self._left[node] >= 0:
+                stack.append(self._left[node])
+                stack.append(self._right[node])
+                continue
+            for item, order in self._leaf_items(node):
+                if distance((x, y), (item.x, item.y)) <= radius:
+                    found.append((order, item))
+        found.sort(key=lambda entry: entry[0])
+        return [item for _, item in found]
@@ -0,0 +1,145 @@
+from collections.abc import Hashable
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any
+
+import pygame
+
+
+Color = tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class LevelOfDetail:
+    """Thresholds past which the pygame view trades detail for speed.
+
+    Food-eaten labels are skipped when there are more than
+    `label_max_creatures` creatures or a creature is drawn smaller than
+    `label_min_radius_px`. Creatures no bigger than `point_max_radius_px`
+    are drawn as points. With at least `heatmap_min_food` pellets, food is
+    drawn as a density heatmap of `heatmap_cell_px` square cells, reaching
+    full color at `heatmap_saturation` pellets per cell.
+    """
+
+    label_max_creatures: int = 2_000
+    label_min_radius_px: int = 6
+    point_max_radius_px: int = 2
+    heatmap_min_food: int = 5_000
+    heatmap_cell_px: int = 4
+    heatmap_saturation: int = 6
+
+
+DEFAULT_LEVEL_OF_DETAIL = LevelOfDetail()
+# Every detail on, whatever the population.
+FULL_DETAIL = LevelOfDetail(
+    label_max_creatures=1 << 62,
+    label_min_radius_px=0,
+    point_max_radius_px=0,
+    heatmap_min_food=1 << 62,
+)
+
+
+def creature_count(sim: Any) -> int:
+    """Count creatures without building Creature objects when the source keeps arrays."""
+    if hasattr(sim, "creature_x"):
+        return len(sim.creature_x)
+    if hasattr(sim, "ids"):
+        return len(sim.ids)
+    return len(sim.creatures)
+
+
+def food_count(sim: Any) -> int:
+    """Count pellets without building Food objects when the source keeps arrays."""
+    if hasattr(sim, "food_x"):
+        return len(sim.food_x)
+    if hasattr(sim, "food_xs"):
+        return len(sim.food_xs)
+    if hasattr(sim, "food_chunks"):
+        return len(sim.food_chunks)
+    return len(sim.food)
+
+
+def food_positions(sim: Any) -> tuple[Any, Any]:
+    """Return pellet x and y as NumPy arrays, straight from the source's columns when it has them."""
+    import numpy as np
+
+    if hasattr(sim, "food_x"):
+        return sim.food_x, sim.food_y
+    if hasattr(sim, "food_xs"):
+        return np.frombuffer(sim.food_xs, dtype=np.float64), np.frombuffer(sim.food_ys, dtype=np.float64)
+    if hasattr(sim, "food_columns"):
+        # Copied, since the simulation keeps appending to its columns.
+        xs, ys = sim.food_columns()
+        return np.array(xs, dtype=np.float64), np.array(ys, dtype=np.float64)
+    food = sim.food
+    xs = np.fromiter(map(attrgetter("x"), food), dtype=np.float64, count=len(food))
+    ys = np.fromiter(map(attrgetter("y"), food), dtype=np.float64, count=len(food))
+    return xs, ys
+
+
+def food_heatmap(
+    sim: Any,
+    scale: int,
+    background: Color,
+    color: Color,
+    lod: LevelOfDetail = DEFAULT_LEVEL_OF_DETAIL,
+) -> pygame.Surface | None:
+    """Return an opaque world-sized food density surface, or None without NumPy."""
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+
+    width_px = int(sim.world.width * scale)
+    height_px = int(sim.world.height * scale)
+    columns = max(1, -(-width_px // lod.heatmap_cell_px))
+    rows = max(1, -(-height_px // lod.heatmap_cell_px))
+    xs, ys = food_positions(sim)
+    column = np.clip((xs * (scale / lod.heatmap_cell_px)).astype(np.int64), 0, columns - 1)
+    row = np.clip((ys * (scale / lod.heatmap_cell_px)).astype(np.int64), 0, rows - 1)
+    counts = np.bincount(column * rows + row, minlength=columns * rows).reshape(columns, rows)
+
+    # surfarray indexes pixels as [x, y], which is the same layout as counts.
+    shade = np.minimum(counts, lod.heatmap_saturation)[:, :, None] / lod.heatmap_saturation
+    start = np.array(background, dtype=np.float64)
+    pixels = (start + shade * (np.array(color, dtype=np.float64) - start)).astype(np.uint8)
+    cells = pygame.surfarray.make_surface(pixels)
+    return pygame.transform.scale(cells, (columns * lod.heatmap_cell_px, rows * lod.heatmap_cell_px))
+
+
+def food_key(sim: Any) -> Hashable:
+    """Return a key that changes whenever the food of `sim` may have changed."""
+    if hasattr(sim, "food_version"):
+        return sim.food_version
+    # Frames and the numpy engine only change food when the tick or pellet count does.
+    return sim.tick, food_count(sim)
+
+
+class HeatmapCache:
+    """The last food heatmap, rebuilt only when the food or how it is drawn changes.
+
+    Handing back the same surface also keeps an unchanged heatmap out of
+    the dirty rectangles of `LayeredRenderer`.
+    """
+
+    def __init__(self) -> None:
+        self._source: Any = None
+        self._key: Hashable = None
+        self._surface: pygame.Surface | None = None
+        self.rebuilds = 0
+
+    def get(
+        self,
+        sim: Any,
+        scale: int,
+        background: Color,
+        color: Color,
+        lod: LevelOfDetail = DEFAULT_LEVEL_OF_DETAIL,
+    ) -> pygame.Surface | None:
+        key = (food_key(sim), scale, background, color, lod)
+        if sim is not self._source or key != self._key:
+            self._surface = food_heatmap(sim, scale, background, color, lod)
+            self._source = sim
+            self._key = key
+            self.rebuilds += 1
+        return self._surface
@@ -0,0 +1,135 @@
+import csv
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any, TextIO
+
+from sim.writer import BackgroundWriter
+
+
+METRIC_FIELDS = (
+    "tick",
+    "creatures",
+    "food",
+    "total_mass",
+    "mass_min",
+    "mass_p25",
+    "mass_median",
+    "mass_p75",
+    "mass_p90",
+    "mass_max",
+    "predation",
+)
+MASS_QUANTILES = (("mass_p25", 0.25), ("mass_median", 0.5), ("mass_p75", 0.75), ("mass_p90", 0.9))
+METRIC_FORMATS = ("ndjson", "csv")
+DEFAULT_METRICS_EVERY = 1000
+# Samples collected before they are handed to the writer thread in one go.
+DEFAULT_BATCH_SAMPLES = 256
+
+
+def sample_metrics(sim: Any, predation: int) -> dict[str, float | int]:
+    """Return one row of population metrics; `predation` is the events since the last row."""
+    masses = sorted(creature.mass for creature in sim.creatures)
+    # Every engine keeps count, total and max up to date in its PopulationStats.
+    stats = sim.stats
+    row: dict[str, float | int] = {
+        "tick": sim.tick,
+        "creatures": stats.count,
+        "food": len(sim.food),
+        "total_mass": stats.total_mass,
+        "mass_min": masses[0],
+    }
+    for name, quantile in MASS_QUANTILES:
+        # Nearest-rank quantile: always one of the actual masses.
+        row[name] = masses[min(len(masses) - 1, int(quantile * len(masses)))]
+    row["mass_max"] = stats.max_mass
+    row["predation"] = predation
+    return row
+
+
+def metrics_format_for(path: str | Path) -> str:
+    """Guess the format from the file name: .csv or .csv.gz is CSV, anything else NDJSON."""
+    suffixes = Path(path).suffixes
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes = suffixes[:-1]
+    return "csv" if suffixes and suffixes[-1] == ".csv" else "ndjson"
+
+
+def format_metrics(rows: list[dict[str, float | int]], metrics_format: str, header: bool) -> str:
+    if metrics_format == "ndjson":
+        return "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=METRIC_FIELDS, lineterminator="\n")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+class MetricsWriter:
+    """Sample population metrics every `every` ticks and stream them to a file.
+
+    Samples are taken on the calling thread, then formatted and written in
+    batches by a background thread. Rows are NDJSON or CSV; a path ending in
+    .gz is gzip-compressed.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        every: int = DEFAULT_METRICS_EVERY,
+        metrics_format: str | None = None,
+        batch_samples: int = DEFAULT_BATCH_SAMPLES,
+    ) -> None:
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        metrics_format = metrics_format or metrics_format_for(path)
+        if metrics_format not in METRIC_FORMATS:
+            raise ValueError(f"unknown metrics format: {metrics_format}")
+        self.path = Path(path)
+        self.every = every
+        self.metrics_format = metrics_format
+        self.batch_samples = batch_samples
+        self.samples = 0
+        if self.path.suffix == ".gz":
+            self._out: TextIO = gzip.open(self.path, "wt", newline="")
+        else:
+            self._out = open(self.path, "w", newline="")
+        self._writer = BackgroundWriter(name="metrics-writer")
+        self._batch: list[dict[str, float | int]] = []
+        self._last_predation: int | None = None
+        self._header_written = False
+
+    def record(self, sim: Any) -> None:
+        if sim.tick % self.every:
+            return
+        # The first sample has no earlier one to count predation from.
+        last_predation = sim.predation_events if self._last_predation is None else self._last_predation
+        self._batch.append(sample_metrics(sim, sim.predation_events - last_predation))
+        self._last_predation = sim.predation_events
+        self.samples += 1
+        if len(self._batch) >= self.batch_samples:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand the collected samples to the writer thread."""
+        if not self._batch:
+            return
+        rows, self._batch = self._batch, []
+        header = not self._header_written
+        self._header_written = True
+        self._writer.submit(lambda: self._out.write(format_metrics(rows, self.metrics_format, header)))
+
+    def close(self) -> None:
+        self.flush()
+        try:
+            self._writer.close()
+        finally:
+            self._out.close()
+
+    def __enter__(self) -> "MetricsWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
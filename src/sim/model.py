@@ -1,7 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from math import sqrt
 
 
-@dataclass
+CREATURE_RADIUS = 0.35
+
+
+@dataclass(slots=True)
 class World:
     """A simple 2D continuous world."""
 
@@ -9,14 +13,26 @@ class World:
     height: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Creature:
-    """A creature with a position on a continuous plane."""
+    """A creature with a position on a continuous plane and a lifelong id."""
 
     x: float
     y: float
     mass: float = 1.0
     food_eaten: int = 0
+    id: int = 0
+    # Radius cache, valid while `mass` is still the mass it was computed from.
+    _radius: float = field(default=0.0, init=False, repr=False, compare=False)
+    _radius_mass: float = field(default=-1.0, init=False, repr=False, compare=False)
+
+    @property
+    def radius(self) -> float:
+        """Body radius; the square root is only taken again after the mass changes."""
+        if self._radius_mass != self.mass:
+            self._radius = CREATURE_RADIUS * sqrt(self.mass)
+            self._radius_mass = self.mass
+        return self._radius
 
     def move(self, world: World, dx: float, dy: float) -> None:
         """Move once using wrap-around boundaries."""
@@ -24,9 +40,10 @@ class Creature:
         self.y = (self.y + dy) % world.height
 
 
-@dataclass
+@dataclass(slots=True)
 class Food:
-    """A food pellet on the continuous plane."""
+    """A food pellet on the continuous plane with a lifelong id."""
 
     x: float
     y: float
+    id: int = 0
@@ -0,0 +1,530 @@
+from collections.abc import Callable, Iterator, Sequence
+from random import Random
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, overload
+
+import numpy as np
+
+from sim.model import Creature, Food, World
+from sim.simulation import (
+    AWARENESS_FOOD_END,
+    AWARENESS_FOOD_START,
+    CREATURE_RADIUS,
+    FOOD_BIAS_STRENGTH,
+    FOOD_RADIUS,
+    GROWTH_FACTOR,
+    LOW_GROWTH_FACTOR,
+    MAX_CREATURE_AWARENESS_MULTIPLIER,
+    MAX_GROWTH_FOOD_EATEN,
+    MID_GROWTH_FACTOR,
+    MIN_CREATURE_AWARENESS_MULTIPLIER,
+    PREDATOR_AVOID_STRENGTH,
+    PREY_BIAS_STRENGTH,
+    RANDOM_WANDER_STRENGTH,
+    SPEED_LOSS_PER_FOOD,
+    SimulationConfig,
+)
+from sim.stats import PopulationStats
+
+if TYPE_CHECKING:
+    from sim.profiler import StepObserver
+
+
+# Brute-force fallbacks build distance matrices a block of rows at a time so
+# a big population never needs more than about this many floats at once.
+CHUNK_ELEMENTS = 1 << 22
+
+Row = TypeVar("Row", Creature, Food)
+
+
+def growth_factors(food_eaten: np.ndarray) -> np.ndarray:
+    return np.select(
+        [food_eaten >= MAX_GROWTH_FOOD_EATEN, food_eaten >= 40, food_eaten >= 25],
+        [1.0, LOW_GROWTH_FACTOR, MID_GROWTH_FACTOR],
+        default=GROWTH_FACTOR,
+    )
+
+
+def awareness_multipliers(food_eaten: np.ndarray) -> np.ndarray:
+    progress = (food_eaten - AWARENESS_FOOD_START) / (AWARENESS_FOOD_END - AWARENESS_FOOD_START)
+    shrunk = MAX_CREATURE_AWARENESS_MULTIPLIER - progress * (
+        MAX_CREATURE_AWARENESS_MULTIPLIER - MIN_CREATURE_AWARENESS_MULTIPLIER
+    )
+    return np.select(
+        [food_eaten <= AWARENESS_FOOD_START, food_eaten >= AWARENESS_FOOD_END],
+        [MAX_CREATURE_AWARENESS_MULTIPLIER, MIN_CREATURE_AWARENESS_MULTIPLIER],
+        default=shrunk,
+    )
+
+
+def first_per_group(groups: np.ndarray, *sort_keys: np.ndarray) -> np.ndarray:
+    """Return positions of the smallest entry per group, ordered by `sort_keys`."""
+    order = np.lexsort((*reversed(sort_keys), groups))
+    sorted_groups = groups[order]
+    is_first = np.ones(len(order), dtype=bool)
+    is_first[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    return order[is_first]
+
+
+def _same_arrays(first: tuple[Any, ...], second: tuple[Any, ...]) -> bool:
+    """Compare a tick followed by arrays; the arrays must be the very same objects."""
+    return first[0] == second[0] and all(old is new for old, new in zip(first[1:], second[1:]))
+
+
+class CellIndex:
+    """Points binned into square cells and sorted by cell for batch lookups.
+
+    The cells do not wrap, so candidate pairs match the plain Euclidean
+    distance the reference engine uses.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, cell_size: float, world: World) -> None:
+        self.cell_size = cell_size
+        self.columns = max(1, int(np.ceil(world.width / cell_size)))
+        self.rows = max(1, int(np.ceil(world.height / cell_size)))
+        column, row = self._cells(x, y)
+        cell_ids = row * self.columns + column
+        self.order = np.argsort(cell_ids, kind="stable")
+        self.sorted_cells = cell_ids[self.order]
+
+    def _cells(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        column = np.clip((x // self.cell_size).astype(np.int64), 0, self.columns - 1)
+        row = np.clip((y // self.cell_size).astype(np.int64), 0, self.rows - 1)
+        return column, row
+
+    def candidate_pairs(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Pair each query point with every point in its 3x3 block of cells.
+
+        Any point closer than `cell_size` to a query is in that block.
+        """
+        column, row = self._cells(x, y)
+        queries: list[np.ndarray] = []
+        points: list[np.ndarray] = []
+        for row_offset in (-1, 0, 1):
+            for column_offset in (-1, 0, 1):
+                neighbor_column = column + column_offset
+                neighbor_row = row + row_offset
+                valid = (
+                    (neighbor_column >= 0)
+                    & (neighbor_column < self.columns)
+                    & (neighbor_row >= 0)
+                    & (neighbor_row < self.rows)
+                )
+                cell_ids = neighbor_row * self.columns + neighbor_column
+                starts = np.searchsorted(self.sorted_cells, cell_ids, side="left")
+                counts = np.where(valid, np.searchsorted(self.sorted_cells, cell_ids, side="right") - starts, 0)
+                total = int(counts.sum())
+                if not total:
+                    continue
+                first_slot = np.repeat(np.cumsum(counts) - counts, counts)
+                slots = np.repeat(starts, counts) + np.arange(total) - first_slot
+                queries.append(np.repeat(np.arange(len(x)), counts))
+                points.append(self.order[slots])
+        if not queries:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(queries), np.concatenate(points)
+
+
+class ArrayRows(Sequence[Row], Generic[Row]):
+    """A read-only sequence of objects made from copies of parallel arrays.
+
+    Reading one row only builds that object; iterating or slicing builds
+    the whole list once and keeps it.
+    """
+
+    def __init__(self, make: Callable[..., Row], *columns: np.ndarray) -> None:
+        self._make = make
+        self._columns = tuple(column.copy() for column in columns)
+        self._rows: list[Row] | None = None
+
+    def __len__(self) -> int:
+        return len(self._columns[0])
+
+    @overload
+    def __getitem__(self, index: int) -> Row: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Row]: ...
+
+    def __getitem__(self, index: int | slice) -> Row | list[Row]:
+        if isinstance(index, slice) or self._rows is not None:
+            return self._all()[index]
+        return self._make(*(column[index].item() for column in self._columns))
+
+    def __iter__(self) -> Iterator[Row]:
+        return iter(self._all())
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def _all(self) -> list[Row]:
+        if self._rows is None:
+            self._rows = [self._make(*values) for values in zip(*(column.tolist() for column in self._columns))]
+        return self._rows
+
+
+def _creature(x: float, y: float, mass: float, food_eaten: int, creature_id: int) -> Creature:
+    return Creature(x=x, y=y, mass=mass, food_eaten=food_eaten, id=creature_id)
+
+
+def _food(x: float, y: float, food_id: int) -> Food:
+    return Food(x=x, y=y, id=food_id)
+
+
+class NumpySimulation:
+    """Structure-of-arrays engine that updates the whole population at once.
+
+    Creature and food state lives in contiguous NumPy arrays. Every creature
+    steers from the positions at the start of the tick, so results follow the
+    same rules as `Simulation` but are not step-for-step identical to it.
+    """
+
+    def __init__(self, config: SimulationConfig) -> None:
+        if config.creatures < 1:
+            raise ValueError("creatures must be at least 1")
+        if config.food < 0:
+            raise ValueError("food must be at least 0")
+        self._reset_state(config)
+
+        # Draw start positions exactly like Simulation so both engines begin
+        # from the same board for the same seed.
+        spawn_rng = Random(config.seed)
+        creature_xy = [(spawn_rng.random() * config.width, spawn_rng.random() * config.height) for _ in range(config.creatures)]
+        food_xy = [(spawn_rng.random() * config.width, spawn_rng.random() * config.height) for _ in range(config.food)]
+        self.creature_x = np.array([x for x, _ in creature_xy], dtype=np.float64)
+        self.creature_y = np.array([y for _, y in creature_xy], dtype=np.float64)
+        self.mass = np.ones(config.creatures, dtype=np.float64)
+        self.food_eaten = np.zeros(config.creatures, dtype=np.int64)
+        self.creature_id = np.arange(config.creatures, dtype=np.int64)
+        self._next_creature_id = config.creatures
+        self.food_x = np.array([x for x, _ in food_xy], dtype=np.float64)
+        self.food_y = np.array([y for _, y in food_xy], dtype=np.float64)
+        self.food_id = np.arange(config.food, dtype=np.int64)
+        self._next_food_id = config.food
+
+    def _reset_state(self, config: SimulationConfig) -> None:
+        if config.wrap_distance:
+            raise ValueError("the numpy engine only supports plain (legacy) distances")
+        self.config = config
+        self.world = World(width=config.width, height=config.height)
+        self.tick = 0
+        self._rng = np.random.default_rng(config.seed)
+        self.observer: StepObserver | None = None
+        self.predation_events = 0
+        # The last `creatures` and `food` handed out, with the arrays they were copied from.
+        self._creature_rows: tuple[tuple[Any, ...], ArrayRows[Creature]] | None = None
+        self._food_rows: tuple[tuple[Any, ...], ArrayRows[Food]] | None = None
+        self._stats = PopulationStats()
+        self._stats_rows: ArrayRows[Creature] | None = None
+
+    @classmethod
+    def from_state(
+        cls,
+        config: SimulationConfig,
+        tick: int,
+        creatures: list[Creature],
+        food: list[Food],
+        rng_state: dict,
+        next_creature_id: int,
+        next_food_id: int | None = None,
+    ) -> "NumpySimulation":
+        """Rebuild an engine from saved state without spawning anything; `rng_state` is a PCG64 state dict."""
+        sim = cls.__new__(cls)
+        sim._reset_state(config)
+        sim.tick = tick
+        sim.creature_x = np.array([creature.x for creature in creatures], dtype=np.float64)
+        sim.creature_y = np.array([creature.y for creature in creatures], dtype=np.float64)
+        sim.mass = np.array([creature.mass for creature in creatures], dtype=np.float64)
+        sim.food_eaten = np.array([creature.food_eaten for creature in creatures], dtype=np.int64)
+        sim.creature_id = np.array([creature.id for creature in creatures], dtype=np.int64)
+        sim._next_creature_id = next_creature_id
+        sim.food_x = np.array([pellet.x for pellet in food], dtype=np.float64)
+        sim.food_y = np.array([pellet.y for pellet in food], dtype=np.float64)
+        sim.food_id = np.array([pellet.id for pellet in food], dtype=np.int64)
+        if next_food_id is None:
+            next_food_id = max((pellet.id for pellet in food), default=-1) + 1
+        sim._next_food_id = next_food_id
+        sim._rng.bit_generator.state = rng_state
+        return sim
+
+    def close(self) -> None:
+        """Nothing to release; kept so every engine can be closed the same way."""
+
+    def snapshot(self) -> bytes:
+        """Return the complete state as a compact binary checkpoint."""
+        from sim.checkpoint import snapshot
+
+        return snapshot(self)
+
+    @property
+    def creatures(self) -> ArrayRows[Creature]:
+        """A read-only snapshot of the creature arrays, made again only after they change.
+
+        Arrays edited in place outside `step()` are not noticed until the next tick.
+        """
+        key = (self.tick, self.creature_x, self.creature_y, self.mass, self.food_eaten, self.creature_id)
+        cached = self._creature_rows
+        if cached is None or not _same_arrays(cached[0], key):
+            cached = key, ArrayRows(_creature, *key[1:])
+            self._creature_rows = cached
+        return cached[1]
+
+    @property
+    def food(self) -> ArrayRows[Food]:
+        """A read-only snapshot of the food arrays, made again only after they change."""
+        key = (self.tick, self.food_x, self.food_y, self.food_id)
+        cached = self._food_rows
+        if cached is None or not _same_arrays(cached[0], key):
+            cached = key, ArrayRows(_food, *key[1:])
+            self._food_rows = cached
+        return cached[1]
+
+    @property
+    def stats(self) -> PopulationStats:
+        """Count, mass and food_eaten aggregates of the current `creatures`."""
+        creatures = self.creatures
+        if self._stats_rows is not creatures:
+            self._stats.recompute(creatures)
+            self._stats_rows = creatures
+        return self._stats
+
+    def creature_radii(self) -> np.ndarray:
+        return CREATURE_RADIUS * np.sqrt(self.mass)
+
+    def movement_speeds(self) -> np.ndarray:
+        slowdown_food_eaten = np.minimum(self.food_eaten, MAX_GROWTH_FOOD_EATEN)
+        return self.config.speed * ((1.0 - SPEED_LOSS_PER_FOOD) ** slowdown_food_eaten)
+
+    def _food_cell_size(self) -> float:
+        # Aim for a handful of pellets per cell, but never less than a bite.
+        spacing = np.sqrt(self.world.width * self.world.height / max(len(self.food_x), 1))
+        return float(max(2.0 * spacing, self.creature_radii().max() + FOOD_RADIUS))
+
+    def _nearest_food_indices(self, food_index: CellIndex) -> np.ndarray:
+        count = len(self.creature_x)
+        nearest = np.full(count, -1, dtype=np.int64)
+        found_distance = np.full(count, np.inf)
+        creature_indices, food_indices = food_index.candidate_pairs(self.creature_x, self.creature_y)
+        if len(creature_indices):
+            distances = np.hypot(
+                self.food_x[food_indices] - self.creature_x[creature_indices],
+                self.food_y[food_indices] - self.creature_y[creature_indices],
+            )
+            best = first_per_group(creature_indices, distances, food_indices)
+            nearest[creature_indices[best]] = food_indices[best]
+            found_distance[creature_indices[best]] = distances[best]
+
+        # Only a match inside one cell width is guaranteed to be the global
+        # nearest; the rest fall back to a brute-force search.
+        unresolved = np.nonzero(found_distance > food_index.cell_size)[0]
+        block = max(1, CHUNK_ELEMENTS // len(self.food_x))
+        for start in range(0, len(unresolved), block):
+            rows = unresolved[start : start + block]
+            distances = np.hypot(
+                self.food_x[None, :] - self.creature_x[rows, None],
+                self.food_y[None, :] - self.creature_y[rows, None],
+            )
+            nearest[rows] = np.argmin(distances, axis=1)
+        return nearest
+
+    def _nearest_aware_creatures(self, awareness_radius: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return (prey, predator) indices per creature, or -1 for none."""
+        count = len(self.creature_x)
+        prey = np.full(count, -1, dtype=np.int64)
+        predators = np.full(count, -1, dtype=np.int64)
+        cell_size = max(float(awareness_radius.max()), 1e-9)
+        creature_index = CellIndex(self.creature_x, self.creature_y, cell_size, self.world)
+        seekers, others = creature_index.candidate_pairs(self.creature_x, self.creature_y)
+        distances = np.hypot(self.creature_x[others] - self.creature_x[seekers], self.creature_y[others] - self.creature_y[seekers])
+        in_range = distances <= awareness_radius[seekers]
+        for is_target, result in (
+            (self.food_eaten[others] < self.food_eaten[seekers], prey),
+            (self.food_eaten[others] > self.food_eaten[seekers], predators),
+        ):
+            keep = in_range & is_target
+            best = first_per_group(seekers[keep], distances[keep], others[keep])
+            result[seekers[keep][best]] = others[keep][best]
+        return prey, predators
+
+    def movement_angles(self) -> np.ndarray:
+        random_angle = self._rng.random(len(self.creature_x)) * 2.0 * np.pi
+        move_dx = RANDOM_WANDER_STRENGTH * np.cos(random_angle)
+        move_dy = RANDOM_WANDER_STRENGTH * np.sin(random_angle)
+
+        if len(self.food_x):
+            nearest_food = self._nearest_food_indices(CellIndex(self.food_x, self.food_y, self._food_cell_size(), self.world))
+            food_angle = np.arctan2(self.food_y[nearest_food] - self.creature_y, self.food_x[nearest_food] - self.creature_x)
+            move_dx += FOOD_BIAS_STRENGTH * np.cos(food_angle)
+            move_dy += FOOD_BIAS_STRENGTH * np.sin(food_angle)
+
+        awareness_radius = awareness_multipliers(self.food_eaten) * self.creature_radii()
+        prey, predators = self._nearest_aware_creatures(awareness_radius)
+        for targets, strength in ((prey, PREY_BIAS_STRENGTH), (predators, -PREDATOR_AVOID_STRENGTH)):
+            has_target = targets >= 0
+            target_angle = np.arctan2(
+                self.creature_y[targets[has_target]] - self.creature_y[has_target],
+                self.creature_x[targets[has_target]] - self.creature_x[has_target],
+            )
+            move_dx[has_target] += strength * np.cos(target_angle)
+            move_dy[has_target] += strength * np.sin(target_angle)
+
+        return np.arctan2(move_dy, move_dx)
+
+    def feed_creatures(self, indices: np.ndarray, food_units: np.ndarray) -> None:
+        """Feed each creature in `indices` its matching number of food units."""
+        indices = np.asarray(indices, dtype=np.int64)
+        remaining = np.asarray(food_units, dtype=np.int64).copy()
+        # Feeding changes mass and food_eaten in place, so the arrays stay the same objects.
+        self._creature_rows = None
+        while True:
+            hungry = indices[remaining > 0]
+            if not len(hungry):
+                return
+            self.mass[hungry] *= growth_factors(self.food_eaten[hungry])
+            self.food_eaten[hungry] += 1
+            remaining -= 1
+
+    def _eat_overlapping_food(self) -> None:
+        if not len(self.food_x):
+            return
+        reach = self.creature_radii() + FOOD_RADIUS
+        creature_index = CellIndex(self.creature_x, self.creature_y, float(reach.max()), self.world)
+        food_indices, creature_indices = creature_index.candidate_pairs(self.food_x, self.food_y)
+        distances = np.hypot(
+            self.creature_x[creature_indices] - self.food_x[food_indices],
+            self.creature_y[creature_indices] - self.food_y[food_indices],
+        )
+        overlaps = distances <= reach[creature_indices]
+        if not overlaps.any():
+            return
+        food_indices = food_indices[overlaps]
+        creature_indices = creature_indices[overlaps]
+        # A contested pellet goes to the creature that comes first in the list.
+        winners = first_per_group(food_indices, creature_indices)
+        units = np.bincount(creature_indices[winners], minlength=len(self.creature_x))
+        self.feed_creatures(np.nonzero(units)[0], units[units > 0])
+        eaten = np.zeros(len(self.food_x), dtype=bool)
+        eaten[food_indices[winners]] = True
+        self.food_x = self.food_x[~eaten]
+        self.food_y = self.food_y[~eaten]
+        self.food_id = self.food_id[~eaten]
+
+    def _overlapping_pairs(self) -> list[tuple[int, int]]:
+        radii = self.creature_radii()
+        creature_index = CellIndex(self.creature_x, self.creature_y, 2.0 * float(radii.max()), self.world)
+        first, second = creature_index.candidate_pairs(self.creature_x, self.creature_y)
+        distances = np.hypot(self.creature_x[second] - self.creature_x[first], self.creature_y[second] - self.creature_y[first])
+        keep = (
+            (second > first)
+            & (distances <= radii[first] + radii[second])
+            & (self.food_eaten[first] != self.food_eaten[second])
+        )
+        order = np.lexsort((second[keep], first[keep]))
+        return list(zip(first[keep][order].tolist(), second[keep][order].tolist()))
+
+    def _resolve_creature_overlaps(self) -> None:
+        while len(self.creature_x) > 1:
+            alive = np.ones(len(self.creature_x), dtype=bool)
+            eats = 0
+            for index, other_index in self._overlapping_pairs():
+                if not (alive[index] and alive[other_index]):
+                    continue
+                overlap_distance = CREATURE_RADIUS * np.sqrt(self.mass[index]) + CREATURE_RADIUS * np.sqrt(
+                    self.mass[other_index]
+                )
+                distance = np.hypot(
+                    self.creature_x[index] - self.creature_x[other_index],
+                    self.creature_y[index] - self.creature_y[other_index],
+                )
+                size = self.food_eaten[index]
+                other_size = self.food_eaten[other_index]
+                if distance > overlap_distance or size == other_size:
+                    continue
+                winner, loser = (index, other_index) if size > other_size else (other_index, index)
+                self.feed_creatures(np.array([winner]), np.array([1 + self.food_eaten[loser] // 2]))
+                alive[loser] = False
+                eats += 1
+            if not eats:
+                return
+            self.predation_events += eats
+            self.creature_x = self.creature_x[alive]
+            self.creature_y = self.creature_y[alive]
+            self.mass = self.mass[alive]
+            self.food_eaten = self.food_eaten[alive]
+            self.creature_id = self.creature_id[alive]
+
+    def _steer_creatures(self) -> None:
+        angles = self.movement_angles()
+        speeds = self.movement_speeds()
+        self.creature_x = (self.creature_x + speeds * np.cos(angles)) % self.world.width
+        self.creature_y = (self.creature_y + speeds * np.sin(angles)) % self.world.height
+
+    def step(self) -> None:
+        observer = self.observer
+        creatures = len(self.creature_x)
+        food = len(self.food_x)
+        started = perf_counter()
+        self._steer_creatures()
+        steered = perf_counter()
+        self._eat_overlapping_food()
+        ate = perf_counter()
+        self._resolve_creature_overlaps()
+        self.tick += 1
+        if observer is not None:
+            observer.phase("steering", steered - started)
+            observer.phase("eating", ate - steered)
+            observer.phase("overlaps", perf_counter() - ate)
+            observer.count("eats", food - len(self.food_x))
+            observer.count("predation", creatures - len(self.creature_x))
+            observer.tick_done(self.tick)
+
+    def run(self, ticks: int) -> list[list[tuple[float, float]]]:
+        positions: list[list[tuple[float, float]]] = []
+        for _ in range(ticks):
+            self.step()
+            positions.append(list(zip(self.creature_x.tolist(), self.creature_y.tolist())))
+        return positions
+
+    def add_creature(self) -> None:
+        x, y = self._rng.random(2) * (self.world.width, self.world.height)
+        self.creature_x = np.append(self.creature_x, x)
+        self.creature_y = np.append(self.creature_y, y)
+        self.mass = np.append(self.mass, 1.0)
+        self.food_eaten = np.append(self.food_eaten, 0)
+        self.creature_id = np.append(self.creature_id, self._next_creature_id)
+        self._next_creature_id += 1
+        self.config.creatures = len(self.creature_x)
+
+    def remove_creature(self) -> None:
+        if len(self.creature_x) <= 1:
+            return
+        self.creature_x = self.creature_x[:-1]
+        self.creature_y = self.creature_y[:-1]
+        self.mass = self.mass[:-1]
+        self.food_eaten = self.food_eaten[:-1]
+        self.creature_id = self.creature_id[:-1]
+        self.config.creatures = len(self.creature_x)
+
+    def _spawn_food(self, count: int) -> None:
+        self.food_x = np.append(self.food_x, self._rng.random(count) * self.world.width)
+        self.food_y = np.append(self.food_y, self._rng.random(count) * self.world.height)
+        self.food_id = np.append(self.food_id, np.arange(self._next_food_id, self._next_food_id + count))
+        self._next_food_id += count
+
+    def add_food(self) -> None:
+        self._spawn_food(1)
+        self.config.food = len(self.food_x)
+
+    def remove_food(self) -> None:
+        if not len(self.food_x):
+            return
+        self.food_x = self.food_x[:-1]
+        self.food_y = self.food_y[:-1]
+        self.food_id = self.food_id[:-1]
+        self.config.food = len(self.food_x)
+
+    def respawn_food(self) -> None:
+        missing = self.config.food - len(self.food_x)
+        if missing > 0:
+            self._spawn_food(missing)
@@ -0,0 +1,168 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from math import cos, sin
+from time import perf_counter
+from typing import Any
+
+from sim.model import Creature, Food
+from sim.simulation import Simulation, SimulationConfig
+
+
+MASK64 = (1 << 64) - 1
+
+
+def splitmix64(value: int) -> int:
+    """Scramble a 64-bit integer; the output step of the SplitMix64 generator."""
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+def creature_random(seed: int, tick: int, creature_id: int) -> float:
+    """Return a float in [0, 1) that depends only on (seed, tick, creature id).
+
+    Unlike a shared Random, no draw depends on how many draws came before,
+    so creatures can be steered in any order or on any worker.
+    """
+    value = splitmix64(splitmix64(splitmix64(seed & MASK64) ^ tick) ^ creature_id)
+    return (value >> 11) * 2.0**-53
+
+
+def chunk_bounds(count: int, workers: int) -> list[tuple[int, int]]:
+    """Split range(count) into at most `workers` contiguous, nearly equal (start, stop) chunks."""
+    chunks = max(1, min(workers, count))
+    return [(count * index // chunks, count * (index + 1) // chunks) for index in range(chunks)]
+
+
+@dataclass(frozen=True)
+class SteeringSnapshot:
+    """Everything steering reads, frozen at the start of a tick and small enough to send to a process."""
+
+    config: SimulationConfig
+    tick: int
+    # (x, y, mass, food_eaten, id) per creature and (x, y) per pellet, in list order.
+    creatures: tuple[tuple[float, float, float, int, int], ...]
+    food: tuple[tuple[float, float], ...]
+
+
+def steer_chunk(snapshot: SteeringSnapshot, start: int, stop: int) -> list[tuple[float, float]]:
+    """Return the (dx, dy) moves of creatures start..stop-1 of a snapshot."""
+    sim = ParallelSimulation.__new__(ParallelSimulation)
+    sim._reset_state(snapshot.config)
+    sim.tick = snapshot.tick
+    sim.creatures = [
+        Creature(x=x, y=y, mass=mass, food_eaten=food_eaten, id=creature_id)
+        for x, y, mass, food_eaten, creature_id in snapshot.creatures
+    ]
+    sim.food = [Food(x=x, y=y) for x, y in snapshot.food]
+    return sim._steering_moves(start, stop)
+
+
+class ParallelSimulation(Simulation):
+    """A simulation whose steering can be split across worker processes.
+
+    Every creature steers from the positions at the start of the tick, and
+    its random wander comes from `creature_random`, so the moves do not
+    depend on the order creatures are handled in. Chunks of creatures are
+    steered on `config.workers` processes (or the given executor) and the
+    results are bit-identical for any worker count. Eating and predation
+    then run in list order as in `Simulation`.
+
+    The results differ from `Simulation`, where each creature sees the
+    moves of the creatures before it and all draws share one Random.
+    """
+
+    def __init__(self, config: SimulationConfig, executor: Executor | None = None) -> None:
+        if config.workers < 1:
+            raise ValueError("workers must be at least 1")
+        super().__init__(config)
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def _reset_state(self, config: SimulationConfig) -> None:
+        super()._reset_state(config)
+        self._executor: Executor | None = None
+        self._owns_executor = True
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Executors cannot be copied or pickled; a copy starts its own when needed.
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        state["_owns_executor"] = True
+        return state
+
+    def _wander_random(self, creature: Creature) -> float:
+        return creature_random(self.config.seed, self.tick, creature.id)
+
+    def _steering_moves(self, start: int, stop: int) -> list[tuple[float, float]]:
+        self._build_neighbor_grids()
+        moves = []
+        try:
+            for creature in self.creatures[start:stop]:
+                angle = self.movement_angle(creature)
+                speed = self.movement_speed(creature)
+                moves.append((speed * cos(angle), speed * sin(angle)))
+        finally:
+            self._food_grid = None
+            self._creature_grid = None
+        return moves
+
+    def steering_snapshot(self) -> SteeringSnapshot:
+        return SteeringSnapshot(
+            config=self.config,
+            tick=self.tick,
+            creatures=tuple(
+                (creature.x, creature.y, creature.mass, creature.food_eaten, creature.id) for creature in self.creatures
+            ),
+            food=tuple((pellet.x, pellet.y) for pellet in self.food),
+        )
+
+    def _parallel_moves(self) -> list[tuple[float, float]]:
+        bounds = chunk_bounds(len(self.creatures), self.config.workers)
+        if len(bounds) == 1:
+            # Nothing moves until every creature has steered, so the live
+            # lists are already the frozen snapshot.
+            return self._steering_moves(0, len(self.creatures))
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.config.workers)
+        starts, stops = zip(*bounds)
+        chunks = self._executor.map(steer_chunk, repeat(self.steering_snapshot()), starts, stops)
+        return [move for chunk in chunks for move in chunk]
+
+    def step(self) -> None:
+        observer = self.observer
+        started = perf_counter()
+        moves = self._parallel_moves()
+        for creature, (dx, dy) in zip(self.creatures, moves):
+            creature.move(self.world, dx, dy)
+        steered = perf_counter()
+
+        self._build_neighbor_grids()
+        food_grid = self._food_grid
+        eaten_food: list[Food] = []
+        try:
+            for creature in self.creatures:
+                eaten_food.extend(self._eat_overlapping_food(creature, food_grid))
+        finally:
+            self._food_grid = None
+            self._creature_grid = None
+        self._remove_eaten_food(eaten_food)
+        ate = perf_counter()
+
+        self._resolve_creature_overlaps()
+        self.tick += 1
+        if observer is not None:
+            observer.phase("steering", steered - started)
+            observer.phase("eating", ate - steered)
+            observer.phase("overlaps", perf_counter() - ate)
+            observer.count("eats", len(eaten_food))
+            observer.tick_done(self.tick)
+
+    def close(self) -> None:
+        """Shut down the worker processes this simulation started."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown()
+        self._executor = None
+        self._owns_executor = True
@@ -0,0 +1,67 @@
+from collections import Counter
+from typing import Protocol
+
+
+# Phases of Simulation.step, in the order they run.
+STEP_PHASES = ("grids", "steering", "eating", "food_compaction", "overlaps")
+# Weight of the newest tick in the live (recent) averages.
+RECENT_WEIGHT = 0.1
+
+
+class StepObserver(Protocol):
+    """Receives timings and counts from `Simulation.step` when set as `sim.observer`.
+
+    With no observer set, step() skips all of this, so instrumentation costs
+    nothing unless it is turned on.
+    """
+
+    def phase(self, name: str, seconds: float) -> None: ...
+
+    def count(self, name: str, amount: int) -> None: ...
+
+    def tick_done(self, tick: int) -> None: ...
+
+
+class TickProfiler:
+    """Add up per-phase time and event counters over the ticks it observes."""
+
+    def __init__(self) -> None:
+        self.ticks = 0
+        self.phase_seconds: dict[str, float] = {}
+        self.counters: Counter[str] = Counter()
+        self.recent_ms: dict[str, float] = {}
+        self._tick_seconds: dict[str, float] = {}
+
+    def phase(self, name: str, seconds: float) -> None:
+        self._tick_seconds[name] = self._tick_seconds.get(name, 0.0) + seconds
+
+    def count(self, name: str, amount: int) -> None:
+        self.counters[name] += amount
+
+    def tick_done(self, tick: int) -> None:
+        self.ticks += 1
+        for name, seconds in self._tick_seconds.items():
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+            previous = self.recent_ms.get(name, 1000.0 * seconds)
+            self.recent_ms[name] = previous + RECENT_WEIGHT * (1000.0 * seconds - previous)
+        self._tick_seconds = {}
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.phase_seconds.values())
+
+    def summary_lines(self) -> list[str]:
+        """Return a text report of time per phase and counters per tick."""
+        ticks = max(self.ticks, 1)
+        total = self.total_seconds or 1.0
+        lines = [f"Profile over {self.ticks} ticks ({self.total_seconds:.3f} s in step):"]
+        for name, seconds in self.phase_seconds.items():
+            per_tick_ms = 1000.0 * seconds / ticks
+            lines.append(f"  {name:<16} {seconds:9.3f} s  {per_tick_ms:9.3f} ms/tick  {100.0 * seconds / total:5.1f}%")
+        for name, amount in sorted(self.counters.items()):
+            lines.append(f"  {name:<16} {amount:11d}    {amount / ticks:11.1f} /tick")
+        return lines
+
+    def status_lines(self) -> list[str]:
+        """Return short lines of recent ms per tick for the pygame status panel."""
+        return [f"{name}: {self.recent_ms.get(name, 0.0):.2f} ms" for name in STEP_PHASES]
@@ -2,10 +2,17 @@ from dataclasses import dataclass
 from datetime import datetime
 from math import sqrt
 from pathlib import Path
+from time import perf_counter
 
 import pygame
 
-from sim.simulation import Simulation, SimulationConfig
+from sim.lod import DEFAULT_LEVEL_OF_DETAIL, FULL_DETAIL, LevelOfDetail, creature_count, food_count
+from sim.profiler import TickProfiler
+from sim.render_cache import GlyphCache, RenderCache
+from sim.simulation import Simulation, SimulationConfig, create_simulation
+from sim.trajectory import TrajectoryFile, TrajectoryFrame
+from sim.worker import SimulationWorker
+from sim.writer import BackgroundWriter
 
 
 BACKGROUND = (245, 244, 238)
@@ -28,7 +35,31 @@ BUTTON_GAP = 10
 BUTTON_TOP_GAP = 16
 FOOD_RESPAWN_MS = 5000
 FOOD_RADIUS_PX = 5
+POINT_SIZE_PX = 2
+MAX_TICKS_PER_FRAME = 1 << 16
+# In "max" speed (ticks_per_frame == 0) the simulation may use this share of
+# each frame; the rest is left for input handling and drawing.
+SIM_FRAME_BUDGET_SHARE = 0.8
+TICK_RATE_WINDOW_S = 0.5
 CTRL_MODS = pygame.KMOD_CTRL | pygame.KMOD_META
+REPLAY_SEEK_KEYS = {
+    pygame.K_LEFT: -1,
+    pygame.K_RIGHT: 1,
+    pygame.K_PAGEUP: -100,
+    pygame.K_PAGEDOWN: 100,
+}
+# Buttons that change the simulation do nothing while replaying a recording.
+SIMULATION_ONLY_BUTTONS = {"More Creatures", "Fewer Creatures", "More Food", "Less Food"}
+SIMULATION_BUTTONS = SIMULATION_ONLY_BUTTONS | {"Step", "Reset"}
+# How long to wait for a background worker's first frame before giving up.
+WORKER_START_TIMEOUT_S = 30.0
+# Screenshots waiting to be written; clicks past this are skipped, not queued.
+SCREENSHOT_QUEUE_SIZE = 4
+# Past this many changed sprites a frame repaints the whole world instead.
+MAX_DIRTY_RECTS = 400
+
+# Shared by every draw_frame call that does not pass its own cache.
+DEFAULT_RENDER_CACHE = RenderCache()
 
 
 @dataclass
@@ -37,24 +68,99 @@ class Button:
     rect: pygame.Rect
 
 
+def save_png(pixels: bytes, size: tuple[int, int], path: Path) -> Path:
+    pygame.image.save(pygame.image.frombytes(pixels, size, "RGB"), str(path))
+    return path
+
+
 def screenshot_path(screenshot_dir: str) -> Path:
     timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
     return Path(screenshot_dir) / f"{timestamp}.png"
 
 
-def build_status_lines(sim: Simulation, playing: bool, fps: int) -> list[str]:
-    largest_mass = max(creature.mass for creature in sim.creatures)
+class TickRateMeter:
+    """Measure achieved simulation ticks per second over a short window."""
+
+    def __init__(self, window_s: float = TICK_RATE_WINDOW_S) -> None:
+        self.window_s = window_s
+        self.rate = 0.0
+        self._window_start = perf_counter()
+        self._window_ticks = 0
+
+    def add(self, ticks: int, now: float | None = None) -> None:
+        now = perf_counter() if now is None else now
+        self._window_ticks += ticks
+        elapsed = now - self._window_start
+        if elapsed >= self.window_s:
+            self.rate = self._window_ticks / elapsed
+            self._window_start = now
+            self._window_ticks = 0
+
+
+def format_ticks_per_frame(ticks_per_frame: int) -> str:
+    return "max" if ticks_per_frame == 0 else str(ticks_per_frame)
+
+
+def change_ticks_per_frame(ticks_per_frame: int, key: int) -> int:
+    """Double with ], halve with [, and toggle "max" speed with backslash."""
+    if key == pygame.K_BACKSLASH:
+        return 1 if ticks_per_frame == 0 else 0
+    if ticks_per_frame == 0:
+        return ticks_per_frame
+    if key == pygame.K_RIGHTBRACKET:
+        return min(ticks_per_frame * 2, MAX_TICKS_PER_FRAME)
+    if key == pygame.K_LEFTBRACKET:
+        return max(ticks_per_frame // 2, 1)
+    return ticks_per_frame
+
+
+def run_ticks_for_frame(sim: Simulation, ticks_per_frame: int, budget_s: float, ticks_left: int) -> int:
+    """Step `sim` for one frame and return how many ticks ran.
+
+    A positive `ticks_per_frame` runs exactly that many ticks. Zero keeps
+    stepping until `budget_s` seconds of the frame are used up.
+    """
+    if ticks_per_frame > 0:
+        ran = min(ticks_per_frame, ticks_left)
+        for _ in range(ran):
+            sim.step()
+        return ran
+    deadline = perf_counter() + budget_s
+    ran = 0
+    while ran < ticks_left:
+        sim.step()
+        ran += 1
+        if perf_counter() >= deadline:
+            break
+    return ran
+
+
+def build_status_lines(
+    sim: Simulation | TrajectoryFrame,
+    playing: bool,
+    fps: int,
+    ticks_per_second: float = 0.0,
+    ticks_per_frame: int = 1,
+    profiler: TickProfiler | None = None,
+) -> list[str]:
+    creatures = sim.creatures
+    # Engines keep running stats; replay and background frames only have the recorded columns.
+    largest_mass = max(sim.masses) if isinstance(sim, TrajectoryFrame) else sim.stats.max_mass
+    profile = profiler.status_lines() if profiler is not None else []
     return [
         f"Tick: {sim.tick}",
-        f"Creature Count: {len(sim.creatures)}",
-        f"Food Count: {len(sim.food)}",
+        f"Creature Count: {len(creatures)}",
+        f"Food Count: {food_count(sim)}",
         f"State: {'playing' if playing else 'paused'}",
         f"FPS: {fps}",
+        f"Ticks/Frame: {format_ticks_per_frame(ticks_per_frame)}",
+        f"Ticks/sec: {ticks_per_second:.0f}",
         f"World: {sim.world.width:.0f} x {sim.world.height:.0f}",
-        f"Mass0: {sim.creatures[0].mass:.2f}",
+        f"Mass0: {creatures[0].mass:.2f}",
         f"Largest Creature: {largest_mass:.2f}",
-        f"x0={sim.creatures[0].x:.2f}",
-        f"y0={sim.creatures[0].y:.2f}",
+        f"x0={creatures[0].x:.2f}",
+        f"y0={creatures[0].y:.2f}",
+        *profile,
     ]
 
 
@@ -80,7 +186,15 @@ def apply_button_action(
     screen: pygame.Surface | None,
     mods: int = 0,
     food_respawn_elapsed_ms: int = 0,
+    screenshot_writer: BackgroundWriter | None = None,
 ) -> tuple[Simulation, int, bool, str, bool, int]:
+    """Apply one control panel click and return the updated view state.
+
+    Reset closes `sim` before building its replacement from `config`.
+
+    With a `screenshot_writer`, the screen is copied and saved on the
+    writer's thread; its job returns the saved path once the file is written.
+    """
     screenshot_message = ""
     running = True
     repeats = click_repeats(mods)
@@ -93,7 +207,8 @@ def apply_button_action(
         for _ in range(repeats):
             sim.step()
     elif clicked == "Reset":
-        sim = Simulation(config)
+        sim.close()
+        sim = create_simulation(config)
         food_respawn_elapsed_ms = 0
     elif clicked == "More Creatures":
         for _ in range(repeats):
@@ -114,14 +229,35 @@ def apply_button_action(
     elif clicked == "Screenshot" and screen is not None:
         path = screenshot_path(screenshot_dir)
         path.parent.mkdir(parents=True, exist_ok=True)
-        pygame.image.save(screen, str(path))
-        screenshot_message = f"Saved {path.name}"
+        if screenshot_writer is None:
+            pygame.image.save(screen, str(path))
+            screenshot_message = f"Saved {path.name}"
+        else:
+            pixels = pygame.image.tobytes(screen, "RGB")
+            size = screen.get_size()
+            if screenshot_writer.submit(lambda: save_png(pixels, size, path), block=False):
+                screenshot_message = f"Saving {path.name}..."
+            else:
+                screenshot_message = "Screenshot skipped: still saving"
     elif clicked == "Quit":
         running = False
 
     return sim, current_fps, playing, screenshot_message, running, food_respawn_elapsed_ms
 
 
+def seek_replay(position: int, offset: int, frame_count: int) -> int:
+    return min(max(position + offset, 0), frame_count - 1)
+
+
+def apply_replay_action(clicked: str | None, position: int, frame_count: int, mods: int = 0) -> int:
+    """Return the replay frame to show after a Step or Reset click."""
+    if clicked == "Step":
+        return seek_replay(position, click_repeats(mods), frame_count)
+    if clicked == "Reset":
+        return 0
+    return position
+
+
 def build_buttons(world_width_px: int, top: int) -> list[Button]:
     left = world_width_px + PANEL_LEFT_PADDING
     width = PANEL_WIDTH - 40
@@ -155,13 +291,44 @@ def run_pygame(
     fps: int,
     radius_px: int,
     screenshot_dir: str,
+    replay_path: str | None = None,
+    ticks_per_frame: int = 1,
+    background: bool = False,
+    level_of_detail: bool = True,
+    profile: bool = False,
 ) -> None:
-    """Run a pygame window with a control panel."""
+    """Run a pygame window with a control panel.
+
+    The simulation runs `ticks_per_frame` ticks per drawn frame, or as many
+    as fit in the frame budget when it is 0; ] and [ double and halve it and
+    backslash toggles "max". With `replay_path`, frames come from a recorded
+    trajectory file instead of `sim.step()`; arrow keys and Page Up/Down
+    seek, Home/End jump. With `background`, the simulation steps in a
+    separate process and the window draws the latest snapshot it published,
+    so a slow tick never freezes the window. With `level_of_detail`, huge
+    populations are drawn with fewer details (see `LevelOfDetail`). With
+    `profile`, the panel also shows recent time per tick phase. Reset
+    closes the running simulation, and `sim` or its replacement is closed
+    when the window is.
+    """
     pygame.init()
     pygame.font.init()
 
-    world_width_px = int(sim.world.width * scale)
-    world_height_px = int(sim.world.height * scale)
+    replay = TrajectoryFile(replay_path) if replay_path else None
+    replay_position = 0
+    worker = SimulationWorker(sim, ticks, ticks_per_frame) if background and replay is None else None
+    if replay is not None:
+        shown = replay.frame(0)
+    elif worker is not None:
+        shown = worker.wait_frame(WORKER_START_TIMEOUT_S)
+        if shown is None:
+            worker.close()
+            raise RuntimeError("simulation worker did not start")
+    else:
+        shown = sim
+
+    world_width_px = int(shown.world.width * scale)
+    world_height_px = int(shown.world.height * scale)
     screen = pygame.display.set_mode((world_width_px + PANEL_WIDTH, world_height_px))
     pygame.display.set_caption("evosim - continuous plane")
     clock = pygame.time.Clock()
@@ -173,20 +340,63 @@ def run_pygame(
     current_fps = fps
     screenshot_message = ""
     food_respawn_elapsed_ms = 0
-
-    status = build_status_lines(sim, playing, current_fps)
+    tick_rate = TickRateMeter()
+    screenshot_writer = BackgroundWriter(SCREENSHOT_QUEUE_SIZE, name="screenshot-writer")
+    renderer = LayeredRenderer(lod=DEFAULT_LEVEL_OF_DETAIL if level_of_detail else FULL_DETAIL)
+    # Only a simulation stepped in this process can be profiled.
+    profiler = TickProfiler() if profile and shown is sim else None
+    sim.observer = profiler
+
+    status = build_status_lines(shown, playing, current_fps, ticks_per_frame=ticks_per_frame, profiler=profiler)
     buttons_top = PANEL_STATUS_TOP + len(status) * STATUS_LINE_HEIGHT + BUTTON_TOP_GAP
     buttons = build_buttons(world_width_px, buttons_top)
 
-    draw_frame(screen, sim, scale, radius_px, buttons, font, small_font, current_fps, playing, screenshot_message)
+    renderer.draw(
+        screen,
+        shown,
+        scale,
+        radius_px,
+        buttons,
+        font,
+        small_font,
+        current_fps,
+        playing,
+        screenshot_message,
+        profiler=profiler,
+    )
     pygame.display.flip()
 
-    while running and sim.tick < ticks:
+    # `shown` is the simulation itself, or the background worker's latest frame.
+    while running and (replay is not None or shown.tick < ticks):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key in (
+                pygame.K_LEFTBRACKET,
+                pygame.K_RIGHTBRACKET,
+                pygame.K_BACKSLASH,
+            ):
+                ticks_per_frame = change_ticks_per_frame(ticks_per_frame, event.key)
+                if worker is not None:
+                    worker.set_ticks_per_frame(ticks_per_frame)
+            elif event.type == pygame.KEYDOWN and replay is not None:
+                if event.key == pygame.K_HOME:
+                    replay_position = 0
+                elif event.key == pygame.K_END:
+                    replay_position = len(replay) - 1
+                else:
+                    replay_position = seek_replay(replay_position, REPLAY_SEEK_KEYS.get(event.key, 0), len(replay))
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 clicked = button_at_pos(buttons, event.pos)
+                if replay is not None and clicked in SIMULATION_BUTTONS:
+                    replay_position = apply_replay_action(clicked, replay_position, len(replay), pygame.key.get_mods())
+                    continue
+                if worker is not None:
+                    # The worker owns the simulation; Play/Pause/Quit also
+                    # update the local flags below.
+                    worker.send_button(clicked, pygame.key.get_mods())
+                    if clicked in SIMULATION_BUTTONS:
+                        continue
                 sim, current_fps, playing, screenshot_message, running, food_respawn_elapsed_ms = apply_button_action(
                     clicked=clicked,
                     sim=sim,
@@ -197,18 +407,35 @@ def run_pygame(
                     screen=screen,
                     mods=pygame.key.get_mods(),
                     food_respawn_elapsed_ms=food_respawn_elapsed_ms,
+                    screenshot_writer=screenshot_writer,
                 )
-
-        if playing:
-            sim.step()
-        food_respawn_elapsed_ms += clock.get_time()
-        if food_respawn_elapsed_ms >= FOOD_RESPAWN_MS:
-            sim.respawn_food()
-            food_respawn_elapsed_ms = 0
-
-        draw_frame(
+                # Reset builds a new simulation; keep profiling it.
+                sim.observer = profiler
+
+        for saved_path in screenshot_writer.completed():
+            screenshot_message = f"Saved {saved_path.name}"
+
+        if replay is not None:
+            if playing:
+                replay_position = seek_replay(replay_position, max(ticks_per_frame, 1), len(replay))
+            shown = replay.frame(replay_position)
+        elif worker is not None:
+            shown = worker.poll_frame() or shown
+        else:
+            if playing:
+                budget_s = SIM_FRAME_BUDGET_SHARE / current_fps
+                tick_rate.add(run_ticks_for_frame(sim, ticks_per_frame, budget_s, ticks - sim.tick))
+            else:
+                tick_rate.add(0)
+            food_respawn_elapsed_ms += clock.get_time()
+            if food_respawn_elapsed_ms >= FOOD_RESPAWN_MS:
+                sim.respawn_food()
+                food_respawn_elapsed_ms = 0
+            shown = sim
+
+        dirty = renderer.draw(
             screen,
-            sim,
+            shown,
             scale,
             radius_px,
             buttons,
@@ -217,10 +444,19 @@ def run_pygame(
             current_fps,
             playing,
             screenshot_message,
+            ticks_per_second=worker.ticks_per_second if worker is not None else tick_rate.rate,
+            ticks_per_frame=ticks_per_frame,
+            profiler=profiler,
         )
-        pygame.display.flip()
+        pygame.display.update(dirty)
         clock.tick(current_fps)
 
+    if replay is not None:
+        replay.close()
+    if worker is not None:
+        worker.close()
+    sim.close()
+    screenshot_writer.close()
     pygame.quit()
 
 
@@ -231,6 +467,119 @@ def button_at_pos(buttons: list[Button], pos: tuple[int, int]) -> str | None:
     return None
 
 
+def draw_panel(
+    surface: pygame.Surface,
+    left: int,
+    buttons: list[Button],
+    font: pygame.font.Font,
+    small_font: pygame.font.Font,
+    glyphs: GlyphCache,
+) -> None:
+    """Draw the parts of the panel that do not change between frames; `left` is the panel's screen x."""
+    surface.fill(PANEL_BACKGROUND)
+    surface.blit(glyphs.render(font, "Control Panel", TEXT_COLOR), (PANEL_LEFT_PADDING, PANEL_TITLE_TOP))
+    for button in buttons:
+        rect = button.rect.move(-left, 0)
+        pygame.draw.rect(surface, BUTTON_COLOR, rect, border_radius=6)
+        pygame.draw.rect(surface, BUTTON_BORDER, rect, width=2, border_radius=6)
+        label = glyphs.render(small_font, button.label, BUTTON_TEXT)
+        surface.blit(label, label.get_rect(center=rect.center))
+
+
+def static_panel(
+    cache: RenderCache,
+    panel_rect: pygame.Rect,
+    buttons: list[Button],
+    font: pygame.font.Font,
+    small_font: pygame.font.Font,
+) -> pygame.Surface:
+    panel_key = (panel_rect.left, font, small_font, tuple((button.label, tuple(button.rect)) for button in buttons))
+    return cache.panel.get(
+        panel_key,
+        panel_rect.size,
+        lambda surface: draw_panel(surface, panel_rect.left, buttons, font, small_font, cache.glyphs),
+    )
+
+
+def world_sprites(
+    sim: Simulation,
+    scale: int,
+    radius_px: int,
+    small_font: pygame.font.Font,
+    cache: RenderCache,
+    lod: LevelOfDetail = DEFAULT_LEVEL_OF_DETAIL,
+) -> list[tuple[pygame.Surface, pygame.Rect]]:
+    """Return the food and every creature with its count label as (surface, rect) in drawing order.
+
+    Past the `lod` thresholds, labels are skipped, tiny creatures become
+    points and food becomes one heatmap surface drawn under the creatures.
+    """
+    sprites = []
+    heatmap = None
+    if food_count(sim) >= lod.heatmap_min_food:
+        heatmap = cache.heatmap.get(sim, scale, BACKGROUND, FOOD_COLOR, lod)
+    if heatmap is not None:
+        sprites.append((heatmap, heatmap.get_rect()))
+
+    creatures = sim.creatures
+    labels = len(creatures) <= lod.label_max_creatures
+    for creature in creatures:
+        x_px = int(creature.x * scale)
+        y_px = int(creature.y * scale)
+        current_radius_px = creature_radius_px(radius_px, creature.mass)
+        if current_radius_px <= lod.point_max_radius_px:
+            point = cache.sprites.point(POINT_SIZE_PX, CREATURE_COLOR)
+            sprites.append((point, point.get_rect(center=(x_px, y_px))))
+            continue
+        sprite = cache.sprites.circle(current_radius_px, CREATURE_COLOR)
+        sprites.append((sprite, sprite.get_rect(topleft=(x_px - current_radius_px, y_px - current_radius_px))))
+        if labels and current_radius_px >= lod.label_min_radius_px:
+            count_label = cache.glyphs.render(small_font, str(creature.food_eaten), CREATURE_TEXT_COLOR)
+            sprites.append((count_label, count_label.get_rect(center=(x_px, y_px))))
+
+    if heatmap is None:
+        food_sprite = cache.sprites.circle(FOOD_RADIUS_PX, FOOD_COLOR)
+        for pellet in sim.food:
+            x_px = int(pellet.x * scale) - FOOD_RADIUS_PX
+            y_px = int(pellet.y * scale) - FOOD_RADIUS_PX
+            sprites.append((food_sprite, food_sprite.get_rect(topleft=(x_px, y_px))))
+    return sprites
+
+
+def draw_world_border(screen: pygame.Surface, world_width_px: int, world_height_px: int) -> pygame.Rect:
+    return pygame.draw.line(screen, PANEL_BORDER, (world_width_px, 0), (world_width_px, world_height_px), 2)
+
+
+def status_rect(world_width_px: int, line_count: int) -> pygame.Rect:
+    return pygame.Rect(
+        world_width_px + PANEL_LEFT_PADDING,
+        PANEL_STATUS_TOP,
+        PANEL_WIDTH - PANEL_LEFT_PADDING,
+        line_count * STATUS_LINE_HEIGHT,
+    )
+
+
+def message_rect(world_width_px: int, world_height_px: int) -> pygame.Rect:
+    return pygame.Rect(
+        world_width_px + PANEL_LEFT_PADDING,
+        world_height_px - 28,
+        PANEL_WIDTH - PANEL_LEFT_PADDING,
+        28,
+    )
+
+
+def draw_text_lines(
+    screen: pygame.Surface,
+    lines: list[str],
+    topleft: tuple[int, int],
+    small_font: pygame.font.Font,
+    glyphs: GlyphCache,
+) -> None:
+    left, top = topleft
+    for index, line in enumerate(lines):
+        screen.blit(glyphs.render(small_font, line, TEXT_COLOR), (left, top + index * STATUS_LINE_HEIGHT))
+
+
 def draw_frame(
     screen: pygame.Surface,
     sim: Simulation,
@@ -242,46 +591,167 @@ def draw_frame(
     fps: int,
     playing: bool,
     screenshot_message: str,
+    ticks_per_second: float = 0.0,
+    ticks_per_frame: int = 1,
+    cache: RenderCache | None = None,
+    lod: LevelOfDetail = DEFAULT_LEVEL_OF_DETAIL,
+    profiler: TickProfiler | None = None,
 ) -> None:
+    cache = cache or DEFAULT_RENDER_CACHE
     world_width_px = int(sim.world.width * scale)
     world_height_px = int(sim.world.height * scale)
 
     world_rect = pygame.Rect(0, 0, world_width_px, world_height_px)
     panel_rect = pygame.Rect(world_width_px, 0, PANEL_WIDTH, world_height_px)
+    screen.blit(static_panel(cache, panel_rect, buttons, font, small_font), panel_rect)
 
+    # Creatures near the edge are clipped to the world instead of spilling over the panel.
+    screen.set_clip(world_rect)
     pygame.draw.rect(screen, BACKGROUND, world_rect)
-    pygame.draw.rect(screen, PANEL_BACKGROUND, panel_rect)
-    pygame.draw.line(screen, PANEL_BORDER, (world_width_px, 0), (world_width_px, world_height_px), 2)
-
-    for creature in sim.creatures:
-        x_px = int(creature.x * scale)
-        y_px = int(creature.y * scale)
-        current_radius_px = creature_radius_px(radius_px, creature.mass)
-        pygame.draw.circle(screen, CREATURE_COLOR, (x_px, y_px), current_radius_px)
-        count_label = small_font.render(str(creature.food_eaten), True, CREATURE_TEXT_COLOR)
-        count_rect = count_label.get_rect(center=(x_px, y_px))
-        screen.blit(count_label, count_rect)
-
-    for pellet in sim.food:
-        x_px = int(pellet.x * scale)
-        y_px = int(pellet.y * scale)
-        pygame.draw.circle(screen, FOOD_COLOR, (x_px, y_px), FOOD_RADIUS_PX)
-
-    title = font.render("Control Panel", True, TEXT_COLOR)
-    screen.blit(title, (world_width_px + PANEL_LEFT_PADDING, PANEL_TITLE_TOP))
-
-    status = build_status_lines(sim, playing, fps)
-    for index, line in enumerate(status):
-        text = small_font.render(line, True, TEXT_COLOR)
-        screen.blit(text, (world_width_px + PANEL_LEFT_PADDING, PANEL_STATUS_TOP + index * STATUS_LINE_HEIGHT))
-
-    for button in buttons:
-        pygame.draw.rect(screen, BUTTON_COLOR, button.rect, border_radius=6)
-        pygame.draw.rect(screen, BUTTON_BORDER, button.rect, width=2, border_radius=6)
-        label = small_font.render(button.label, True, BUTTON_TEXT)
-        label_rect = label.get_rect(center=button.rect.center)
-        screen.blit(label, label_rect)
+    screen.blits(world_sprites(sim, scale, radius_px, small_font, cache, lod), doreturn=False)
+    screen.set_clip(None)
+    draw_world_border(screen, world_width_px, world_height_px)
 
+    status = build_status_lines(sim, playing, fps, ticks_per_second, ticks_per_frame, profiler)
+    draw_text_lines(screen, status, status_rect(world_width_px, len(status)).topleft, small_font, cache.glyphs)
     if screenshot_message:
-        text = small_font.render(screenshot_message, True, TEXT_COLOR)
-        screen.blit(text, (world_width_px + PANEL_LEFT_PADDING, world_height_px - 28))
+        topleft = message_rect(world_width_px, world_height_px).topleft
+        draw_text_lines(screen, [screenshot_message], topleft, small_font, cache.glyphs)
+
+
+class LayeredRenderer:
+    """Draw frames onto the screen and report only the rectangles that changed.
+
+    The panel background and buttons come from a cached static layer. The
+    world is compared sprite by sprite with the previous frame: only the
+    areas where a sprite appeared, moved or vanished are repainted, and when
+    too much changed the whole world is redrawn instead. The world is not
+    even looked at again while `sim`, its tick and its population sizes stay
+    the same, so paused frames cost almost nothing. Pass the returned rects
+    to `pygame.display.update`.
+    """
+
+    def __init__(
+        self,
+        cache: RenderCache | None = None,
+        max_dirty_rects: int = MAX_DIRTY_RECTS,
+        lod: LevelOfDetail = DEFAULT_LEVEL_OF_DETAIL,
+    ) -> None:
+        self.cache = cache or RenderCache()
+        self.lod = lod
+        self.max_dirty_rects = max_dirty_rects
+        self._layout: tuple | None = None
+        self._world_key: tuple | None = None
+        self._sprites: list[tuple[pygame.Surface, pygame.Rect]] = []
+        self._status: list[str] = []
+        self._message = ""
+
+    def invalidate(self) -> None:
+        """Make the next frame a full redraw."""
+        self._layout = None
+
+    def draw(
+        self,
+        screen: pygame.Surface,
+        sim: Simulation,
+        scale: int,
+        radius_px: int,
+        buttons: list[Button],
+        font: pygame.font.Font,
+        small_font: pygame.font.Font,
+        fps: int,
+        playing: bool,
+        screenshot_message: str,
+        ticks_per_second: float = 0.0,
+        ticks_per_frame: int = 1,
+        profiler: TickProfiler | None = None,
+    ) -> list[pygame.Rect]:
+        world_width_px = int(sim.world.width * scale)
+        world_height_px = int(sim.world.height * scale)
+        world_rect = pygame.Rect(0, 0, world_width_px, world_height_px)
+        panel_rect = pygame.Rect(world_width_px, 0, PANEL_WIDTH, world_height_px)
+        panel = static_panel(self.cache, panel_rect, buttons, font, small_font)
+        status = build_status_lines(sim, playing, fps, ticks_per_second, ticks_per_frame, profiler)
+        layout = (screen.get_size(), world_rect.size, scale, radius_px, font, small_font, panel)
+        world_key = (id(sim), sim.tick, creature_count(sim), food_count(sim))
+
+        if layout != self._layout:
+            self._layout = layout
+            self._world_key = world_key
+            self._sprites = world_sprites(sim, scale, radius_px, small_font, self.cache, self.lod)
+            self._status = status
+            self._message = screenshot_message
+            screen.blit(panel, panel_rect)
+            self._draw_world(screen, world_rect, [world_rect])
+            draw_text_lines(screen, status, status_rect(world_width_px, len(status)).topleft, small_font, self.cache.glyphs)
+            self._draw_message(screen, panel, panel_rect, world_height_px, small_font)
+            return [screen.get_rect()]
+
+        dirty: list[pygame.Rect] = []
+        if world_key != self._world_key:
+            self._world_key = world_key
+            dirty.extend(self._update_world(screen, sim, world_rect, scale, radius_px, small_font))
+
+        if status != self._status:
+            area = status_rect(world_width_px, max(len(status), len(self._status)))
+            screen.blit(panel, area, area.move(-panel_rect.left, 0))
+            draw_text_lines(screen, status, area.topleft, small_font, self.cache.glyphs)
+            self._status = status
+            dirty.append(area)
+
+        if screenshot_message != self._message:
+            self._message = screenshot_message
+            dirty.append(self._draw_message(screen, panel, panel_rect, world_height_px, small_font))
+        return dirty
+
+    def _update_world(
+        self,
+        screen: pygame.Surface,
+        sim: Simulation,
+        world_rect: pygame.Rect,
+        scale: int,
+        radius_px: int,
+        small_font: pygame.font.Font,
+    ) -> list[pygame.Rect]:
+        sprites = world_sprites(sim, scale, radius_px, small_font, self.cache, self.lod)
+        previous, self._sprites = self._sprites, sprites
+        if sprites and sprites[0][1].contains(world_rect) and (not previous or sprites[0][0] is not previous[0][0]):
+            # A new food heatmap under everything: the whole world changed, no need to compare sprites.
+            dirty = [world_rect]
+        else:
+            # The old list keeps its surfaces alive, so their ids cannot be reused here.
+            old = {(id(surface), tuple(rect)): rect for surface, rect in previous}
+            new = {(id(surface), tuple(rect)): rect for surface, rect in sprites}
+            changed = [old[key] for key in old.keys() - new.keys()] + [new[key] for key in new.keys() - old.keys()]
+            if not changed:
+                return []
+            dirty = [rect.clip(world_rect) for rect in changed]
+            if len(dirty) > self.max_dirty_rects:
+                dirty = [world_rect]
+        self._draw_world(screen, world_rect, dirty)
+        return dirty
+
+    def _draw_world(self, screen: pygame.Surface, world_rect: pygame.Rect, areas: list[pygame.Rect]) -> None:
+        sprite_rects = [rect for _, rect in self._sprites]
+        for area in areas:
+            if not area:
+                continue
+            screen.set_clip(area)
+            screen.fill(BACKGROUND, area)
+            screen.blits([self._sprites[index] for index in area.collidelistall(sprite_rects)], doreturn=False)
+        screen.set_clip(None)
+        draw_world_border(screen, world_rect.width, world_rect.height)
+
+    def _draw_message(
+        self,
+        screen: pygame.Surface,
+        panel: pygame.Surface,
+        panel_rect: pygame.Rect,
+        world_height_px: int,
+        small_font: pygame.font.Font,
+    ) -> pygame.Rect:
+        area = message_rect(panel_rect.left, world_height_px)
+        screen.blit(panel, area, area.move(-panel_rect.left, 0))
+        if self._message:
+            draw_text_lines(screen, [self._message], area.topleft, small_font, self.cache.glyphs)
+        return area
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+import pygame
+
+from sim.lod import HeatmapCache
+
+
+GLYPH_CACHE_SIZE = 4096
+Color = tuple[int, int, int]
+
+
+class GlyphCache:
+    """Rendered text surfaces keyed by font, text and color, least recently used first out."""
+
+    def __init__(self, max_entries: int = GLYPH_CACHE_SIZE) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._surfaces: OrderedDict[tuple[pygame.font.Font, str, Color], pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def render(self, font: pygame.font.Font, text: str, color: Color) -> pygame.Surface:
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+
+class SpriteCache:
+    """Pre-rendered filled circles keyed by radius and color.
+
+    A sprite is (2 * radius + 1) pixels square with the circle centered on
+    pixel (radius, radius), so blitting it at (x - radius, y - radius)
+    covers the same pixels as `pygame.draw.circle` at (x, y).
+    """
+
+    def __init__(self) -> None:
+        self._sprites: dict[tuple[int, Color], pygame.Surface] = {}
+        self._points: dict[tuple[int, Color], pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        return len(self._sprites) + len(self._points)
+
+    def circle(self, radius: int, color: Color) -> pygame.Surface:
+        key = (radius, color)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self._sprites[key] = sprite
+        return sprite
+
+    def point(self, size: int, color: Color) -> pygame.Surface:
+        """Return a `size` pixel square, for creatures too small to be worth a circle."""
+        key = (size, color)
+        sprite = self._points.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((size, size))
+            sprite.fill(color)
+            self._points[key] = sprite
+        return sprite
+
+
+class StaticSurface:
+    """A surface that is only redrawn when the key describing its contents changes."""
+
+    def __init__(self) -> None:
+        self._key: Hashable = None
+        self._surface: pygame.Surface | None = None
+        self.redraws = 0
+
+    def get(self, key: Hashable, size: tuple[int, int], draw: Callable[[pygame.Surface], None]) -> pygame.Surface:
+        if self._surface is None or key != self._key or self._surface.get_size() != size:
+            self._surface = pygame.Surface(size)
+            draw(self._surface)
+            self._key = key
+            self.redraws += 1
+        return self._surface
+
+
+class RenderCache:
+    """Everything `draw_frame` keeps between frames."""
+
+    def __init__(self, max_glyphs: int = GLYPH_CACHE_SIZE) -> None:
+        self.glyphs = GlyphCache(max_glyphs)
+        self.sprites = SpriteCache()
+        self.panel = StaticSurface()
+        self.heatmap = HeatmapCache()
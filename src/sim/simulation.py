@@ -1,11 +1,25 @@
+from array import array
 from dataclasses import dataclass
-from math import atan2, cos, dist, pi, sin, sqrt
+from heapq import heappop, heappush
+from itertools import compress
+from math import atan2, cos, pi, sin, sqrt
 from random import Random
+from time import perf_counter
+from typing import TYPE_CHECKING
 
-from sim.model import Creature, Food, World
+from sim.kdtree import PeriodicKDTree
+from sim.model import CREATURE_RADIUS, Creature, Food, World
+from sim.spatial import HasPosition, SpatialGrid, distance_for, wrapped_offset
+from sim.stats import PopulationStats
+
+if TYPE_CHECKING:
+    from sim.chunks import ChunkedSimulation
+    from sim.distributed import DistributedSimulation
+    from sim.numpy_engine import NumpySimulation
+    from sim.parallel import ParallelSimulation
+    from sim.profiler import StepObserver
 
 
-CREATURE_RADIUS = 0.35
 FOOD_RADIUS = 0.18
 GROWTH_FACTOR = 1.1
 MID_GROWTH_FACTOR = 1.05
@@ -20,6 +34,38 @@ MAX_CREATURE_AWARENESS_MULTIPLIER = 5.0
 MIN_CREATURE_AWARENESS_MULTIPLIER = 3.0
 AWARENESS_FOOD_START = 10
 AWARENESS_FOOD_END = 50
+NEIGHBOR_INDEXES = ("grid", "kdtree")
+
+
+def _growth_factor_for(food_eaten: int) -> float:
+    if food_eaten >= MAX_GROWTH_FOOD_EATEN:
+        return 1.0
+    if food_eaten >= 40:
+        return LOW_GROWTH_FACTOR
+    if food_eaten >= 25:
+        return MID_GROWTH_FACTOR
+    return GROWTH_FACTOR
+
+
+def _awareness_multiplier_for(food_eaten: int) -> float:
+    if food_eaten <= AWARENESS_FOOD_START:
+        return MAX_CREATURE_AWARENESS_MULTIPLIER
+    if food_eaten >= AWARENESS_FOOD_END:
+        return MIN_CREATURE_AWARENESS_MULTIPLIER
+
+    progress = (food_eaten - AWARENESS_FOOD_START) / (AWARENESS_FOOD_END - AWARENESS_FOOD_START)
+    return MAX_CREATURE_AWARENESS_MULTIPLIER - progress * (
+        MAX_CREATURE_AWARENESS_MULTIPLIER - MIN_CREATURE_AWARENESS_MULTIPLIER
+    )
+
+
+# Values that only depend on food_eaten, looked up instead of recomputed.
+# Past the last entry they stop changing, so lookups clamp to it.
+GROWTH_FACTORS = tuple(_growth_factor_for(food_eaten) for food_eaten in range(MAX_GROWTH_FOOD_EATEN + 1))
+SPEED_FACTORS = tuple((1.0 - SPEED_LOSS_PER_FOOD) ** food_eaten for food_eaten in range(MAX_GROWTH_FOOD_EATEN + 1))
+AWARENESS_MULTIPLIERS = tuple(_awareness_multiplier_for(food_eaten) for food_eaten in range(AWARENESS_FOOD_END + 1))
+
+NeighborIndex = SpatialGrid | PeriodicKDTree
 
 
 @dataclass
@@ -30,6 +76,17 @@ class SimulationConfig:
     speed: float = 0.8
     creatures: int = 50
     food: int = 250
+    engine: str = "reference"
+    # Steering processes for the "parallel" engine, or strips of the "distributed" one; results do not depend on it.
+    workers: int = 1
+    # Neighbor lookups: "grid" (SpatialGrid) or "kdtree" (PeriodicKDTree); results do not depend on it.
+    neighbor_index: str = "grid"
+    # Measure distances across the wrapping world edges; off keeps the legacy plain distances.
+    wrap_distance: bool = False
+    # Side of the persistent chunks of the "chunked" engine; results do not depend on it.
+    chunk_size: float = 16.0
+    # "HOST:PORT" of workers serving the "distributed" engine's strips instead of local processes.
+    worker_hosts: tuple[str, ...] = ()
 
 
 class Simulation:
@@ -40,185 +97,441 @@ class Simulation:
             raise ValueError("creatures must be at least 1")
         if config.food < 0:
             raise ValueError("food must be at least 0")
+        self._reset_state(config)
+        self.creatures = [self._spawn_creature() for _ in range(config.creatures)]
+        self.food = [self._spawn_food() for _ in range(config.food)]
+        self.stats.recompute(self.creatures)
+
+    def _reset_state(self, config: SimulationConfig) -> None:
+        if config.neighbor_index not in NEIGHBOR_INDEXES:
+            raise ValueError(f"unknown neighbor index: {config.neighbor_index}")
         self.config = config
         self.world = World(width=config.width, height=config.height)
+        self._distance = distance_for(self.world, config.wrap_distance)
         self.tick = 0
         self._rng = Random(config.seed)
-        self.creatures = [self._spawn_creature() for _ in range(config.creatures)]
-        self.food = [self._spawn_food() for _ in range(config.food)]
+        # Neighbor indexes only exist while step() runs; outside a tick the
+        # nearest_* queries fall back to plain scans of the public lists.
+        self._food_grid: NeighborIndex | None = None
+        self._creature_grid: NeighborIndex | None = None
+        self._next_creature_id = 0
+        self._next_food_id = 0
+        # Set to a StepObserver (e.g. sim.profiler.TickProfiler) to time step().
+        self.observer: StepObserver | None = None
+        # Creatures eaten by other creatures since this simulation started.
+        self.predation_events = 0
+        # Count, mass and food_eaten aggregates kept up to date by feeding,
+        # predation, spawning and removal, so readers never scan the list.
+        self.stats = PopulationStats()
+        # Bumped on every change to `food`, so views can tell when to redraw it.
+        self.food_version = 0
+        self._food_columns: tuple[array, array] | None = None
+        self.creatures: list[Creature] = []
+        self.food: list[Food] = []
+
+    @classmethod
+    def from_state(
+        cls,
+        config: SimulationConfig,
+        tick: int,
+        creatures: list[Creature],
+        food: list[Food],
+        rng_state: tuple,
+        next_creature_id: int,
+        next_food_id: int | None = None,
+    ) -> "Simulation":
+        """Rebuild a simulation from saved state without spawning anything."""
+        sim = cls.__new__(cls)
+        sim._reset_state(config)
+        sim.tick = tick
+        sim.creatures = creatures
+        sim.food = food
+        sim._rng.setstate(rng_state)
+        sim._next_creature_id = next_creature_id
+        if next_food_id is None:
+            next_food_id = max((pellet.id for pellet in food), default=-1) + 1
+        sim._next_food_id = next_food_id
+        sim.stats.recompute(creatures)
+        return sim
+
+    def snapshot(self) -> bytes:
+        """Return the complete state as a compact binary checkpoint."""
+        from sim.checkpoint import snapshot
+
+        return snapshot(self)
+
+    @classmethod
+    def restore(cls, data: bytes) -> "Simulation":
+        """Rebuild the exact simulation a `snapshot()` was taken from."""
+        from sim.checkpoint import restore
+
+        return restore(data, simulation_class=cls)
+
+    def close(self) -> None:
+        """Release worker processes or connections; the engines without any have nothing to do."""
+
+    @property
+    def food(self) -> list[Food]:
+        return self._food
+
+    @food.setter
+    def food(self, pellets: list[Food]) -> None:
+        self._food = pellets
+        self.food_changed()
+
+    def food_changed(self) -> None:
+        """Note that `food` changed; call it after editing the list in place by hand."""
+        self.food_version += 1
+        self._food_columns = None
+
+    def food_columns(self) -> tuple[array, array]:
+        """Return pellet x and y as float columns in `food` order.
+
+        The columns are built on first use and then kept up to date through
+        the simulation's own food changes, so drawing food every frame does
+        not walk the whole list.
+        """
+        if self._food_columns is None:
+            food = self.food
+            self._food_columns = (array("d", [pellet.x for pellet in food]), array("d", [pellet.y for pellet in food]))
+        return self._food_columns
+
+    def _append_food(self, pellet: Food) -> None:
+        self.food.append(pellet)
+        self.food_version += 1
+        if self._food_columns is not None:
+            xs, ys = self._food_columns
+            xs.append(pellet.x)
+            ys.append(pellet.y)
 
     def _spawn_creature(self) -> Creature:
         # Seeded RNG gives the same start position for the same config seed.
         start_x = self._rng.random() * self.world.width
         start_y = self._rng.random() * self.world.height
-        return Creature(x=start_x, y=start_y)
+        creature_id = self._next_creature_id
+        self._next_creature_id += 1
+        return Creature(x=start_x, y=start_y, id=creature_id)
 
     def _spawn_food(self) -> Food:
+        food_id = self._next_food_id
+        self._next_food_id += 1
         return Food(
             x=self._rng.random() * self.world.width,
             y=self._rng.random() * self.world.height,
+            id=food_id,
         )
 
     def creature_radius(self, creature: Creature) -> float:
-        return CREATURE_RADIUS * sqrt(creature.mass)
+        return creature.radius
 
     def creature_size(self, creature: Creature) -> int:
         return creature.food_eaten
 
     def movement_speed(self, creature: Creature) -> float:
-        slowdown_food_eaten = min(creature.food_eaten, MAX_GROWTH_FOOD_EATEN)
-        return self.config.speed * ((1.0 - SPEED_LOSS_PER_FOOD) ** slowdown_food_eaten)
+        return self.config.speed * SPEED_FACTORS[min(creature.food_eaten, MAX_GROWTH_FOOD_EATEN)]
 
     def growth_factor(self, creature: Creature) -> float:
-        if creature.food_eaten >= MAX_GROWTH_FOOD_EATEN:
-            return 1.0
-        if creature.food_eaten >= 40:
-            return LOW_GROWTH_FACTOR
-        if creature.food_eaten >= 25:
-            return MID_GROWTH_FACTOR
-        return GROWTH_FACTOR
+        return GROWTH_FACTORS[min(creature.food_eaten, MAX_GROWTH_FOOD_EATEN)]
 
     def nearest_food(self, creature: Creature) -> Food | None:
+        if self._food_grid is not None:
+            return self._food_grid.nearest(creature.x, creature.y)
         if not self.food:
             return None
-        return min(self.food, key=lambda pellet: dist((creature.x, creature.y), (pellet.x, pellet.y)))
+        return min(self.food, key=lambda pellet: self._distance((creature.x, creature.y), (pellet.x, pellet.y)))
 
     def creature_awareness_multiplier(self, creature: Creature) -> float:
-        if creature.food_eaten <= AWARENESS_FOOD_START:
-            return MAX_CREATURE_AWARENESS_MULTIPLIER
-        if creature.food_eaten >= AWARENESS_FOOD_END:
-            return MIN_CREATURE_AWARENESS_MULTIPLIER
-
-        progress = (creature.food_eaten - AWARENESS_FOOD_START) / (AWARENESS_FOOD_END - AWARENESS_FOOD_START)
-        return MAX_CREATURE_AWARENESS_MULTIPLIER - progress * (
-            MAX_CREATURE_AWARENESS_MULTIPLIER - MIN_CREATURE_AWARENESS_MULTIPLIER
-        )
+        return AWARENESS_MULTIPLIERS[min(creature.food_eaten, AWARENESS_FOOD_END)]
+
+    def _nearby_creatures(self, creature: Creature, awareness_radius: float) -> list[Creature]:
+        if self._creature_grid is None:
+            return self.creatures
+        grid = self._creature_grid
+        return sorted(grid.within(creature.x, creature.y, awareness_radius), key=grid.order_of)
 
     def nearest_smaller_creature(self, creature: Creature) -> Creature | None:
-        awareness_radius = self.creature_awareness_multiplier(creature) * self.creature_radius(creature)
+        awareness_radius = self.creature_awareness_multiplier(creature) * creature.radius
         smaller_creatures = [
             other
-            for other in self.creatures
+            for other in self._nearby_creatures(creature, awareness_radius)
             if other is not creature
             and self.creature_size(other) < self.creature_size(creature)
-            and dist((creature.x, creature.y), (other.x, other.y)) <= awareness_radius
+            and self._distance((creature.x, creature.y), (other.x, other.y)) <= awareness_radius
         ]
         if not smaller_creatures:
             return None
-        return min(smaller_creatures, key=lambda other: dist((creature.x, creature.y), (other.x, other.y)))
+        return min(smaller_creatures, key=lambda other: self._distance((creature.x, creature.y), (other.x, other.y)))
 
     def nearest_larger_creature(self, creature: Creature) -> Creature | None:
-        awareness_radius = self.creature_awareness_multiplier(creature) * self.creature_radius(creature)
+        awareness_radius = self.creature_awareness_multiplier(creature) * creature.radius
         larger_creatures = [
             other
-            for other in self.creatures
+            for other in self._nearby_creatures(creature, awareness_radius)
             if other is not creature
             and self.creature_size(other) > self.creature_size(creature)
-            and dist((creature.x, creature.y), (other.x, other.y)) <= awareness_radius
+            and self._distance((creature.x, creature.y), (other.x, other.y)) <= awareness_radius
         ]
         if not larger_creatures:
             return None
-        return min(larger_creatures, key=lambda other: dist((creature.x, creature.y), (other.x, other.y)))
+        return min(larger_creatures, key=lambda other: self._distance((creature.x, creature.y), (other.x, other.y)))
+
+    def _wander_random(self, creature: Creature) -> float:
+        return self._rng.random()
+
+    def _offset(self, creature: Creature, target: HasPosition) -> tuple[float, float]:
+        """Return the (dx, dy) from `creature` to `target`, the short way round when distances wrap."""
+        dx = target.x - creature.x
+        dy = target.y - creature.y
+        if self.config.wrap_distance:
+            return wrapped_offset(dx, self.world.width), wrapped_offset(dy, self.world.height)
+        return dx, dy
 
     def movement_angle(self, creature: Creature) -> float:
-        random_angle = self._rng.random() * 2.0 * pi
+        random_angle = self._wander_random(creature) * 2.0 * pi
         move_dx = RANDOM_WANDER_STRENGTH * cos(random_angle)
         move_dy = RANDOM_WANDER_STRENGTH * sin(random_angle)
 
         nearest_food = self.nearest_food(creature)
         if nearest_food is not None:
-            food_angle = atan2(nearest_food.y - creature.y, nearest_food.x - creature.x)
+            food_dx, food_dy = self._offset(creature, nearest_food)
+            food_angle = atan2(food_dy, food_dx)
             move_dx += FOOD_BIAS_STRENGTH * cos(food_angle)
             move_dy += FOOD_BIAS_STRENGTH * sin(food_angle)
 
         nearest_smaller = self.nearest_smaller_creature(creature)
         if nearest_smaller is not None:
-            prey_angle = atan2(nearest_smaller.y - creature.y, nearest_smaller.x - creature.x)
+            prey_dx, prey_dy = self._offset(creature, nearest_smaller)
+            prey_angle = atan2(prey_dy, prey_dx)
             move_dx += PREY_BIAS_STRENGTH * cos(prey_angle)
             move_dy += PREY_BIAS_STRENGTH * sin(prey_angle)
 
         nearest_larger = self.nearest_larger_creature(creature)
         if nearest_larger is not None:
-            predator_angle = atan2(nearest_larger.y - creature.y, nearest_larger.x - creature.x)
+            predator_dx, predator_dy = self._offset(creature, nearest_larger)
+            predator_angle = atan2(predator_dy, predator_dx)
             move_dx -= PREDATOR_AVOID_STRENGTH * cos(predator_angle)
             move_dy -= PREDATOR_AVOID_STRENGTH * sin(predator_angle)
 
         return atan2(move_dy, move_dx)
 
     def add_creature(self) -> None:
-        self.creatures.append(self._spawn_creature())
+        creature = self._spawn_creature()
+        self.creatures.append(creature)
+        self.stats.add(creature)
         self.config.creatures = len(self.creatures)
 
     def remove_creature(self) -> None:
         if len(self.creatures) <= 1:
             return
-        self.creatures.pop()
+        self.stats.remove(self.creatures.pop())
         self.config.creatures = len(self.creatures)
 
     def add_food(self) -> None:
-        self.food.append(self._spawn_food())
+        self._append_food(self._spawn_food())
         self.config.food = len(self.food)
 
     def remove_food(self) -> None:
         if not self.food:
             return
         self.food.pop()
+        self.food_version += 1
+        if self._food_columns is not None:
+            for column in self._food_columns:
+                column.pop()
         self.config.food = len(self.food)
 
     def respawn_food(self) -> None:
         while len(self.food) < self.config.food:
-            self.food.append(self._spawn_food())
+            self._append_food(self._spawn_food())
 
     def feed_creature(self, creature: Creature, food_units: int = 1) -> None:
+        old_mass = creature.mass
+        old_food_eaten = creature.food_eaten
         for _ in range(food_units):
             creature.mass *= self.growth_factor(creature)
             creature.food_eaten += 1
-
-    def _eat_overlapping_food(self, creature: Creature) -> None:
-        surviving_food: list[Food] = []
-        for pellet in self.food:
-            distance = dist((creature.x, creature.y), (pellet.x, pellet.y))
-            max_distance = self.creature_radius(creature) + FOOD_RADIUS
-            if distance <= max_distance:
-                self.feed_creature(creature)
-            else:
-                surviving_food.append(pellet)
-        self.food = surviving_food
+        self.stats.fed(creature, old_mass, old_food_eaten)
+
+    def recompute_stats(self) -> None:
+        """Rebuild `stats` after creatures were changed by hand instead of through the simulation."""
+        self.stats.recompute(self.creatures)
+
+    def _eat_overlapping_food(self, creature: Creature, food_grid: NeighborIndex) -> list[Food]:
+        """Feed `creature` every pellet it overlaps and return the eaten pellets.
+
+        Pellets are checked in list order and the creature's reach grows with
+        each bite, exactly like a scan over the whole food list. Only pellets
+        from nearby grid cells are checked; if the meal grows the reach past
+        the searched area, the search is redone over the wider area.
+        """
+        position = (creature.x, creature.y)
+        start_reach = search_radius = creature.radius + FOOD_RADIUS
+        while True:
+            # Grow a candidate mass and reach; the creature itself is only fed once the meal is known.
+            mass = creature.mass
+            food_eaten = creature.food_eaten
+            reach = start_reach
+            bitten: list[Food] = []
+            for pellet in sorted(food_grid.within(creature.x, creature.y, search_radius), key=food_grid.order_of):
+                if self._distance(position, (pellet.x, pellet.y)) <= reach:
+                    mass *= GROWTH_FACTORS[min(food_eaten, MAX_GROWTH_FOOD_EATEN)]
+                    food_eaten += 1
+                    reach = CREATURE_RADIUS * sqrt(mass) + FOOD_RADIUS
+                    bitten.append(pellet)
+            if reach <= search_radius:
+                break
+            search_radius = reach
+
+        if bitten:
+            self.feed_creature(creature, len(bitten))
+        for pellet in bitten:
+            food_grid.remove(pellet)
+        return bitten
+
+    def _can_eat_each_other(self, creature: Creature, other: Creature) -> bool:
+        overlap_distance = creature.radius + other.radius
+        distance = self._distance((creature.x, creature.y), (other.x, other.y))
+        return distance <= overlap_distance and self.creature_size(creature) != self.creature_size(other)
+
+    def _push_overlap_pairs(
+        self,
+        creature: Creature,
+        grid: NeighborIndex,
+        max_radius: float,
+        pairs: list[tuple[int, int]],
+        later_only: bool = False,
+    ) -> int:
+        """Push every pair `creature` can eat or be eaten in and return how many were pushed."""
+        pushed = 0
+        order = grid.order_of(creature)
+        for other in grid.within(creature.x, creature.y, creature.radius + max_radius):
+            other_order = grid.order_of(other)
+            if other is creature or (later_only and other_order < order):
+                continue
+            first, second = (creature, other) if order < other_order else (other, creature)
+            if self._can_eat_each_other(first, second):
+                heappush(pairs, (min(order, other_order), max(order, other_order)))
+                pushed += 1
+        return pushed
 
     def _resolve_creature_overlaps(self) -> None:
-        changed = True
-        while changed and len(self.creatures) > 1:
-            changed = False
-            for index, creature in enumerate(self.creatures):
-                for other_index in range(index + 1, len(self.creatures)):
-                    other = self.creatures[other_index]
-                    overlap_distance = self.creature_radius(creature) + self.creature_radius(other)
-                    distance = dist((creature.x, creature.y), (other.x, other.y))
-                    creature_size = self.creature_size(creature)
-                    other_size = self.creature_size(other)
-                    if distance > overlap_distance or creature_size == other_size:
-                        continue
-                    if creature_size > other_size:
-                        self.feed_creature(creature, 1 + other.food_eaten // 2)
-                        self.creatures.pop(other_index)
-                    else:
-                        self.feed_creature(other, 1 + creature.food_eaten // 2)
-                        self.creatures.pop(index)
-                    changed = True
-                    break
-                if changed:
-                    break
+        """Let bigger creatures eat overlapping smaller ones.
+
+        Eats happen in the same order as rescanning the list from the start
+        after every eat: the earliest (creature, other) pair in list order
+        goes first. Candidate pairs are gathered once from a grid and kept in
+        a heap; only the winner of an eat needs its pairs looked up again.
+        """
+        if len(self.creatures) < 2:
+            return
+        by_order = list(self.creatures)
+        grid = self._neighbor_index(by_order)
+        max_radius = max(creature.radius for creature in by_order)
+
+        pairs: list[tuple[int, int]] = []
+        pair_count = 0
+        for creature in by_order:
+            pair_count += self._push_overlap_pairs(creature, grid, max_radius, pairs, later_only=True)
+
+        eats = 0
+        alive = [True] * len(by_order)
+        while pairs:
+            order, other_order = heappop(pairs)
+            if not (alive[order] and alive[other_order]):
+                continue
+            creature = by_order[order]
+            other = by_order[other_order]
+            # Earlier eats may have changed sizes, so check the pair again.
+            if not self._can_eat_each_other(creature, other):
+                continue
+            if self.creature_size(creature) > self.creature_size(other):
+                winner, loser, loser_order = creature, other, other_order
+            else:
+                winner, loser, loser_order = other, creature, order
+            self.feed_creature(winner, 1 + loser.food_eaten // 2)
+            alive[loser_order] = False
+            self.stats.remove(loser)
+            eats += 1
+            grid.remove(loser)
+            max_radius = max(max_radius, winner.radius)
+            pair_count += self._push_overlap_pairs(winner, grid, max_radius, pairs)
+
+        self.creatures[:] = [creature for creature, is_alive in zip(by_order, alive) if is_alive]
+        self.predation_events += eats
+        if self.observer is not None:
+            self.observer.count("predation", eats)
+            self.observer.count("overlap_pairs", pair_count)
+
+    def _neighbor_index(self, items: list[Creature] | list[Food]) -> NeighborIndex:
+        """Index `items` for neighbor queries; each item's order is its list position."""
+        if self.config.neighbor_index == "kdtree":
+            return PeriodicKDTree(self.world, items, wrap=self.config.wrap_distance)
+        grid = SpatialGrid(self.world, distance=self._distance)
+        for order, item in enumerate(items):
+            grid.insert(item, order)
+        return grid
+
+    def _build_neighbor_grids(self) -> None:
+        self._food_grid = self._neighbor_index(self.food)
+        self._creature_grid = self._neighbor_index(self.creatures)
+
+    def _steer_creature(self, creature: Creature, creature_grid: NeighborIndex) -> None:
+        angle = self.movement_angle(creature)
+        speed = self.movement_speed(creature)
+        dx = speed * cos(angle)
+        dy = speed * sin(angle)
+        creature.move(self.world, dx, dy)
+        creature_grid.update(creature)
+
+    def _remove_eaten_food(self, eaten_food: list[Food]) -> None:
+        if eaten_food:
+            # Eaten pellets leave the grid right away but the list is only
+            # compacted once per tick, keeping the survivors in order.
+            eaten_ids = {id(pellet) for pellet in eaten_food}
+            kept = [id(pellet) not in eaten_ids for pellet in self.food]
+            self.food[:] = compress(self.food, kept)
+            self.food_version += 1
+            if self._food_columns is not None:
+                xs, ys = self._food_columns
+                self._food_columns = (array("d", compress(xs, kept)), array("d", compress(ys, kept)))
 
     def step(self) -> None:
-        for creature in self.creatures:
-            angle = self.movement_angle(creature)
-            speed = self.movement_speed(creature)
-            dx = speed * cos(angle)
-            dy = speed * sin(angle)
-            creature.move(self.world, dx, dy)
-            self._eat_overlapping_food(creature)
+        observer = self.observer
+        # Phase times are only taken for an observer; steering and eating alternate per creature.
+        phase_start = perf_counter() if observer is not None else 0.0
+        self._build_neighbor_grids()
+        if observer is not None:
+            started, phase_start = phase_start, perf_counter()
+            observer.phase("grids", phase_start - started)
+        food_grid = self._food_grid
+        creature_grid = self._creature_grid
+        eaten_food: list[Food] = []
+        steering = eating = 0.0
+        try:
+            for creature in self.creatures:
+                self._steer_creature(creature, creature_grid)
+                if observer is not None:
+                    steered = perf_counter()
+                    steering += steered - phase_start
+                eaten_food.extend(self._eat_overlapping_food(creature, food_grid))
+                if observer is not None:
+                    phase_start = perf_counter()
+                    eating += phase_start - steered
+        finally:
+            self._food_grid = None
+            self._creature_grid = None
+        self._remove_eaten_food(eaten_food)
+        if observer is not None:
+            compacted = perf_counter()
+            observer.phase("steering", steering)
+            observer.phase("eating", eating)
+            observer.phase("food_compaction", compacted - phase_start)
+            observer.count("eats", len(eaten_food))
         self._resolve_creature_overlaps()
         self.tick += 1
+        if observer is not None:
+            observer.phase("overlaps", perf_counter() - compacted)
+            observer.tick_done(self.tick)
 
     def run(self, ticks: int) -> list[list[tuple[float, float]]]:
         positions: list[list[tuple[float, float]]] = []
@@ -226,3 +539,28 @@ class Simulation:
             self.step()
             positions.append([(creature.x, creature.y) for creature in self.creatures])
         return positions
+
+
+def create_simulation(
+    config: SimulationConfig,
+) -> "Simulation | NumpySimulation | ParallelSimulation | ChunkedSimulation | DistributedSimulation":
+    """Build the engine named by `config.engine`."""
+    if config.engine == "numpy":
+        from sim.numpy_engine import NumpySimulation
+
+        return NumpySimulation(config)
+    if config.engine == "parallel":
+        from sim.parallel import ParallelSimulation
+
+        return ParallelSimulation(config)
+    if config.engine == "chunked":
+        from sim.chunks import ChunkedSimulation
+
+        return ChunkedSimulation(config)
+    if config.engine == "distributed":
+        from sim.distributed import DistributedSimulation
+
+        return DistributedSimulation(config)
+    if config.engine != "reference":
+        raise ValueError(f"unknown engine: {config.engine}")
+    return Simulation(config)
@@ -0,0 +1,162 @@
+from collections.abc import Callable, Iterator
+from math import dist, hypot
+from typing import Protocol
+
+from sim.model import World
+
+
+GRID_CELL_SIZE = 2.0
+
+
+class HasPosition(Protocol):
+    x: float
+    y: float
+
+
+Point = tuple[float, float]
+Distance = Callable[[Point, Point], float]
+
+
+def wrapped_offset(delta: float, period: float) -> float:
+    """Return the shortest signed offset equal to `delta` on a wrap-around axis."""
+    return delta - period * round(delta / period)
+
+
+class WrappedDistance:
+    """Shortest distance between two points of a World whose edges wrap around."""
+
+    def __init__(self, world: World) -> None:
+        self.width = world.width
+        self.height = world.height
+
+    def __call__(self, first: Point, second: Point) -> float:
+        dx = abs(first[0] - second[0]) % self.width
+        dy = abs(first[1] - second[1]) % self.height
+        return hypot(min(dx, self.width - dx), min(dy, self.height - dy))
+
+
+def distance_for(world: World, wrap: bool) -> Distance:
+    """Return the distance function for `world`: wrap-aware, or plain (legacy) Euclidean."""
+    return WrappedDistance(world) if wrap else dist
+
+
+class SpatialGrid:
+    """A uniform grid of buckets laid over a wrap-around World.
+
+    Cells tile the world exactly, so the cell a point falls in is found with
+    one division and the grid wraps at the world edges like `Creature.move`.
+    Every item keeps an `order` number; ties on distance go to the lowest
+    order, which matches `min()` over the original list. `distance` is used
+    to rank items in `nearest`; pass a `WrappedDistance` to measure across
+    the seams.
+    """
+
+    def __init__(self, world: World, cell_size: float = GRID_CELL_SIZE, distance: Distance = dist) -> None:
+        self.columns = max(1, int(world.width // cell_size))
+        self.rows = max(1, int(world.height // cell_size))
+        self.cell_width = world.width / self.columns
+        self.cell_height = world.height / self.rows
+        self._min_cell_side = min(self.cell_width, self.cell_height)
+        self.distance = distance
+        self._cells: dict[tuple[int, int], list[HasPosition]] = {}
+        self._cell_of: dict[int, tuple[int, int]] = {}
+        self._order: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def __contains__(self, item: HasPosition) -> bool:
+        return id(item) in self._cell_of
+
+    def __iter__(self) -> Iterator[HasPosition]:
+        for bucket in self._cells.values():
+            yield from bucket
+
+    def occupied_cells(self) -> list[tuple[int, int]]:
+        """Return the (column, row) of every cell holding at least one item."""
+        return list(self._cells)
+
+    def cell_for(self, x: float, y: float) -> tuple[int, int]:
+        return int(x // self.cell_width) % self.columns, int(y // self.cell_height) % self.rows
+
+    def insert(self, item: HasPosition, order: int) -> None:
+        cell = self.cell_for(item.x, item.y)
+        self._cells.setdefault(cell, []).append(item)
+        self._cell_of[id(item)] = cell
+        self._order[id(item)] = order
+
+    def remove(self, item: HasPosition) -> None:
+        cell = self._cell_of.pop(id(item))
+        del self._order[id(item)]
+        bucket = self._cells[cell]
+        bucket.remove(item)
+        if not bucket:
+            del self._cells[cell]
+
+    def update(self, item: HasPosition) -> None:
+        """Move an item to the cell matching its current x, y."""
+        old_cell = self._cell_of[id(item)]
+        new_cell = self.cell_for(item.x, item.y)
+        if new_cell == old_cell:
+            return
+        bucket = self._cells[old_cell]
+        bucket.remove(item)
+        if not bucket:
+            del self._cells[old_cell]
+        self._cells.setdefault(new_cell, []).append(item)
+        self._cell_of[id(item)] = new_cell
+
+    def _ring(self, center: tuple[int, int], ring: int, seen: set[tuple[int, int]]) -> Iterator[list[HasPosition]]:
+        center_column, center_row = center
+        for row_offset in range(-ring, ring + 1):
+            edge_row = abs(row_offset) == ring
+            step = 1 if edge_row else 2 * ring
+            for column_offset in range(-ring, ring + 1, max(step, 1)):
+                cell = ((center_column + column_offset) % self.columns, (center_row + row_offset) % self.rows)
+                if cell in seen:
+                    continue
+                seen.add(cell)
+                bucket = self._cells.get(cell)
+                if bucket:
+                    yield bucket
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        accept: Callable[[HasPosition], bool] | None = None,
+    ) -> HasPosition | None:
+        """Return the closest accepted item, searching outward ring by ring."""
+        if not self._cell_of:
+            return None
+        center = self.cell_for(x, y)
+        seen: set[tuple[int, int]] = set()
+        best: HasPosition | None = None
+        best_key = (0.0, 0)
+        distance = self.distance
+        max_ring = max(self.columns, self.rows)
+        for ring in range(max_ring + 1):
+            for bucket in self._ring(center, ring, seen):
+                for item in bucket:
+                    if accept is not None and not accept(item):
+                        continue
+                    key = (distance((x, y), (item.x, item.y)), self._order[id(item)])
+                    if best is None or key < best_key:
+                        best = item
+                        best_key = key
+            # Anything in a farther ring is at least `ring` whole cells away.
+            if best is not None and best_key[0] < ring * self._min_cell_side:
+                break
+        return best
+
+    def within(self, x: float, y: float, radius: float) -> Iterator[HasPosition]:
+        """Yield every item in the cells a circle of `radius` can touch."""
+        center = self.cell_for(x, y)
+        seen: set[tuple[int, int]] = set()
+        rings = min(int(radius // self._min_cell_side) + 1, max(self.columns, self.rows))
+        for ring in range(rings + 1):
+            for bucket in self._ring(center, ring, seen):
+                yield from bucket
+
+    def order_of(self, item: HasPosition) -> int:
+        return self._order[id(item)]
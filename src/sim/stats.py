@@ -0,0 +1,97 @@
+from collections import Counter
+from collections.abc import Iterable
+from heapq import heapify, heappop, heappush
+from itertools import count
+from math import fsum
+
+from sim.model import Creature
+
+
+class PopulationStats:
+    """Population aggregates kept up to date as creatures spawn, eat and die.
+
+    Count, total mass, the food_eaten histogram, the max mass and the largest
+    creature can all be read in O(1). The largest creature comes from a
+    max-heap whose stale entries (eaten creatures, old masses) are skipped
+    when they reach the top. Changing a creature's mass or food_eaten
+    directly bypasses the bookkeeping; call `recompute()` afterwards.
+    """
+
+    def __init__(self, creatures: Iterable[Creature] = ()) -> None:
+        self.recompute(creatures)
+
+    def recompute(self, creatures: Iterable[Creature]) -> None:
+        """Rebuild every aggregate from scratch."""
+        self._members: dict[int, Creature] = {id(creature): creature for creature in creatures}
+        members = self._members.values()
+        self.total_mass = fsum(creature.mass for creature in members)
+        self.food_eaten_histogram: Counter[int] = Counter(creature.food_eaten for creature in members)
+        self._sequence = count()
+        self._heap = [(-creature.mass, next(self._sequence), creature) for creature in members]
+        heapify(self._heap)
+
+    def __getstate__(self) -> list[Creature]:
+        # Members are keyed by id(), which changes when copied or pickled.
+        return list(self._members.values())
+
+    def __setstate__(self, creatures: list[Creature]) -> None:
+        self.recompute(creatures)
+
+    @property
+    def count(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, creature: Creature) -> bool:
+        return id(creature) in self._members
+
+    def add(self, creature: Creature) -> None:
+        self._members[id(creature)] = creature
+        self.total_mass += creature.mass
+        self.food_eaten_histogram[creature.food_eaten] += 1
+        self._push(creature)
+
+    def remove(self, creature: Creature) -> None:
+        if self._members.pop(id(creature), None) is None:
+            return
+        self.total_mass -= creature.mass
+        self._decrement(creature.food_eaten)
+
+    def fed(self, creature: Creature, old_mass: float, old_food_eaten: int) -> None:
+        """Record that a member's mass and food_eaten changed from the old values."""
+        if id(creature) not in self._members:
+            return
+        self.total_mass += creature.mass - old_mass
+        self._decrement(old_food_eaten)
+        self.food_eaten_histogram[creature.food_eaten] += 1
+        self._push(creature)
+
+    @property
+    def largest(self) -> Creature | None:
+        heap = self._heap
+        while heap:
+            negative_mass, _, creature = heap[0]
+            if self._members.get(id(creature)) is creature and creature.mass == -negative_mass:
+                return creature
+            heappop(heap)
+        return None
+
+    @property
+    def max_mass(self) -> float:
+        largest = self.largest
+        return largest.mass if largest is not None else 0.0
+
+    def _push(self, creature: Creature) -> None:
+        heappush(self._heap, (-creature.mass, next(self._sequence), creature))
+        # Every meal leaves a stale entry behind; drop them once they pile up.
+        if len(self._heap) > 4 * len(self._members) + 64:
+            self._heap = [entry for entry in self._heap if self._is_current(entry)]
+            heapify(self._heap)
+
+    def _is_current(self, entry: tuple[float, int, Creature]) -> bool:
+        negative_mass, _, creature = entry
+        return self._members.get(id(creature)) is creature and creature.mass == -negative_mass
+
+    def _decrement(self, food_eaten: int) -> None:
+        self.food_eaten_histogram[food_eaten] -= 1
+        if not self.food_eaten_histogram[food_eaten]:
+            del self.food_eaten_histogram[food_eaten]
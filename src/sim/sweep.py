@@ -0,0 +1,87 @@
+import csv
+import os
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from itertools import product, repeat
+from typing import TextIO
+
+from sim.simulation import SimulationConfig, create_simulation
+
+
+@dataclass(frozen=True)
+class RunSummary:
+    """Outcome of one headless run, small enough to send between processes."""
+
+    seed: int
+    speed: float
+    creatures: int
+    food: int
+    ticks: int
+    final_creatures: int
+    final_food: int
+    total_mass: float
+    largest_mass: float
+    most_food_eaten: int
+
+
+def summarize_run(config: SimulationConfig, ticks: int) -> RunSummary:
+    # Copy so the caller's config is not changed by add/remove bookkeeping.
+    sim = create_simulation(replace(config))
+    try:
+        for _ in range(ticks):
+            sim.step()
+        creatures = sim.creatures
+        food = sim.food
+    finally:
+        sim.close()
+    return RunSummary(
+        seed=config.seed,
+        speed=config.speed,
+        creatures=config.creatures,
+        food=config.food,
+        ticks=ticks,
+        final_creatures=len(creatures),
+        final_food=len(food),
+        total_mass=sum(creature.mass for creature in creatures),
+        largest_mass=max(creature.mass for creature in creatures),
+        most_food_eaten=max(creature.food_eaten for creature in creatures),
+    )
+
+
+def sweep_configs(
+    base: SimulationConfig,
+    seeds: Iterable[int],
+    speeds: Sequence[float] | None = None,
+    creatures: Sequence[int] | None = None,
+    food: Sequence[int] | None = None,
+) -> list[SimulationConfig]:
+    """Return one config per combination of the given values, seeds varying fastest."""
+    speeds = speeds or [base.speed]
+    creatures = creatures or [base.creatures]
+    food = food or [base.food]
+    return [
+        replace(base, speed=speed, creatures=creature_count, food=food_count, seed=seed)
+        for speed, creature_count, food_count, seed in product(speeds, creatures, food, list(seeds))
+    ]
+
+
+def run_sweep(configs: Sequence[SimulationConfig], ticks: int, workers: int | None = None) -> list[RunSummary]:
+    """Run every config for `ticks` steps and return summaries in config order.
+
+    Runs are spread over a process pool; `workers=1` runs them in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(configs) <= 1:
+        return [summarize_run(config, ticks) for config in configs]
+    # Hand out several runs per task so short runs don't drown in pickling.
+    chunksize = max(1, len(configs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(summarize_run, configs, repeat(ticks), chunksize=chunksize))
+
+
+def write_summaries_csv(summaries: Iterable[RunSummary], out: TextIO) -> None:
+    writer = csv.DictWriter(out, fieldnames=[field.name for field in fields(RunSummary)])
+    writer.writeheader()
+    for summary in summaries:
+        writer.writerow(asdict(summary))
@@ -0,0 +1,389 @@
+import mmap
+import struct
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from itertools import count
+from pathlib import Path
+from typing import BinaryIO, Protocol
+from weakref import WeakValueDictionary
+
+from sim.model import Creature, Food, World
+
+
+TRAJECTORY_MAGIC = b"EVOTRAJ3"
+INDEX_MAGIC = b"EVOINDEX"
+# Every column is 8 bytes wide, so a chunk is just the columns back to back.
+TRAJECTORY_COLUMNS = (
+    ("tick", "q"),
+    ("id", "q"),
+    ("x", "d"),
+    ("y", "d"),
+    ("mass", "d"),
+    ("food_eaten", "q"),
+)
+FOOD_COLUMNS = (
+    ("tick", "q"),
+    ("id", "q"),
+    ("x", "d"),
+    ("y", "d"),
+)
+FILE_HEADER = struct.Struct("<8sdd")
+CHUNK_HEADER = struct.Struct("<qq")
+FOOTER = struct.Struct("<qq8s")
+# Per recorded tick: chunk offset, first creature row, creature rows,
+# first food row, food rows.
+INDEX_FIELDS = 5
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+
+class RecordableSimulation(Protocol):
+    tick: int
+    world: World
+
+    @property
+    def creatures(self) -> Sequence[Creature]: ...
+
+    @property
+    def food(self) -> Sequence[Food]: ...
+
+    def step(self) -> None: ...
+
+
+class _ColumnBuffer:
+    """Preallocated typed columns that fill up row by row."""
+
+    def __init__(self, layout: tuple[tuple[str, str], ...], rows: int) -> None:
+        self.layout = layout
+        self.columns = {name: array(typecode, bytes(8 * rows)) for name, typecode in layout}
+        self.rows = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self.columns["tick"])
+
+    def reserve(self, rows: int) -> None:
+        # Only a single tick bigger than a whole chunk gets here.
+        extra_rows = rows - self.capacity
+        if extra_rows <= 0:
+            return
+        for name, typecode in self.layout:
+            self.columns[name].extend(array(typecode, bytes(8 * extra_rows)))
+
+    def write_to(self, out: BinaryIO) -> None:
+        for name, _ in self.layout:
+            out.write(memoryview(self.columns[name])[: self.rows])
+
+
+class TrajectoryRecorder:
+    """Write creature and food state per tick to a binary trajectory file.
+
+    Creature rows are (tick, id, x, y, mass, food_eaten) and food rows are
+    (tick, id, x, y). Rows collect in preallocated typed arrays of `chunk_rows`
+    rows and are written out one chunk at a time, so memory stays fixed
+    however long the run is. A tick's rows never straddle two chunks, and
+    `close()` appends an index of where every tick starts. With `stride`
+    above 1, only every `stride`-th tick is recorded.
+    """
+
+    def __init__(
+        self,
+        out: BinaryIO,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        stride: int = 1,
+        record_food: bool = True,
+    ) -> None:
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        if stride < 1:
+            raise ValueError("stride must be at least 1")
+        self.out = out
+        self.stride = stride
+        self.record_food = record_food
+        self.rows_written = 0
+        self._creatures = _ColumnBuffer(TRAJECTORY_COLUMNS, chunk_rows)
+        self._food = _ColumnBuffer(FOOD_COLUMNS, chunk_rows if record_food else 1)
+        self._started = False
+        self._offset = 0
+        self._ticks = array("q")
+        self._index = array("q")
+        self._chunk_ticks: list[tuple[int, int, int, int, int]] = []
+
+    @property
+    def rows(self) -> int:
+        return self._creatures.rows
+
+    @property
+    def capacity(self) -> int:
+        return self._creatures.capacity
+
+    def _start(self, world: World) -> None:
+        header = FILE_HEADER.pack(TRAJECTORY_MAGIC, world.width, world.height)
+        self.out.write(header)
+        self._offset = len(header)
+        self._started = True
+
+    def record(self, sim: RecordableSimulation) -> None:
+        if sim.tick % self.stride:
+            return
+        if not self._started:
+            self._start(sim.world)
+        creatures = sim.creatures
+        food = sim.food if self.record_food else []
+        if (
+            self._creatures.rows + len(creatures) > self._creatures.capacity
+            or self._food.rows + len(food) > self._food.capacity
+        ):
+            self.flush()
+        self._creatures.reserve(len(creatures))
+        self._food.reserve(len(food))
+        self._chunk_ticks.append((sim.tick, self._creatures.rows, len(creatures), self._food.rows, len(food)))
+
+        tick = self._creatures.columns["tick"]
+        ids = self._creatures.columns["id"]
+        xs = self._creatures.columns["x"]
+        ys = self._creatures.columns["y"]
+        masses = self._creatures.columns["mass"]
+        food_eaten = self._creatures.columns["food_eaten"]
+        row = self._creatures.rows
+        for creature in creatures:
+            tick[row] = sim.tick
+            ids[row] = creature.id
+            xs[row] = creature.x
+            ys[row] = creature.y
+            masses[row] = creature.mass
+            food_eaten[row] = creature.food_eaten
+            row += 1
+        self._creatures.rows = row
+
+        food_tick = self._food.columns["tick"]
+        food_ids = self._food.columns["id"]
+        food_xs = self._food.columns["x"]
+        food_ys = self._food.columns["y"]
+        row = self._food.rows
+        for pellet in food:
+            food_tick[row] = sim.tick
+            food_ids[row] = pellet.id
+            food_xs[row] = pellet.x
+            food_ys[row] = pellet.y
+            row += 1
+        self._food.rows = row
+
+    def flush(self) -> None:
+        if not self._chunk_ticks:
+            return
+        for tick, creature_start, creature_rows, food_start, food_rows in self._chunk_ticks:
+            self._ticks.append(tick)
+            self._index.extend((self._offset, creature_start, creature_rows, food_start, food_rows))
+        self.out.write(CHUNK_HEADER.pack(self._creatures.rows, self._food.rows))
+        self._creatures.write_to(self.out)
+        self._food.write_to(self.out)
+        self._offset += CHUNK_HEADER.size + 8 * (
+            len(TRAJECTORY_COLUMNS) * self._creatures.rows + len(FOOD_COLUMNS) * self._food.rows
+        )
+        self.rows_written += self._creatures.rows
+        self._creatures.rows = 0
+        self._food.rows = 0
+        self._chunk_ticks = []
+
+    def close(self) -> None:
+        """Flush the last chunk and append the tick index and footer."""
+        if not self._started:
+            self._start(World(width=0.0, height=0.0))
+        self.flush()
+        index_offset = self._offset
+        self.out.write(self._ticks.tobytes())
+        self.out.write(self._index.tobytes())
+        self.out.write(FOOTER.pack(index_offset, len(self._ticks), INDEX_MAGIC))
+        self.out.flush()
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def record_run(sim: RecordableSimulation, ticks: int, recorder: TrajectoryRecorder) -> None:
+    """Step `sim` for `ticks` ticks, recording the start and every tick after."""
+    recorder.record(sim)
+    for _ in range(ticks):
+        sim.step()
+        recorder.record(sim)
+
+
+@dataclass(frozen=True)
+class TrajectoryFrame:
+    """One recorded tick; the columns are views straight into the file.
+
+    The views last until the TrajectoryFile is closed, which releases them;
+    reading a column after that raises ValueError.
+    """
+
+    tick: int
+    world: World
+    ids: memoryview
+    xs: memoryview
+    ys: memoryview
+    masses: memoryview
+    food_eaten: memoryview
+    food_ids: memoryview
+    food_xs: memoryview
+    food_ys: memoryview
+
+    @property
+    def creatures(self) -> list[Creature]:
+        return [
+            Creature(x=x, y=y, mass=mass, food_eaten=eaten, id=creature_id)
+            for creature_id, x, y, mass, eaten in zip(self.ids, self.xs, self.ys, self.masses, self.food_eaten)
+        ]
+
+    @property
+    def food(self) -> list[Food]:
+        return [Food(x=x, y=y, id=food_id) for food_id, x, y in zip(self.food_ids, self.food_xs, self.food_ys)]
+
+    def release(self) -> None:
+        for column in (
+            self.ids,
+            self.xs,
+            self.ys,
+            self.masses,
+            self.food_eaten,
+            self.food_ids,
+            self.food_xs,
+            self.food_ys,
+        ):
+            column.release()
+
+
+class TrajectoryFile:
+    """A finished trajectory file opened with mmap for random-access replay.
+
+    Frames are views into the map; `close()` releases every frame still
+    alive before unmapping the file.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, width, height = FILE_HEADER.unpack_from(view)
+        index_offset, tick_count, index_magic = FOOTER.unpack_from(view, len(view) - FOOTER.size)
+        if magic != TRAJECTORY_MAGIC or index_magic != INDEX_MAGIC:
+            view.release()
+            self._map.close()
+            self._file.close()
+            raise ValueError(f"{path} is not a finished trajectory file")
+        self.world = World(width=width, height=height)
+        self._view = view
+        # Frames handed out and still referenced somewhere, by serial number.
+        self._frames: WeakValueDictionary[int, TrajectoryFrame] = WeakValueDictionary()
+        self._frame_serial = count()
+        ticks_end = index_offset + 8 * tick_count
+        self.ticks = view[index_offset:ticks_end].cast("q")
+        self._index = view[ticks_end : ticks_end + 8 * INDEX_FIELDS * tick_count].cast("q")
+        # Recorded ticks are normally every `stride`-th one, so a tick's frame
+        # is found by division; otherwise a table maps each tick in the
+        # recorded range to its frame.
+        self._stride = self.ticks[1] - self.ticks[0] if tick_count > 1 else 1
+        self._tick_positions: array | None = None
+        gaps = (later - earlier for earlier, later in zip(self.ticks, self.ticks[1:]))
+        if self._stride < 1 or any(gap != self._stride for gap in gaps):
+            self._tick_positions = self._build_tick_positions()
+
+    def __len__(self) -> int:
+        return len(self.ticks)
+
+    def frame(self, position: int) -> TrajectoryFrame:
+        """Return the `position`-th recorded tick without copying its columns."""
+        if not 0 <= position < len(self.ticks):
+            raise IndexError("trajectory frame out of range")
+        entry = INDEX_FIELDS * position
+        offset, creature_start, creature_rows, food_start, food_rows = self._index[entry : entry + INDEX_FIELDS]
+        chunk_creature_rows, chunk_food_rows = CHUNK_HEADER.unpack_from(self._view, offset)
+        creature_base = offset + CHUNK_HEADER.size
+        food_base = creature_base + 8 * len(TRAJECTORY_COLUMNS) * chunk_creature_rows
+
+        def creature_column(column: int, typecode: str) -> memoryview:
+            start = creature_base + 8 * (column * chunk_creature_rows + creature_start)
+            return self._view[start : start + 8 * creature_rows].cast(typecode)
+
+        def food_column(column: int, typecode: str) -> memoryview:
+            start = food_base + 8 * (column * chunk_food_rows + food_start)
+            return self._view[start : start + 8 * food_rows].cast(typecode)
+
+        frame = TrajectoryFrame(
+            tick=self.ticks[position],
+            world=self.world,
+            ids=creature_column(1, "q"),
+            xs=creature_column(2, "d"),
+            ys=creature_column(3, "d"),
+            masses=creature_column(4, "d"),
+            food_eaten=creature_column(5, "q"),
+            food_ids=food_column(1, "q"),
+            food_xs=food_column(2, "d"),
+            food_ys=food_column(3, "d"),
+        )
+        self._frames[next(self._frame_serial)] = frame
+        return frame
+
+    def _build_tick_positions(self) -> array:
+        positions = array("q")
+        for position, tick in enumerate(self.ticks):
+            next_tick = self.ticks[position + 1] if position + 1 < len(self.ticks) else tick + 1
+            positions.extend(array("q", [position]) * (next_tick - tick))
+        return positions
+
+    def position_for_tick(self, tick: int) -> int:
+        """Return the position of the last recorded frame at or before `tick`."""
+        if not self.ticks:
+            return 0
+        offset = max(0, tick - self.ticks[0])
+        if self._tick_positions is not None:
+            return self._tick_positions[min(offset, len(self._tick_positions) - 1)]
+        return min(offset // self._stride, len(self.ticks) - 1)
+
+    def close(self) -> None:
+        for frame in list(self._frames.values()):
+            frame.release()
+        self._frames.clear()
+        self._index.release()
+        self.ticks.release()
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "TrajectoryFile":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def iter_trajectory_chunks(path: str | Path) -> Iterator[dict[str, array]]:
+    """Yield the creature columns of each chunk in a trajectory file."""
+    with open(path, "rb") as trajectory:
+        magic, _, _ = FILE_HEADER.unpack(trajectory.read(FILE_HEADER.size))
+        if magic != TRAJECTORY_MAGIC:
+            raise ValueError(f"{path} is not a trajectory file")
+        trajectory.seek(-FOOTER.size, 2)
+        index_offset, _, _ = FOOTER.unpack(trajectory.read(FOOTER.size))
+        trajectory.seek(FILE_HEADER.size)
+        while trajectory.tell() < index_offset:
+            creature_rows, food_rows = CHUNK_HEADER.unpack(trajectory.read(CHUNK_HEADER.size))
+            chunk = {}
+            for name, typecode in TRAJECTORY_COLUMNS:
+                column = array(typecode)
+                column.fromfile(trajectory, creature_rows)
+                chunk[name] = column
+            trajectory.seek(8 * len(FOOD_COLUMNS) * food_rows, 1)
+            yield chunk
+
+
+def read_trajectory(path: str | Path) -> dict[str, array]:
+    """Load every creature row of a trajectory file into one typed array per column."""
+    columns = {name: array(typecode) for name, typecode in TRAJECTORY_COLUMNS}
+    for chunk in iter_trajectory_chunks(path):
+        for name, column in chunk.items():
+            columns[name].extend(column)
+    return columns
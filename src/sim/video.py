@@ -0,0 +1,109 @@
+import os
+import shlex
+import subprocess
+from pathlib import Path
+
+import pygame
+
+from sim.lod import DEFAULT_LEVEL_OF_DETAIL, FULL_DETAIL
+from sim.pygame_view import BACKGROUND, save_png, world_sprites
+from sim.render_cache import RenderCache
+from sim.simulation import Simulation
+from sim.writer import BackgroundWriter
+
+
+FRAME_NAME = "frame_{:06d}.png"
+
+
+class RawVideoPipe:
+    """Stream raw RGB24 frames into the stdin of an encoder such as ffmpeg.
+
+    `command` may use {width} and {height}, for example
+    "ffmpeg -y -f rawvideo -pix_fmt rgb24 -s {width}x{height} -r 30 -i - out.mp4".
+    """
+
+    def __init__(self, command: str, size: tuple[int, int]) -> None:
+        width, height = size
+        self.command = command.format(width=width, height=height)
+        self._process = subprocess.Popen(shlex.split(self.command), stdin=subprocess.PIPE)
+
+    def write(self, pixels: bytes) -> None:
+        self._process.stdin.write(pixels)
+
+    def close(self) -> None:
+        self._process.stdin.close()
+        if self._process.wait():
+            raise RuntimeError(f"{self.command!r} exited with status {self._process.returncode}")
+
+
+def render_world(
+    surface: pygame.Surface,
+    sim: Simulation,
+    scale: int,
+    radius_px: int,
+    font: pygame.font.Font,
+    cache: RenderCache,
+    level_of_detail: bool = True,
+) -> None:
+    lod = DEFAULT_LEVEL_OF_DETAIL if level_of_detail else FULL_DETAIL
+    surface.fill(BACKGROUND)
+    surface.blits(world_sprites(sim, scale, radius_px, font, cache, lod), doreturn=False)
+
+
+def export_video(
+    sim: Simulation,
+    ticks: int,
+    scale: int,
+    radius_px: int,
+    frame_dir: str | Path | None = None,
+    pipe_command: str | None = None,
+    ticks_per_frame: int = 1,
+    level_of_detail: bool = True,
+    max_pending: int = 8,
+) -> int:
+    """Render the world offscreen every `ticks_per_frame` ticks and return the frame count.
+
+    Frames go to numbered PNGs in `frame_dir` or as raw RGB to `pipe_command`.
+    Saving or encoding runs on a background thread, so it overlaps with
+    stepping the simulation.
+    """
+    if (frame_dir is None) == (pipe_command is None):
+        raise ValueError("give exactly one of frame_dir or pipe_command")
+    if ticks_per_frame < 1:
+        raise ValueError("ticks_per_frame must be at least 1")
+
+    # Headless boxes have no display; the dummy driver lets pygame start anyway.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    size = (int(sim.world.width * scale), int(sim.world.height * scale))
+    surface = pygame.Surface(size)
+    font = pygame.font.Font(None, 24)
+    cache = RenderCache()
+    pipe = RawVideoPipe(pipe_command, size) if pipe_command is not None else None
+    if frame_dir is not None:
+        Path(frame_dir).mkdir(parents=True, exist_ok=True)
+
+    frames = 0
+    writer = BackgroundWriter(max_pending, name="video-writer")
+    try:
+        while True:
+            render_world(surface, sim, scale, radius_px, font, cache, level_of_detail)
+            pixels = pygame.image.tobytes(surface, "RGB")
+            if pipe is not None:
+                writer.submit(lambda pixels=pixels: pipe.write(pixels))
+            else:
+                path = Path(frame_dir) / FRAME_NAME.format(frames)
+                writer.submit(lambda pixels=pixels, path=path: save_png(pixels, size, path))
+            frames += 1
+            if sim.tick >= ticks:
+                break
+            for _ in range(min(ticks_per_frame, ticks - sim.tick)):
+                sim.step()
+    finally:
+        try:
+            # Re-raises a failed save or pipe write, so the pipe is closed either way.
+            writer.close()
+        finally:
+            if pipe is not None:
+                pipe.close()
+    return frames
@@ -0,0 +1,190 @@
+import struct
+import time
+from array import array
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+
+from sim.model import World
+from sim.simulation import Simulation
+from sim.trajectory import TrajectoryFrame
+
+
+# tick, world width, world height, creature count, food count, ticks/sec
+SNAPSHOT_HEADER = struct.Struct("<qddqqd")
+FOOD_RESPAWN_S = 5.0
+# How long the worker may step in "max" speed before checking for commands.
+MAX_SPEED_SLICE_S = 0.02
+IDLE_POLL_S = 0.05
+
+
+def pack_snapshot(sim: Simulation, ticks_per_second: float) -> bytes:
+    creatures = sim.creatures
+    food = sim.food
+    return b"".join(
+        [
+            SNAPSHOT_HEADER.pack(
+                sim.tick, sim.world.width, sim.world.height, len(creatures), len(food), ticks_per_second
+            ),
+            array("q", [creature.id for creature in creatures]).tobytes(),
+            array("d", [creature.x for creature in creatures]).tobytes(),
+            array("d", [creature.y for creature in creatures]).tobytes(),
+            array("d", [creature.mass for creature in creatures]).tobytes(),
+            array("q", [creature.food_eaten for creature in creatures]).tobytes(),
+            array("q", [pellet.id for pellet in food]).tobytes(),
+            array("d", [pellet.x for pellet in food]).tobytes(),
+            array("d", [pellet.y for pellet in food]).tobytes(),
+        ]
+    )
+
+
+def unpack_snapshot(data: bytes) -> tuple[TrajectoryFrame, float]:
+    """Return a read-only frame over `data` plus the worker's ticks per second."""
+    tick, width, height, creature_count, food_count, ticks_per_second = SNAPSHOT_HEADER.unpack_from(data)
+    view = memoryview(data)
+    offset = SNAPSHOT_HEADER.size
+
+    def column(typecode: str, rows: int) -> memoryview:
+        nonlocal offset
+        start = offset
+        offset += 8 * rows
+        return view[start:offset].cast(typecode)
+
+    frame = TrajectoryFrame(
+        tick=tick,
+        world=World(width=width, height=height),
+        ids=column("q", creature_count),
+        xs=column("d", creature_count),
+        ys=column("d", creature_count),
+        masses=column("d", creature_count),
+        food_eaten=column("q", creature_count),
+        food_ids=column("q", food_count),
+        food_xs=column("d", food_count),
+        food_ys=column("d", food_count),
+    )
+    return frame, ticks_per_second
+
+
+def _worker_main(sim: Simulation, ticks: int, ticks_per_frame: int, commands: Connection, frames: Connection) -> None:
+    # Imported here so the simulation module never depends on pygame.
+    from sim.pygame_view import apply_button_action
+
+    playing = True
+    running = True
+    frame_wanted = False
+    allowance = 0
+    respawn_at = time.monotonic() + FOOD_RESPAWN_S
+    rate_start = time.perf_counter()
+    rate_ticks = 0
+    ticks_per_second = 0.0
+
+    while running:
+        while commands.poll():
+            command, *args = commands.recv()
+            if command == "frame":
+                frame_wanted = True
+                allowance += ticks_per_frame
+            elif command == "ticks_per_frame":
+                (ticks_per_frame,) = args
+                allowance = 0
+            elif command == "button":
+                clicked, mods = args
+                sim, _, playing, _, running, _ = apply_button_action(
+                    clicked=clicked,
+                    sim=sim,
+                    config=sim.config,
+                    current_fps=1,
+                    playing=playing,
+                    screenshot_dir="",
+                    screen=None,
+                    mods=mods,
+                )
+                if clicked == "Reset":
+                    respawn_at = time.monotonic() + FOOD_RESPAWN_S
+            elif command == "stop":
+                running = False
+
+        ran = 0
+        if playing and sim.tick < ticks:
+            if ticks_per_frame > 0:
+                while allowance > 0 and sim.tick < ticks:
+                    sim.step()
+                    allowance -= 1
+                    ran += 1
+            else:
+                deadline = time.perf_counter() + MAX_SPEED_SLICE_S
+                while sim.tick < ticks and time.perf_counter() < deadline:
+                    sim.step()
+                    ran += 1
+        rate_ticks += ran
+        now = time.perf_counter()
+        if now - rate_start >= 0.5:
+            ticks_per_second = rate_ticks / (now - rate_start)
+            rate_start = now
+            rate_ticks = 0
+
+        if time.monotonic() >= respawn_at:
+            sim.respawn_food()
+            respawn_at = time.monotonic() + FOOD_RESPAWN_S
+
+        if frame_wanted:
+            frames.send_bytes(pack_snapshot(sim, ticks_per_second))
+            frame_wanted = False
+        if not ran:
+            commands.poll(IDLE_POLL_S)
+
+    sim.close()
+    frames.close()
+
+
+class SimulationWorker:
+    """Run a simulation in a separate process and publish snapshots of it.
+
+    The UI keeps drawing its current (front) frame while the worker fills the
+    next one; `poll_frame()` swaps in a new frame whenever one has arrived
+    and asks for the next, so at most one snapshot is ever in flight.
+    """
+
+    def __init__(self, sim: Simulation, ticks: int, ticks_per_frame: int = 1) -> None:
+        self._commands, worker_commands = Pipe()
+        worker_frames, self._frames = Pipe()
+        self._process = Process(
+            target=_worker_main,
+            args=(sim, ticks, ticks_per_frame, worker_commands, worker_frames),
+            daemon=True,
+        )
+        self._process.start()
+        worker_commands.close()
+        worker_frames.close()
+        self.ticks_per_second = 0.0
+        self._commands.send(("frame",))
+
+    def wait_frame(self, timeout: float | None = None) -> TrajectoryFrame | None:
+        """Block until the next snapshot arrives and return it."""
+        if not self._frames.poll(timeout):
+            return None
+        return self.poll_frame()
+
+    def poll_frame(self) -> TrajectoryFrame | None:
+        """Return the newest snapshot that has arrived, or None if none has."""
+        if not self._frames.poll():
+            return None
+        frame, self.ticks_per_second = unpack_snapshot(self._frames.recv_bytes())
+        self._commands.send(("frame",))
+        return frame
+
+    def send_button(self, clicked: str | None, mods: int = 0) -> None:
+        self._commands.send(("button", clicked, mods))
+
+    def set_ticks_per_frame(self, ticks_per_frame: int) -> None:
+        self._commands.send(("ticks_per_frame", ticks_per_frame))
+
+    def close(self) -> None:
+        try:
+            self._commands.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._commands.close()
+        self._frames.close()
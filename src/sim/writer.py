@@ -0,0 +1,83 @@
+import queue
+import threading
+from collections.abc import Callable
+from typing import Any
+
+
+DEFAULT_MAX_PENDING = 8
+
+
+class BackgroundWriter:
+    """Run write jobs one at a time, in order, on a background thread.
+
+    Jobs wait in a queue of at most `max_pending` entries, so a slow disk or
+    encoder holds the producer back instead of filling memory. Each job's
+    return value can be collected with `completed()`. If a job raises, later
+    jobs are dropped and the error is raised again from the next `submit()`
+    or from `close()`.
+    """
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING, name: str = "background-writer") -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self._jobs: queue.Queue[Callable[[], Any] | None] = queue.Queue(max_pending)
+        self._results: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self._results.put(job())
+            except BaseException as error:
+                self._error = error
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    @property
+    def pending(self) -> int:
+        return self._jobs.qsize()
+
+    def submit(self, job: Callable[[], Any], block: bool = True) -> bool:
+        """Queue `job`; with `block=False`, return False instead of waiting when the queue is full."""
+        if self._closed:
+            raise ValueError("writer is closed")
+        self._raise_error()
+        try:
+            self._jobs.put(job, block=block)
+        except queue.Full:
+            return False
+        return True
+
+    def completed(self) -> list[Any]:
+        """Return the results of jobs that finished since the last call."""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def close(self) -> None:
+        """Wait for every queued job to finish."""
+        if not self._closed:
+            self._closed = True
+            self._jobs.put(None)
+            self._thread.join()
+        self._raise_error()
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,76 @@
+import pytest
+
+from sim.bench import (
+    BenchResult,
+    compare_results,
+    entity_bytes,
+    load_results,
+    main,
+    run_benchmarks,
+    write_results,
+)
+from sim.model import Creature, Food
+
+
+def test_run_benchmarks_times_every_requested_case() -> None:
+    results = run_benchmarks(["step", "nearest_food"], creature_counts=[10], food_per_creature=[1.0, 2.0], repeats=1)
+
+    assert [(result.name, result.creatures, result.food) for result in results] == [
+        ("step", 10, 10),
+        ("nearest_food", 10, 10),
+        ("step", 10, 20),
+        ("nearest_food", 10, 20),
+    ]
+    assert all(result.seconds > 0 for result in results)
+
+
+def test_run_benchmarks_rejects_unknown_names() -> None:
+    with pytest.raises(ValueError, match="unknown benchmark"):
+        run_benchmarks(["warp_drive"], creature_counts=[10])
+
+
+def test_results_round_trip_through_json(tmp_path) -> None:
+    results = [BenchResult(name="step", creatures=10, food=10, items=10, repeats=3, seconds=0.5)]
+    path = tmp_path / "bench.json"
+
+    write_results(results, path)
+
+    assert load_results(path) == results
+
+
+def test_compare_results_flags_only_slowdowns_past_tolerance() -> None:
+    baseline = [
+        BenchResult(name="step", creatures=10, food=10, items=10, repeats=3, seconds=1.0),
+        BenchResult(name="draw_frame", creatures=10, food=10, items=20, repeats=3, seconds=1.0),
+    ]
+    results = [
+        BenchResult(name="step", creatures=10, food=10, items=10, repeats=3, seconds=1.2),
+        BenchResult(name="draw_frame", creatures=10, food=10, items=20, repeats=3, seconds=1.5),
+        BenchResult(name="step", creatures=100, food=100, items=100, repeats=3, seconds=9.0),
+    ]
+
+    (regression,) = compare_results(results, baseline, tolerance=0.25)
+
+    assert regression.result.name == "draw_frame"
+    assert regression.slowdown == 1.5
+
+
+def test_main_fails_when_slower_than_baseline(tmp_path) -> None:
+    baseline = tmp_path / "baseline.json"
+    write_results([BenchResult(name="step", creatures=10, food=10, items=10, repeats=1, seconds=1e-12)], baseline)
+
+    status = main(
+        ["step", "--creatures", "10", "--food-per-creature", "1", "--repeats", "1", "--baseline", str(baseline)]
+    )
+
+    assert status == 1
+
+
+def test_entities_stay_within_their_memory_budget() -> None:
+    # Slotted entities (creatures also carry a cached radius); a per-instance
+    # __dict__ would push both well past these.
+    creature = entity_bytes(lambda index: Creature(x=index * 0.5, y=index * 0.25, mass=1.5, id=index), 20_000)
+    food = entity_bytes(lambda index: Food(x=index * 0.5, y=index * 0.25, id=index), 20_000)
+
+    assert creature <= 192
+    assert food <= 160
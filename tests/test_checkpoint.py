@@ -0,0 +1,130 @@
+from dataclasses import replace
+
+import pytest
+
+from sim.checkpoint import Checkpointer, branch, load_checkpoint, restore, save_checkpoint, snapshot
+from sim.simulation import Simulation, SimulationConfig
+
+
+def state(sim: Simulation) -> list[tuple[float, float, float, int, int]]:
+    return [(c.x, c.y, c.mass, c.food_eaten, c.id) for c in sim.creatures]
+
+
+def test_restored_simulation_continues_bit_for_bit() -> None:
+    sim = Simulation(SimulationConfig(creatures=20, food=100, seed=5))
+    for _ in range(15):
+        sim.step()
+
+    restored = Simulation.restore(sim.snapshot())
+    for _ in range(20):
+        sim.step()
+        restored.step()
+
+    assert restored.tick == sim.tick == 35
+    assert state(restored) == state(sim)
+    assert [(p.x, p.y) for p in restored.food] == [(p.x, p.y) for p in sim.food]
+
+
+def test_restore_keeps_config_and_creature_ids() -> None:
+    sim = Simulation(SimulationConfig(creatures=3, food=4, seed=9, speed=0.3))
+    sim.add_creature()
+    sim.creatures.pop(0)
+
+    restored = restore(snapshot(sim))
+
+    assert restored.config == sim.config
+    restored.add_creature()
+    assert [c.id for c in restored.creatures] == [1, 2, 3, 4]
+
+
+def test_restore_keeps_food_ids() -> None:
+    sim = Simulation(SimulationConfig(creatures=3, food=4, seed=9))
+    sim.food.pop(1)
+
+    restored = restore(snapshot(sim))
+
+    assert restored.food == sim.food
+    restored.add_food()
+    assert [p.id for p in restored.food] == [0, 2, 3, 4]
+
+
+def test_restore_keeps_wrap_distance() -> None:
+    sim = Simulation(SimulationConfig(creatures=5, food=10, seed=2, wrap_distance=True))
+
+    restored = restore(snapshot(sim))
+
+    assert restored.config.wrap_distance is True
+    sim.step()
+    restored.step()
+    assert [(c.x, c.y) for c in restored.creatures] == [(c.x, c.y) for c in sim.creatures]
+
+
+def test_restore_takes_runtime_settings_from_settings() -> None:
+    sim = Simulation(SimulationConfig(creatures=5, food=10, seed=2, neighbor_index="kdtree"))
+
+    restored = restore(snapshot(sim), settings=SimulationConfig(seed=4, neighbor_index="kdtree", workers=3))
+
+    assert restored.config == replace(sim.config, workers=3)
+
+
+def test_branch_is_independent_of_original() -> None:
+    sim = Simulation(SimulationConfig(creatures=5, food=10, seed=2))
+    what_if = branch(sim)
+
+    what_if.add_food()
+    what_if.step()
+
+    assert sim.tick == 0
+    assert len(sim.food) == 10
+
+
+def test_restore_rejects_other_bytes() -> None:
+    with pytest.raises(ValueError, match="not a simulation checkpoint"):
+        restore(b"x" * 200)
+
+
+def test_checkpointer_saves_every_n_ticks(tmp_path) -> None:
+    path = tmp_path / "run.ckpt"
+    sim = Simulation(SimulationConfig(creatures=4, food=10, seed=3))
+    checkpointer = Checkpointer(path, every=5)
+
+    for _ in range(12):
+        sim.step()
+        checkpointer.record(sim)
+
+    assert load_checkpoint(path).tick == 10
+    assert not (tmp_path / "run.ckpt.tmp").exists()
+
+
+def test_save_checkpoint_round_trips_through_file(tmp_path) -> None:
+    path = tmp_path / "run.ckpt"
+    sim = Simulation(SimulationConfig(creatures=4, food=10, seed=3))
+    sim.step()
+
+    save_checkpoint(sim, path)
+
+    assert state(load_checkpoint(path)) == state(sim)
+
+
+def test_checkpointer_restores_the_numpy_engine(tmp_path) -> None:
+    pytest.importorskip("numpy")
+    from sim.numpy_engine import NumpySimulation
+
+    path = tmp_path / "run.ckpt"
+    sim = NumpySimulation(SimulationConfig(engine="numpy", creatures=20, food=100, seed=5))
+    checkpointer = Checkpointer(path, every=5)
+    for _ in range(5):
+        sim.step()
+        sim.respawn_food()
+        checkpointer.record(sim)
+
+    restored = load_checkpoint(path)
+    assert isinstance(restored, NumpySimulation)
+    for simulation in (sim, restored):
+        simulation.add_creature()
+        for _ in range(10):
+            simulation.step()
+            simulation.respawn_food()
+
+    assert state(restored) == state(sim)
+    assert [(p.x, p.y, p.id) for p in restored.food] == [(p.x, p.y, p.id) for p in sim.food]
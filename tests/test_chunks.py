@@ -0,0 +1,85 @@
+import pytest
+
+from sim.checkpoint import restore
+from sim.chunks import ChunkedSimulation
+from sim.lod import food_count
+from sim.simulation import Simulation, SimulationConfig, create_simulation
+
+
+def chunk_config(**overrides: object) -> SimulationConfig:
+    settings = dict(width=60.0, height=45.0, seed=9, creatures=30, food=300, engine="chunked", chunk_size=10.0)
+    settings.update(overrides)
+    return SimulationConfig(**settings)
+
+
+def final_state(sim: Simulation, ticks: int) -> list[tuple[float, float, float, int, int]]:
+    for _ in range(ticks):
+        sim.step()
+    return [(creature.x, creature.y, creature.mass, creature.food_eaten, creature.id) for creature in sim.creatures]
+
+
+@pytest.mark.parametrize("chunk_size", [3.0, 10.0, 100.0])
+@pytest.mark.parametrize("wrap_distance", [False, True])
+def test_chunked_run_matches_reference(chunk_size: float, wrap_distance: bool) -> None:
+    config = chunk_config(chunk_size=chunk_size, wrap_distance=wrap_distance)
+    chunked = ChunkedSimulation(config)
+    reference = Simulation(chunk_config(engine="reference", wrap_distance=wrap_distance))
+
+    assert final_state(chunked, 60) == final_state(reference, 60)
+    assert [(pellet.x, pellet.y, pellet.id) for pellet in chunked.food] == [
+        (pellet.x, pellet.y, pellet.id) for pellet in reference.food
+    ]
+    assert chunked.predation_events == reference.predation_events
+
+
+def test_active_chunks_are_the_ones_holding_creatures() -> None:
+    sim = create_simulation(chunk_config(creatures=3, food=50))
+    final_state(sim, 5)
+
+    expected = {sim.creature_chunks.cell_for(creature.x, creature.y) for creature in sim.creatures}
+    assert set(sim.active_chunks()) == expected
+    assert len(sim.active_chunks()) <= 3
+
+
+def test_creatures_are_handed_to_the_chunk_they_move_into() -> None:
+    sim = ChunkedSimulation(chunk_config(creatures=1, food=0))
+    creature = sim.creatures[0]
+    creature.x, creature.y = 9.99, 5.0
+    sim.rebuild_chunks()
+    assert sim.active_chunks() == [(0, 0)]
+
+    for _ in range(20):
+        sim.step()
+
+    assert sim.active_chunks() == [sim.creature_chunks.cell_for(creature.x, creature.y)]
+
+
+def test_adding_and_removing_keeps_chunks_in_sync() -> None:
+    sim = ChunkedSimulation(chunk_config())
+    sim.add_creature()
+    sim.add_food()
+    assert len(sim.creature_chunks) == len(sim.creatures) == 31
+    assert food_count(sim) == len(sim.food) == sim.config.food == 301
+
+    newest = max(pellet.id for pellet in sim.food)
+    sim.remove_food()
+    sim.remove_creature()
+    assert newest not in {pellet.id for pellet in sim.food}
+    assert len(sim.creature_chunks) == len(sim.creatures) == 30
+    assert food_count(sim) == 300
+
+
+def test_checkpoint_restores_the_chunked_engine() -> None:
+    sim = ChunkedSimulation(chunk_config())
+    final_state(sim, 10)
+
+    restored = restore(sim.snapshot())
+
+    assert isinstance(restored, ChunkedSimulation)
+    assert len(restored.food_chunks) == len(sim.food)
+    assert final_state(restored, 10) == final_state(sim, 10)
+
+
+def test_chunk_size_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="chunk_size"):
+        ChunkedSimulation(chunk_config(chunk_size=0.0))
@@ -1,4 +1,9 @@
-from sim.cli import build_parser
+import sys
+
+import pytest
+
+from sim import checkpoint
+from sim.cli import build_parser, main
 
 
 def test_cli_defaults_are_beginner_friendly() -> None:
@@ -11,8 +16,63 @@ def test_cli_defaults_are_beginner_friendly() -> None:
     assert args.speed == 0.08
     assert args.creatures == 50
     assert args.food == 250
+    assert args.engine == "reference"
     assert args.scale == 30
     assert args.fps == 120
+    assert args.ticks_per_frame == 1
+    assert args.background is False
     assert args.radius == 8
     assert args.screenshot_dir == "screenshots"
     assert args.show_coords is True
+
+
+def test_resume_applies_runtime_settings_from_the_command_line(tmp_path, monkeypatch, capsys) -> None:
+    path = tmp_path / "run.ckpt"
+    arguments = ["--mode", "text", "--engine", "chunked", "--creatures", "5", "--food", "20", "--checkpoint", str(path)]
+    monkeypatch.setattr(sys, "argv", ["rpsbattle", *arguments, "--ticks", "4", "--checkpoint-every", "2"])
+    main()
+    loaded = []
+    load_checkpoint = checkpoint.load_checkpoint
+
+    def record_load(*args: object, **kwargs: object) -> checkpoint.Simulation:
+        loaded.append(load_checkpoint(*args, **kwargs))
+        return loaded[-1]
+
+    monkeypatch.setattr(checkpoint, "load_checkpoint", record_load)
+    monkeypatch.setattr(sys, "argv", ["rpsbattle", *arguments, "--ticks", "6", "--chunk-size", "5", "--resume"])
+    main()
+
+    assert "Start: tick=4" in capsys.readouterr().out
+    assert loaded[0].tick == 6
+    assert loaded[0].config.engine == "chunked"
+    assert loaded[0].config.chunk_size == 5.0
+
+
+def test_resume_refuses_to_overwrite_an_existing_recording(tmp_path, monkeypatch) -> None:
+    recording = tmp_path / "run.traj"
+    recording.write_bytes(b"earlier ticks")
+    arguments = ["--mode", "text", "--checkpoint", str(tmp_path / "run.ckpt"), "--record", str(recording)]
+    monkeypatch.setattr(sys, "argv", ["rpsbattle", *arguments, "--resume"])
+
+    with pytest.raises(SystemExit, match="already exists"):
+        main()
+
+    assert recording.read_bytes() == b"earlier ticks"
+
+
+def test_record_file_is_closed_when_the_recorder_cannot_start(tmp_path, monkeypatch) -> None:
+    opened = []
+    real_open = open
+
+    def tracking_open(*args: object, **kwargs: object):
+        opened.append(real_open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    arguments = ["--mode", "text", "--ticks", "1", "--record", str(tmp_path / "run.traj"), "--record-stride", "0"]
+    monkeypatch.setattr(sys, "argv", ["rpsbattle", *arguments])
+
+    with pytest.raises(ValueError, match="stride"):
+        main()
+
+    assert opened and all(handle.closed for handle in opened)
@@ -0,0 +1,159 @@
+import pickle
+from multiprocessing import active_children
+
+import pytest
+
+from sim.checkpoint import restore
+from sim.distributed import DistributedSimulation, parse_address, start_tcp_workers, strip_gap, strip_of
+from sim.model import Food
+from sim.parallel import ParallelSimulation
+from sim.profiler import TickProfiler
+from sim.simulation import Simulation, SimulationConfig, create_simulation
+from sim.sweep import summarize_run
+from sim.worker import SimulationWorker
+
+
+def distributed_config(workers: int, **overrides: object) -> SimulationConfig:
+    settings = dict(
+        width=30.0, height=20.0, seed=3, speed=0.3, creatures=150, food=600, engine="distributed", workers=workers
+    )
+    settings.update(overrides)
+    return SimulationConfig(**settings)
+
+
+def final_state(sim: Simulation, ticks: int, respawn: bool = False) -> list[tuple[float, float, float, int, int]]:
+    for _ in range(ticks):
+        sim.step()
+        if respawn:
+            sim.respawn_food()
+    return [(creature.x, creature.y, creature.mass, creature.food_eaten, creature.id) for creature in sim.creatures]
+
+
+def run(sim: DistributedSimulation, ticks: int) -> tuple[list, list[int], int]:
+    try:
+        creatures = final_state(sim, ticks, respawn=True)
+        return creatures, [pellet.id for pellet in sim.food], sim.predation_events
+    finally:
+        sim.close()
+
+
+def test_strips_split_the_wrapping_x_axis() -> None:
+    assert [strip_of(x, 12.0, 3) for x in (0.0, 3.99, 4.0, 11.99, 12.0)] == [0, 0, 1, 2, 2]
+    assert strip_gap(5.0, 1, 12.0, 3) == 0.0
+    assert strip_gap(9.0, 1, 12.0, 3) == pytest.approx(1.0)
+    assert strip_gap(11.5, 0, 12.0, 3) == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("wrap_distance", [False, True])
+def test_results_are_identical_for_any_worker_count(wrap_distance: bool) -> None:
+    single = run(DistributedSimulation(distributed_config(1, wrap_distance=wrap_distance)), 30)
+
+    for workers in (2, 5):
+        assert run(DistributedSimulation(distributed_config(workers, wrap_distance=wrap_distance)), 30) == single
+    # Crowded strips make creatures fight and eat across the borders.
+    assert single[2] > 0
+
+
+def test_tcp_workers_match_pipe_workers() -> None:
+    pipes = run(DistributedSimulation(distributed_config(3)), 15)
+
+    assert run(DistributedSimulation(distributed_config(3), start_tcp_workers(3)), 15) == pipes
+
+
+def test_far_food_is_looked_up_on_every_worker() -> None:
+    # Without eating or predation, steering is the same as the parallel engine.
+    def steer(sim: Simulation) -> list[tuple[float, float, float, int, int]]:
+        sim.food = [Food(x=40.0 + (index % 10) * 0.3, y=2.0 + (index // 10) * 0.3, id=index) for index in range(60)]
+        return final_state(sim, 10)
+
+    sparse = dict(width=80.0, height=10.0, seed=2, creatures=6, food=0)
+    sim = DistributedSimulation(distributed_config(8, **sparse))
+    profiler = TickProfiler()
+    sim.observer = profiler
+    try:
+        distributed = steer(sim)
+    finally:
+        sim.close()
+
+    assert distributed == steer(ParallelSimulation(distributed_config(1, **sparse)))
+    assert profiler.counters["remote_food_lookups"] > 0
+
+
+def test_adding_and_removing_reaches_the_owning_worker() -> None:
+    sim = create_simulation(distributed_config(3, creatures=10, food=20))
+    try:
+        sim.add_creature()
+        sim.add_food()
+        assert [creature.id for creature in sim.creatures] == list(range(11))
+        assert sim.stats.count == sim.config.creatures == 11
+        assert len(sim.food) == sim.config.food == 21
+
+        sim.remove_creature()
+        sim.remove_food()
+        sim.remove_food()
+        assert [creature.id for creature in sim.creatures] == list(range(10))
+        assert [pellet.id for pellet in sim.food] == list(range(19))
+
+        sim.config.food = 25
+        sim.respawn_food()
+        assert len(sim.food) == 25
+    finally:
+        sim.close()
+
+
+def test_checkpoint_restores_the_distributed_engine() -> None:
+    sim = DistributedSimulation(distributed_config(2))
+    restored = None
+    try:
+        final_state(sim, 5)
+        restored = restore(sim.snapshot())
+
+        assert isinstance(restored, DistributedSimulation)
+        assert final_state(restored, 5) == final_state(sim, 5)
+    finally:
+        sim.close()
+        if restored is not None:
+            restored.close()
+
+
+def test_pickled_copy_keeps_its_worker_count() -> None:
+    sim = DistributedSimulation(distributed_config(2, creatures=10, food=20))
+    copy = pickle.loads(pickle.dumps(sim))
+    try:
+        assert copy.strips == 2
+        assert final_state(copy, 3) == final_state(sim, 3)
+    finally:
+        sim.close()
+        copy.close()
+
+
+def test_sweep_runs_stop_their_workers() -> None:
+    before = set(active_children())
+
+    summarize_run(distributed_config(2, creatures=10, food=20), ticks=3)
+
+    assert set(active_children()) <= before
+
+
+def test_background_worker_closes_its_forked_copy() -> None:
+    sim = DistributedSimulation(distributed_config(2, creatures=10, food=20))
+    workers = [transport.process for transport in sim._transports]
+    background = SimulationWorker(sim, ticks=5)
+    try:
+        assert background.wait_frame(10.0) is not None
+    finally:
+        background.close()
+        sim.close()
+
+    assert background._process.exitcode == 0
+    assert not any(process.is_alive() for process in workers)
+
+def test_parse_address_needs_host_and_port() -> None:
+    assert parse_address("10.0.0.2:7878") == ("10.0.0.2", 7878)
+    with pytest.raises(ValueError, match="HOST:PORT"):
+        parse_address("7878")
+
+
+def test_distributed_engine_rejects_zero_workers() -> None:
+    with pytest.raises(ValueError, match="workers"):
+        DistributedSimulation(distributed_config(0))
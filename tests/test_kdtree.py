@@ -0,0 +1,102 @@
+from math import dist
+from random import Random
+
+import pytest
+
+from sim.kdtree import PeriodicKDTree
+from sim.model import Food, World
+from sim.simulation import Simulation, SimulationConfig
+from sim.spatial import WrappedDistance
+
+
+WORLD = World(width=17.0, height=11.0)
+
+
+def random_pellets(seed: int, count: int) -> list[Food]:
+    rng = Random(seed)
+    return [Food(x=rng.random() * WORLD.width, y=rng.random() * WORLD.height, id=index) for index in range(count)]
+
+
+def brute_force_order(pellets: list[Food], x: float, y: float, wrap: bool) -> list[Food]:
+    distance = WrappedDistance(WORLD) if wrap else dist
+    return sorted(pellets, key=lambda pellet: (distance((x, y), (pellet.x, pellet.y)), pellet.id))
+
+
+@pytest.mark.parametrize("wrap", [True, False])
+def test_queries_match_brute_force(wrap: bool) -> None:
+    pellets = random_pellets(3, 300)
+    tree = PeriodicKDTree(WORLD, pellets, wrap=wrap, leaf_size=4)
+    distance = WrappedDistance(WORLD) if wrap else dist
+    rng = Random(5)
+
+    for _ in range(100):
+        x = rng.random() * WORLD.width
+        y = rng.random() * WORLD.height
+        expected = brute_force_order(pellets, x, y, wrap)
+        assert tree.nearest(x, y) is expected[0]
+        assert tree.k_nearest(x, y, 5) == expected[:5]
+        inside = [pellet for pellet in pellets if distance((x, y), (pellet.x, pellet.y)) <= 2.5]
+        assert tree.within(x, y, 2.5) == inside
+
+
+def test_wrap_finds_items_across_the_seam() -> None:
+    near_seam = Food(x=16.9, y=5.0)
+    inside = Food(x=1.5, y=5.0)
+
+    assert PeriodicKDTree(WORLD, [near_seam, inside], wrap=True).nearest(0.1, 5.0) is near_seam
+    assert PeriodicKDTree(WORLD, [near_seam, inside], wrap=False).nearest(0.1, 5.0) is inside
+
+
+def test_ties_go_to_the_lowest_order() -> None:
+    first = Food(x=6.0, y=5.0)
+    second = Food(x=4.0, y=5.0)
+    tree = PeriodicKDTree(WORLD, [first, second])
+
+    assert tree.nearest(5.0, 5.0) is first
+    assert tree.k_nearest(5.0, 5.0, 2) == [first, second]
+
+
+def test_removed_and_moved_items_are_followed() -> None:
+    pellets = random_pellets(8, 100)
+    tree = PeriodicKDTree(WORLD, pellets, leaf_size=4)
+    for pellet in pellets[::2]:
+        tree.remove(pellet)
+    moved = pellets[1]
+    moved.x, moved.y = 0.05, 10.95
+    tree.update(moved)
+
+    remaining = pellets[1::2]
+    assert len(tree) == 50
+    assert pellets[0] not in tree
+    assert tree.nearest(16.95, 0.05) is moved
+    assert tree.within(0.0, 0.0, 0.2) == [moved]
+    assert tree.nearest(8.0, 5.0) is brute_force_order(remaining, 8.0, 5.0, wrap=True)[0]
+
+
+def test_empty_tree_answers_nothing() -> None:
+    tree = PeriodicKDTree(WORLD, [])
+
+    assert tree.nearest(1.0, 1.0) is None
+    assert tree.k_nearest(1.0, 1.0, 3) == []
+    assert tree.within(1.0, 1.0, 5.0) == []
+
+
+@pytest.mark.parametrize("wrap_distance", [False, True])
+def test_kdtree_step_matches_grid_step(wrap_distance: bool) -> None:
+    def run(neighbor_index: str) -> list[tuple[float, float, float, int]]:
+        sim = Simulation(
+            SimulationConfig(
+                width=12.0,
+                height=9.0,
+                seed=4,
+                creatures=40,
+                food=200,
+                neighbor_index=neighbor_index,
+                wrap_distance=wrap_distance,
+            )
+        )
+        for _ in range(40):
+            sim.step()
+        return [(c.x, c.y, c.mass, c.food_eaten) for c in sim.creatures]
+
+    assert run("kdtree") == run("grid")
@@ -0,0 +1,99 @@
+import time
+
+import pygame
+import pytest
+
+from sim.lod import FULL_DETAIL, HeatmapCache, LevelOfDetail, creature_count, food_count, food_heatmap
+from sim.model import Food
+from sim.pygame_view import BACKGROUND, FOOD_COLOR, PANEL_WIDTH, LayeredRenderer, build_buttons, world_sprites
+from sim.render_cache import RenderCache
+from sim.simulation import Simulation, SimulationConfig
+
+
+FRAME_BUDGET_S = 1 / 60
+
+
+def test_population_counts_match_the_lists() -> None:
+    sim = Simulation(SimulationConfig(creatures=4, food=9, seed=7))
+
+    assert creature_count(sim) == 4
+    assert food_count(sim) == 9
+
+
+def test_food_heatmap_shades_cells_by_pellet_count() -> None:
+    pytest.importorskip("numpy")
+    sim = Simulation(SimulationConfig(width=4, height=4, creatures=1, food=0, seed=7))
+    sim.food = [Food(x=0.1, y=0.1), Food(x=0.2, y=0.2), Food(x=3.5, y=0.1)]
+    lod = LevelOfDetail(heatmap_cell_px=10, heatmap_saturation=2)
+
+    heatmap = food_heatmap(sim, 10, BACKGROUND, FOOD_COLOR, lod)
+
+    assert heatmap.get_size() == (40, 40)
+    assert heatmap.get_at((5, 5))[:3] == FOOD_COLOR
+    assert heatmap.get_at((35, 5))[:3] not in (FOOD_COLOR, BACKGROUND)
+    assert heatmap.get_at((15, 25))[:3] == BACKGROUND
+
+
+def test_world_sprites_drop_detail_past_thresholds() -> None:
+    pygame.font.init()
+    sim = Simulation(SimulationConfig(creatures=5, food=3, seed=7))
+    font = pygame.font.Font(None, 24)
+    cache = RenderCache()
+
+    full = world_sprites(sim, 10, 8, font, cache, FULL_DETAIL)
+    no_labels = world_sprites(sim, 10, 8, font, cache, LevelOfDetail(label_max_creatures=4))
+    points = world_sprites(sim, 10, 2, font, cache, LevelOfDetail(point_max_radius_px=2))
+
+    assert len(full) == 5 * 2 + 3
+    assert len(no_labels) == 5 + 3
+    assert {sprite.get_size() for sprite, _ in points[:5]} == {(2, 2)}
+
+
+def test_heatmap_is_only_rebuilt_when_the_food_changes() -> None:
+    pytest.importorskip("numpy")
+    sim = Simulation(SimulationConfig(creatures=3, food=50, seed=7))
+    cache = HeatmapCache()
+
+    first = cache.get(sim, 10, BACKGROUND, FOOD_COLOR)
+    assert cache.get(sim, 10, BACKGROUND, FOOD_COLOR) is first
+    sim.add_food()
+    assert cache.get(sim, 10, BACKGROUND, FOOD_COLOR) is not first
+    sim.food.pop()
+    sim.food_changed()
+    cache.get(sim, 10, BACKGROUND, FOOD_COLOR)
+
+    assert cache.rebuilds == 3
+
+
+def test_food_columns_follow_every_food_change() -> None:
+    sim = Simulation(SimulationConfig(width=6, height=6, creatures=5, food=400, seed=7))
+    sim.food_columns()
+
+    for _ in range(5):
+        sim.step()
+        sim.add_food()
+        sim.remove_food()
+        sim.respawn_food()
+
+    xs, ys = sim.food_columns()
+    assert (list(xs), list(ys)) == ([pellet.x for pellet in sim.food], [pellet.y for pellet in sim.food])
+
+
+def test_heatmap_frames_fit_the_frame_budget_at_100k_pellets() -> None:
+    pytest.importorskip("numpy")
+    pygame.font.init()
+    sim = Simulation(SimulationConfig(width=40, height=30, creatures=50, food=100_000, seed=7))
+    screen = pygame.Surface((1200 + PANEL_WIDTH, 900))
+    buttons = build_buttons(1200, 300)
+    font = pygame.font.Font(None, 24)
+    renderer = LayeredRenderer()
+    renderer.draw(screen, sim, 30, 8, buttons, font, font, 60, True, "")
+
+    best = float("inf")
+    for _ in range(3):
+        sim.remove_food()
+        start = time.perf_counter()
+        renderer.draw(screen, sim, 30, 8, buttons, font, font, 60, True, "")
+        best = min(best, time.perf_counter() - start)
+
+    assert best < FRAME_BUDGET_S
@@ -0,0 +1,67 @@
+import csv
+import gzip
+import json
+
+import pytest
+
+from sim.metrics import METRIC_FIELDS, MetricsWriter, metrics_format_for, sample_metrics
+from sim.simulation import Simulation, SimulationConfig
+
+
+def test_sample_metrics_summarizes_the_population() -> None:
+    sim = Simulation(SimulationConfig(creatures=4, food=7, seed=7))
+    for mass, creature in zip([4.0, 1.0, 3.0, 2.0], sim.creatures):
+        creature.mass = mass
+    sim.recompute_stats()
+
+    row = sample_metrics(sim, predation=2)
+
+    assert list(row) == list(METRIC_FIELDS)
+    assert row["creatures"] == 4
+    assert row["food"] == 7
+    assert row["total_mass"] == 10.0
+    assert (row["mass_min"], row["mass_median"], row["mass_max"]) == (1.0, 3.0, 4.0)
+    assert row["predation"] == 2
+
+
+def test_metrics_format_follows_the_file_name() -> None:
+    assert metrics_format_for("run.csv") == "csv"
+    assert metrics_format_for("run.csv.gz") == "csv"
+    assert metrics_format_for("run.ndjson.gz") == "ndjson"
+    assert metrics_format_for("run.jsonl") == "ndjson"
+
+
+def test_metrics_writer_streams_sampled_ndjson_rows(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=30, food=100, seed=5))
+    path = tmp_path / "metrics.ndjson"
+
+    with MetricsWriter(path, every=5, batch_samples=2) as metrics:
+        metrics.record(sim)
+        for _ in range(20):
+            sim.step()
+            metrics.record(sim)
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["tick"] for row in rows] == [0, 5, 10, 15, 20]
+    assert rows[-1]["creatures"] == len(sim.creatures)
+    assert sum(row["predation"] for row in rows) == sim.predation_events
+    assert rows[0]["predation"] == 0
+
+
+def test_metrics_writer_writes_gzip_csv_with_one_header(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=5, food=10, seed=5))
+    path = tmp_path / "metrics.csv.gz"
+
+    with MetricsWriter(path, every=1, batch_samples=2) as metrics:
+        for _ in range(5):
+            metrics.record(sim)
+            sim.step()
+
+    with gzip.open(path, "rt", newline="") as compressed:
+        rows = list(csv.DictReader(compressed))
+    assert [int(row["tick"]) for row in rows] == [0, 1, 2, 3, 4]
+
+
+def test_metrics_writer_rejects_unknown_formats(tmp_path) -> None:
+    with pytest.raises(ValueError, match="unknown metrics format"):
+        MetricsWriter(tmp_path / "metrics.txt", metrics_format="xml")
@@ -0,0 +1,115 @@
+from statistics import mean
+
+import pytest
+
+from sim.simulation import Simulation, SimulationConfig, create_simulation
+
+np = pytest.importorskip("numpy")
+
+from sim.numpy_engine import NumpySimulation  # noqa: E402
+
+
+def run_aggregates(engine: str, seeds: range, ticks: int) -> dict[str, float]:
+    counts = []
+    food_left = []
+    mean_mass = []
+    for seed in seeds:
+        sim = create_simulation(SimulationConfig(seed=seed, speed=0.3, engine=engine))
+        sim.run(ticks)
+        creatures = sim.creatures
+        counts.append(len(creatures))
+        food_left.append(len(sim.food))
+        mean_mass.append(sum(creature.mass for creature in creatures) / len(creatures))
+    return {"creatures": mean(counts), "food": mean(food_left), "mass": mean(mean_mass)}
+
+
+def test_create_simulation_selects_numpy_engine() -> None:
+    assert isinstance(create_simulation(SimulationConfig(engine="numpy")), NumpySimulation)
+    assert isinstance(create_simulation(SimulationConfig()), Simulation)
+
+
+def test_create_simulation_rejects_unknown_engine() -> None:
+    with pytest.raises(ValueError, match="unknown engine"):
+        create_simulation(SimulationConfig(engine="fortran"))
+
+
+def test_numpy_engine_starts_from_reference_board() -> None:
+    config = SimulationConfig(seed=42, creatures=5, food=20)
+    reference = Simulation(config)
+    batched = NumpySimulation(config)
+
+    assert [(c.x, c.y) for c in batched.creatures] == [(c.x, c.y) for c in reference.creatures]
+    assert batched.food == reference.food
+
+
+def test_numpy_engine_eats_overlapping_food() -> None:
+    sim = NumpySimulation(SimulationConfig(creatures=1, food=1, seed=7, speed=0.0))
+    sim.creature_x[:] = 5.0
+    sim.creature_y[:] = 5.0
+    sim.food_x[:] = 5.0
+    sim.food_y[:] = 5.0
+
+    sim.step()
+
+    assert sim.mass[0] == 1.1
+    assert sim.food_eaten[0] == 1
+    assert len(sim.food) == 0
+    sim.respawn_food()
+    assert [pellet.id for pellet in sim.food] == [1]
+
+
+def test_numpy_engine_larger_creature_eats_smaller_creature() -> None:
+    sim = NumpySimulation(SimulationConfig(creatures=2, food=0, seed=7, speed=0.0))
+    sim.creature_x[:] = 5.0
+    sim.creature_y[:] = 5.0
+    sim.mass[:] = [4.0, 1.0]
+    sim.food_eaten[:] = [12, 9]
+
+    sim.step()
+
+    assert len(sim.creatures) == 1
+    assert sim.mass[0] > 4.0
+    assert sim.food_eaten[0] == 17
+
+
+def test_numpy_engine_equal_sizes_do_not_eat_each_other() -> None:
+    sim = NumpySimulation(SimulationConfig(creatures=2, food=0, seed=7, speed=0.0))
+    sim.creature_x[:] = 5.0
+    sim.creature_y[:] = 5.0
+
+    sim.step()
+
+    assert len(sim.creatures) == 2
+
+
+@pytest.mark.parametrize("ticks", [20, 40])
+def test_numpy_engine_aggregates_match_reference(ticks: int) -> None:
+    reference = run_aggregates("reference", range(8), ticks)
+    batched = run_aggregates("numpy", range(8), ticks)
+
+    assert batched["creatures"] == pytest.approx(reference["creatures"], rel=0.25)
+    assert batched["food"] == pytest.approx(reference["food"], abs=0.05 * 250)
+    assert batched["mass"] == pytest.approx(reference["mass"], rel=0.25)
+
+
+def test_numpy_engine_snapshots_are_reused_until_the_arrays_change() -> None:
+    sim = NumpySimulation(SimulationConfig(creatures=4, food=6, seed=7))
+    creatures = sim.creatures
+    food = sim.food
+
+    assert sim.creatures is creatures and sim.food is food
+    assert creatures[2] == list(creatures)[2]
+    sim.feed_creatures(np.array([0]), np.array([1]))
+    assert sim.creatures is not creatures
+    assert creatures[0].food_eaten == 0 and sim.creatures[0].food_eaten == 1
+    sim.step()
+    assert sim.food is not food
+
+
+def test_numpy_engine_stats_follow_the_arrays() -> None:
+    sim = NumpySimulation(SimulationConfig(creatures=6, food=40, seed=3, speed=0.5))
+    sim.run(20)
+
+    assert sim.stats.count == len(sim.creature_x)
+    assert sim.stats.total_mass == pytest.approx(float(sim.mass.sum()))
+    assert sim.stats.max_mass == float(sim.mass.max())
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sim.checkpoint import restore
+from sim.parallel import ParallelSimulation, chunk_bounds, creature_random
+from sim.simulation import SimulationConfig, create_simulation
+
+
+def parallel_config(workers: int) -> SimulationConfig:
+    return SimulationConfig(
+        width=10.0, height=10.0, seed=11, creatures=40, food=200, engine="parallel", workers=workers
+    )
+
+
+def final_state(sim: ParallelSimulation, ticks: int) -> list[tuple[float, float, float, int, int]]:
+    for _ in range(ticks):
+        sim.step()
+    return [(creature.x, creature.y, creature.mass, creature.food_eaten, creature.id) for creature in sim.creatures]
+
+
+def test_creature_random_depends_only_on_seed_tick_and_id() -> None:
+    draw = creature_random(7, 3, 12)
+
+    assert 0.0 <= draw < 1.0
+    assert creature_random(7, 3, 12) == draw
+    assert len({creature_random(7, 3, 12), creature_random(8, 3, 12), creature_random(7, 4, 12)}) == 3
+    assert creature_random(7, 3, 13) != draw
+
+
+def test_chunk_bounds_cover_every_creature_once() -> None:
+    assert chunk_bounds(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert chunk_bounds(2, 4) == [(0, 1), (1, 2)]
+    assert chunk_bounds(0, 4) == [(0, 0)]
+
+
+@pytest.mark.parametrize("workers", [2, 3, 7])
+def test_results_are_identical_for_any_worker_count(workers: int) -> None:
+    single = final_state(ParallelSimulation(parallel_config(1)), 25)
+    with ThreadPoolExecutor(workers) as executor:
+        split = final_state(ParallelSimulation(parallel_config(workers), executor=executor), 25)
+
+    assert split == single
+
+
+def test_worker_processes_match_a_single_worker() -> None:
+    single = final_state(ParallelSimulation(parallel_config(1)), 5)
+    sim = create_simulation(parallel_config(2))
+    try:
+        split = final_state(sim, 5)
+    finally:
+        sim.close()
+
+    assert split == single
+
+
+def test_checkpoint_restores_the_parallel_engine() -> None:
+    sim = ParallelSimulation(parallel_config(1))
+    final_state(sim, 5)
+
+    restored = restore(sim.snapshot())
+
+    assert isinstance(restored, ParallelSimulation)
+    assert final_state(restored, 5) == final_state(sim, 5)
+
+
+def test_parallel_engine_rejects_zero_workers() -> None:
+    with pytest.raises(ValueError, match="workers"):
+        ParallelSimulation(parallel_config(0))
@@ -0,0 +1,67 @@
+import pytest
+
+from sim.profiler import STEP_PHASES, TickProfiler
+from sim.pygame_view import build_status_lines
+from sim.simulation import Simulation, SimulationConfig, create_simulation
+
+
+def test_profiled_steps_match_unprofiled_steps() -> None:
+    plain = Simulation(SimulationConfig(creatures=30, food=120, seed=5))
+    profiled = Simulation(SimulationConfig(creatures=30, food=120, seed=5))
+    profiled.observer = TickProfiler()
+
+    for _ in range(15):
+        plain.step()
+        profiled.step()
+
+    assert profiled.creatures == plain.creatures
+    assert profiled.food == plain.food
+    assert profiled.tick == plain.tick
+
+
+def test_profiler_times_every_phase_and_counts_events() -> None:
+    sim = Simulation(SimulationConfig(creatures=30, food=120, seed=5))
+    profiler = TickProfiler()
+    sim.observer = profiler
+    creatures_before = len(sim.creatures)
+    food_before = len(sim.food)
+
+    for _ in range(10):
+        sim.step()
+
+    assert profiler.ticks == 10
+    assert list(profiler.phase_seconds) == list(STEP_PHASES)
+    assert profiler.counters["eats"] == food_before - len(sim.food)
+    assert profiler.counters["predation"] == creatures_before - len(sim.creatures)
+    assert set(profiler.recent_ms) == set(STEP_PHASES)
+
+
+def test_summary_and_status_lines_name_each_phase() -> None:
+    sim = Simulation(SimulationConfig(creatures=5, food=20, seed=5))
+    profiler = TickProfiler()
+    sim.observer = profiler
+    sim.step()
+
+    summary = "\n".join(profiler.summary_lines())
+    status = build_status_lines(sim, playing=True, fps=60, profiler=profiler)
+
+    assert summary.startswith("Profile over 1 ticks")
+    for name in STEP_PHASES:
+        assert name in summary
+    assert status[-len(STEP_PHASES) :] == profiler.status_lines()
+    assert len(status) == len(build_status_lines(sim, playing=True, fps=60)) + len(STEP_PHASES)
+
+
+def test_numpy_engine_reports_to_the_same_observer() -> None:
+    pytest.importorskip("numpy")
+    sim = create_simulation(SimulationConfig(creatures=30, food=120, seed=5, engine="numpy"))
+    profiler = TickProfiler()
+    sim.observer = profiler
+    food_before = len(sim.food_x)
+
+    for _ in range(5):
+        sim.step()
+
+    assert profiler.ticks == 5
+    assert {"steering", "eating", "overlaps"} <= set(profiler.phase_seconds)
+    assert profiler.counters["eats"] == food_before - len(sim.food_x)
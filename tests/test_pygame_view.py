@@ -1,14 +1,28 @@
+import threading
+
 from sim.pygame_view import (
     BUTTON_TOP_GAP,
+    PANEL_WIDTH,
     PANEL_STATUS_TOP,
     STATUS_LINE_HEIGHT,
+    LayeredRenderer,
+    TickRateMeter,
     apply_button_action,
+    apply_replay_action,
     build_buttons,
     build_status_lines,
+    change_ticks_per_frame,
     click_repeats,
+    draw_frame,
+    run_pygame,
+    run_ticks_for_frame,
     screenshot_path,
+    seek_replay,
 )
+from sim.parallel import ParallelSimulation
 from sim.simulation import Simulation, SimulationConfig
+from sim.worker import pack_snapshot, unpack_snapshot
+from sim.writer import BackgroundWriter
 import pygame
 
 
@@ -41,6 +55,17 @@ def test_build_status_lines_includes_creature_count() -> None:
     assert "Largest Creature: 1.00" in status
 
 
+def test_build_status_lines_reads_the_largest_mass_from_a_frame() -> None:
+    sim = Simulation(SimulationConfig(creatures=3, seed=7))
+    sim.creatures[1].mass = 2.5
+    frame, _ = unpack_snapshot(pack_snapshot(sim, 0.0))
+
+    status = build_status_lines(frame, playing=False, fps=60)
+
+    assert "Creature Count: 3" in status
+    assert "Largest Creature: 2.50" in status
+
+
 def test_buttons_can_be_positioned_below_stats() -> None:
     sim = Simulation(SimulationConfig(creatures=8, seed=7))
 
@@ -92,7 +117,192 @@ def test_apply_button_action_shift_adds_one_hundred_food() -> None:
     assert len(sim.food) == 100
 
 
+def test_reset_closes_the_old_simulation() -> None:
+    old = ParallelSimulation(SimulationConfig(creatures=6, food=10, seed=7, engine="parallel", workers=2))
+    old.step()
+    assert old._executor is not None
+
+    sim, _, _, _, _, _ = apply_button_action(
+        clicked="Reset",
+        sim=old,
+        config=old.config,
+        current_fps=60,
+        playing=True,
+        screenshot_dir="screenshots",
+        screen=None,
+    )
+
+    assert old._executor is None
+    assert isinstance(sim, ParallelSimulation)
+    assert sim.tick == 0
+    sim.close()
+
+
 def test_screenshot_path_uses_png_in_directory() -> None:
     path = screenshot_path("screenshots")
     assert path.parent.name == "screenshots"
     assert path.suffix == ".png"
+
+
+def test_seek_replay_stays_inside_recording() -> None:
+    assert seek_replay(5, 1, frame_count=10) == 6
+    assert seek_replay(9, 100, frame_count=10) == 9
+    assert seek_replay(2, -100, frame_count=10) == 0
+
+
+def test_apply_replay_action_steps_and_resets() -> None:
+    assert apply_replay_action("Step", 3, frame_count=50, mods=pygame.KMOD_CTRL) == 13
+    assert apply_replay_action("Reset", 30, frame_count=50) == 0
+    assert apply_replay_action("More Food", 30, frame_count=50) == 30
+
+
+def test_status_lines_show_simulation_speed() -> None:
+    sim = Simulation(SimulationConfig(creatures=2, seed=7))
+
+    status = build_status_lines(sim, playing=True, fps=60, ticks_per_second=1234.4, ticks_per_frame=0)
+
+    assert "Ticks/Frame: max" in status
+    assert "Ticks/sec: 1234" in status
+
+
+def test_change_ticks_per_frame_doubles_halves_and_toggles_max() -> None:
+    assert change_ticks_per_frame(4, pygame.K_RIGHTBRACKET) == 8
+    assert change_ticks_per_frame(4, pygame.K_LEFTBRACKET) == 2
+    assert change_ticks_per_frame(1, pygame.K_LEFTBRACKET) == 1
+    assert change_ticks_per_frame(4, pygame.K_BACKSLASH) == 0
+    assert change_ticks_per_frame(0, pygame.K_BACKSLASH) == 1
+
+
+def test_run_ticks_for_frame_runs_fixed_count_and_respects_limit() -> None:
+    sim = Simulation(SimulationConfig(creatures=2, food=0, seed=7))
+
+    assert run_ticks_for_frame(sim, ticks_per_frame=5, budget_s=0.0, ticks_left=100) == 5
+    assert run_ticks_for_frame(sim, ticks_per_frame=5, budget_s=0.0, ticks_left=3) == 3
+    assert sim.tick == 8
+
+
+def test_run_ticks_for_frame_fills_budget_in_max_mode() -> None:
+    sim = Simulation(SimulationConfig(creatures=2, food=0, seed=7))
+
+    ran = run_ticks_for_frame(sim, ticks_per_frame=0, budget_s=0.02, ticks_left=10**9)
+
+    assert ran >= 1
+    assert sim.tick == ran
+
+
+def test_tick_rate_meter_reports_ticks_per_second() -> None:
+    meter = TickRateMeter(window_s=0.5)
+    start = meter._window_start
+
+    meter.add(100, now=start + 0.25)
+    meter.add(100, now=start + 0.5)
+
+    assert meter.rate == 400.0
+
+
+def render_setup(sim: Simulation) -> tuple[pygame.Surface, list, pygame.font.Font, pygame.font.Font]:
+    pygame.font.init()
+    scale = 10
+    world_width_px = int(sim.world.width * scale)
+    screen = pygame.Surface((world_width_px + PANEL_WIDTH, int(sim.world.height * scale)))
+    buttons = build_buttons(world_width_px, 300)
+    return screen, buttons, pygame.font.Font(None, 28), pygame.font.Font(None, 24)
+
+
+def test_layered_renderer_matches_a_full_redraw_after_partial_updates() -> None:
+    sim = Simulation(SimulationConfig(creatures=6, food=30, seed=7))
+    screen, buttons, font, small_font = render_setup(sim)
+    renderer = LayeredRenderer(max_dirty_rects=10_000)
+
+    full = renderer.draw(screen, sim, 10, 4, buttons, font, small_font, 60, True, "")
+    assert full == [screen.get_rect()]
+    for _ in range(5):
+        sim.step()
+        dirty = renderer.draw(screen, sim, 10, 4, buttons, font, small_font, 60, True, "")
+        assert dirty and screen.get_rect() not in dirty
+
+    expected = screen.copy()
+    draw_frame(expected, sim, 10, 4, buttons, font, small_font, 60, True, "")
+    assert pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(expected, "RGB")
+
+
+def test_layered_renderer_paused_frames_are_empty() -> None:
+    sim = Simulation(SimulationConfig(creatures=6, food=30, seed=7))
+    screen, buttons, font, small_font = render_setup(sim)
+    renderer = LayeredRenderer()
+
+    renderer.draw(screen, sim, 10, 4, buttons, font, small_font, 60, False, "")
+    assert renderer.draw(screen, sim, 10, 4, buttons, font, small_font, 60, False, "") == []
+
+    status_only = renderer.draw(screen, sim, 10, 4, buttons, font, small_font, 30, False, "")
+    assert len(status_only) == 1
+    assert status_only[0].left > int(sim.world.width * 10)
+
+
+def test_screenshot_is_saved_by_the_background_writer(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=2, seed=7))
+    writer = BackgroundWriter(max_pending=1)
+    screen = pygame.Surface((30, 20))
+
+    result = apply_button_action(
+        clicked="Screenshot",
+        sim=sim,
+        config=sim.config,
+        current_fps=60,
+        playing=True,
+        screenshot_dir=str(tmp_path),
+        screen=screen,
+        screenshot_writer=writer,
+    )
+    writer.close()
+
+    assert result[3].startswith("Saving ")
+    (saved,) = writer.completed()
+    assert saved.parent == tmp_path
+    assert pygame.image.load(str(saved)).get_size() == (30, 20)
+
+
+def test_screenshots_are_skipped_while_the_writer_queue_is_full(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=2, seed=7))
+    writer = BackgroundWriter(max_pending=1)
+    release = threading.Event()
+    writer.submit(release.wait)
+    writer.submit(lambda: None)
+
+    result = apply_button_action(
+        clicked="Screenshot",
+        sim=sim,
+        config=sim.config,
+        current_fps=60,
+        playing=True,
+        screenshot_dir=str(tmp_path),
+        screen=pygame.Surface((30, 20)),
+        screenshot_writer=writer,
+    )
+    release.set()
+    writer.close()
+
+    assert result[3] == "Screenshot skipped: still saving"
+
+
+def test_background_window_closes_when_the_worker_reaches_ticks(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    sim = Simulation(SimulationConfig(creatures=5, food=10, seed=7))
+    # Quit anyway if the window would otherwise stay open forever.
+    give_up = threading.Timer(30.0, lambda: pygame.event.post(pygame.event.Event(pygame.QUIT)))
+    give_up.start()
+    try:
+        run_pygame(
+            sim=sim,
+            config=sim.config,
+            ticks=20,
+            scale=4,
+            fps=120,
+            radius_px=2,
+            screenshot_dir=str(tmp_path),
+            ticks_per_frame=5,
+            background=True,
+        )
+        assert give_up.is_alive()
+    finally:
+        give_up.cancel()
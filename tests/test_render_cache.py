@@ -0,0 +1,48 @@
+import pygame
+
+from sim.render_cache import GlyphCache, SpriteCache, StaticSurface
+
+
+def test_glyph_cache_reuses_surfaces_and_evicts_least_recently_used() -> None:
+    pygame.font.init()
+    font = pygame.font.Font(None, 24)
+    glyphs = GlyphCache(max_entries=2)
+
+    zero = glyphs.render(font, "0", (0, 0, 0))
+    glyphs.render(font, "1", (0, 0, 0))
+    assert glyphs.render(font, "0", (0, 0, 0)) is zero
+    glyphs.render(font, "2", (0, 0, 0))
+
+    assert len(glyphs) == 2
+    assert glyphs.render(font, "0", (0, 0, 0)) is zero
+    assert (glyphs.hits, glyphs.misses) == (2, 3)
+
+
+def test_circle_sprite_covers_the_same_pixels_as_draw_circle() -> None:
+    sprites = SpriteCache()
+    direct = pygame.Surface((40, 40))
+    blitted = pygame.Surface((40, 40))
+    for surface in (direct, blitted):
+        surface.fill((255, 255, 255))
+
+    pygame.draw.circle(direct, (200, 50, 50), (17, 21), 9)
+    blitted.blits([(sprites.circle(9, (200, 50, 50)), (17 - 9, 21 - 9))], doreturn=False)
+
+    assert pygame.image.tobytes(direct, "RGB") == pygame.image.tobytes(blitted, "RGB")
+    assert sprites.circle(9, (200, 50, 50)) is sprites.circle(9, (200, 50, 50))
+
+
+def test_static_surface_only_redraws_when_its_key_changes() -> None:
+    static = StaticSurface()
+    calls = []
+
+    def draw(surface: pygame.Surface) -> None:
+        calls.append(surface.get_size())
+
+    first = static.get("a", (10, 10), draw)
+    assert static.get("a", (10, 10), draw) is first
+    static.get("b", (10, 10), draw)
+    static.get("b", (20, 10), draw)
+
+    assert calls == [(10, 10), (10, 10), (20, 10)]
+    assert static.redraws == 3
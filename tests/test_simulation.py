@@ -31,3 +31,18 @@ def test_wrap_around_boundary() -> None:
 def test_creatures_must_be_at_least_one() -> None:
     with pytest.raises(ValueError, match="at least 1"):
         Simulation(SimulationConfig(creatures=0))
+
+
+def test_food_gets_a_lifelong_id_that_is_never_reused() -> None:
+    sim = Simulation(SimulationConfig(creatures=1, food=3, seed=4))
+    sim.remove_food()
+    sim.add_food()
+
+    assert [pellet.id for pellet in sim.food] == [0, 1, 3]
+
+
+def test_entities_have_no_instance_dict() -> None:
+    sim = Simulation(SimulationConfig(creatures=1, food=1, seed=4))
+
+    assert not hasattr(sim.creatures[0], "__dict__")
+    assert not hasattr(sim.food[0], "__dict__")
@@ -1,4 +1,4 @@
-from math import cos
+from math import cos, dist, sqrt
 
 from sim.simulation import Simulation, SimulationConfig
 
@@ -326,3 +326,82 @@ def test_respawn_food_refills_to_configured_target() -> None:
     sim.respawn_food()
 
     assert len(sim.food) == 2
+
+
+def legacy_resolve_creature_overlaps(sim: Simulation) -> None:
+    changed = True
+    while changed and len(sim.creatures) > 1:
+        changed = False
+        for index, creature in enumerate(sim.creatures):
+            for other_index in range(index + 1, len(sim.creatures)):
+                other = sim.creatures[other_index]
+                overlap_distance = sim.creature_radius(creature) + sim.creature_radius(other)
+                distance = dist((creature.x, creature.y), (other.x, other.y))
+                if distance > overlap_distance or creature.food_eaten == other.food_eaten:
+                    continue
+                if creature.food_eaten > other.food_eaten:
+                    sim.feed_creature(creature, 1 + other.food_eaten // 2)
+                    sim.creatures.pop(other_index)
+                else:
+                    sim.feed_creature(other, 1 + creature.food_eaten // 2)
+                    sim.creatures.pop(index)
+                changed = True
+                break
+            if changed:
+                break
+
+
+def test_overlap_resolution_matches_full_rescan_in_dense_cluster() -> None:
+    for seed in range(5):
+        fast = Simulation(SimulationConfig(width=6.0, height=6.0, creatures=120, food=0, seed=seed))
+        slow = Simulation(SimulationConfig(width=6.0, height=6.0, creatures=120, food=0, seed=seed))
+        for index, (creature, twin) in enumerate(zip(fast.creatures, slow.creatures)):
+            creature.food_eaten = twin.food_eaten = (index * 7) % 13
+
+        fast._resolve_creature_overlaps()
+        legacy_resolve_creature_overlaps(slow)
+
+        assert len(fast.creatures) < 120
+        assert [(c.x, c.y, c.mass, c.food_eaten) for c in fast.creatures] == [
+            (c.x, c.y, c.mass, c.food_eaten) for c in slow.creatures
+        ]
+
+
+def test_reach_grows_while_eating_in_food_list_order() -> None:
+    sim = Simulation(SimulationConfig(creatures=1, food=3, seed=7, speed=0.0))
+    sim.creatures[0].x = 5.0
+    sim.creatures[0].y = 5.0
+    # Only reachable after eating the pellet listed before it.
+    sim.food[0].x, sim.food[0].y = 5.54, 5.0
+    sim.food[1].x, sim.food[1].y = 5.0, 5.5
+    sim.food[2].x, sim.food[2].y = 4.46, 5.0
+
+    sim.step()
+
+    assert sim.creatures[0].food_eaten == 2
+    assert [(pellet.x, pellet.y) for pellet in sim.food] == [(5.54, 5.0)]
+
+
+def test_cached_radius_follows_feeding_and_direct_changes() -> None:
+    sim = Simulation(SimulationConfig(creatures=1, food=0, seed=7))
+    creature = sim.creatures[0]
+    assert sim.creature_radius(creature) == 0.35
+
+    sim.feed_creature(creature, food_units=3)
+    assert sim.creature_radius(creature) == 0.35 * sqrt(creature.mass)
+
+    creature.mass = 9.0
+    assert sim.creature_radius(creature) == 0.35 * 3.0
+
+
+def test_lookup_tables_match_the_formulas_past_their_ends() -> None:
+    sim = Simulation(SimulationConfig(creatures=1, food=0, seed=7, speed=1.0))
+    creature = sim.creatures[0]
+
+    creature.food_eaten = 37
+    assert sim.movement_speed(creature) == 0.99**37
+    assert sim.creature_awareness_multiplier(creature) == 5.0 - (37 - 10) / 40 * 2.0
+    creature.food_eaten = 500
+    assert sim.movement_speed(creature) == 0.99**150
+    assert sim.creature_awareness_multiplier(creature) == 3.0
+    assert sim.growth_factor(creature) == 1.0
@@ -0,0 +1,88 @@
+from math import dist
+from random import Random
+
+import pytest
+
+from sim.model import Food, World
+from sim.simulation import Simulation, SimulationConfig
+from sim.spatial import SpatialGrid
+
+
+class LinearScanSimulation(Simulation):
+    def nearest_food(self, creature):
+        # Pellets eaten earlier in the tick stay in the list until the tick ends.
+        uneaten = [pellet for pellet in self.food if self._food_grid is None or pellet in self._food_grid]
+        if not uneaten:
+            return None
+        return min(uneaten, key=lambda pellet: dist((creature.x, creature.y), (pellet.x, pellet.y)))
+
+    def _nearby_creatures(self, creature, awareness_radius):
+        return self.creatures
+
+
+def test_grid_nearest_matches_linear_scan() -> None:
+    rng = Random(3)
+    world = World(width=17.0, height=11.0)
+    pellets = [Food(x=rng.random() * world.width, y=rng.random() * world.height) for _ in range(200)]
+    grid = SpatialGrid(world, cell_size=1.5)
+    for order, pellet in enumerate(pellets):
+        grid.insert(pellet, order)
+
+    for _ in range(100):
+        x = rng.random() * world.width
+        y = rng.random() * world.height
+        expected = min(pellets, key=lambda pellet: dist((x, y), (pellet.x, pellet.y)))
+        assert grid.nearest(x, y) is expected
+
+
+def test_grid_nearest_breaks_ties_by_insert_order() -> None:
+    world = World(width=10.0, height=10.0)
+    first = Food(x=6.0, y=5.0)
+    second = Food(x=4.0, y=5.0)
+    grid = SpatialGrid(world)
+    grid.insert(first, 0)
+    grid.insert(second, 1)
+
+    assert grid.nearest(5.0, 5.0) is first
+
+
+def test_grid_tracks_moves_across_the_wrap_seam() -> None:
+    world = World(width=10.0, height=10.0)
+    pellet = Food(x=9.5, y=5.0)
+    grid = SpatialGrid(world)
+    grid.insert(pellet, 0)
+    pellet.x = 0.5
+    grid.update(pellet)
+
+    assert list(grid.within(0.5, 5.0, 0.1)) == [pellet]
+    assert grid.nearest(9.9, 5.0) is pellet
+
+
+def test_grid_step_matches_linear_scan_step() -> None:
+    config = SimulationConfig(width=20, height=20, seed=11, speed=0.8, creatures=40, food=200)
+    fast = Simulation(SimulationConfig(**vars(config)))
+    slow = LinearScanSimulation(SimulationConfig(**vars(config)))
+
+    for _ in range(40):
+        fast.step()
+        slow.step()
+        assert [(c.x, c.y, c.food_eaten) for c in fast.creatures] == [(c.x, c.y, c.food_eaten) for c in slow.creatures]
+        assert [(p.x, p.y) for p in fast.food] == [(p.x, p.y) for p in slow.food]
+
+
+def test_wrap_distance_sees_food_across_the_seam() -> None:
+    legacy = Simulation(SimulationConfig(width=10.0, height=10.0, creatures=1, food=0))
+    wrapped = Simulation(SimulationConfig(width=10.0, height=10.0, creatures=1, food=0, wrap_distance=True))
+    for sim in (legacy, wrapped):
+        sim.creatures[0].x, sim.creatures[0].y = 0.2, 5.0
+        sim.food = [Food(x=9.9, y=5.0), Food(x=1.5, y=5.0)]
+
+    assert legacy.nearest_food(legacy.creatures[0]) is legacy.food[1]
+    assert wrapped.nearest_food(wrapped.creatures[0]) is wrapped.food[0]
+    # Heading for food across the seam means moving left, toward x = 0.
+    assert abs(wrapped.movement_angle(wrapped.creatures[0])) > 2.0
+
+
+def test_unknown_neighbor_index_is_rejected() -> None:
+    with pytest.raises(ValueError, match="neighbor index"):
+        Simulation(SimulationConfig(neighbor_index="octree"))
@@ -0,0 +1,76 @@
+import copy
+from collections import Counter
+
+import pytest
+
+from sim.model import Creature
+from sim.simulation import Simulation, SimulationConfig
+from sim.stats import PopulationStats
+
+
+def assert_stats_match_population(sim: Simulation) -> None:
+    creatures = sim.creatures
+    assert sim.stats.count == len(creatures)
+    assert sim.stats.total_mass == pytest.approx(sum(creature.mass for creature in creatures))
+    assert sim.stats.max_mass == max(creature.mass for creature in creatures)
+    assert sim.stats.largest.mass == sim.stats.max_mass
+    assert sim.stats.largest in creatures
+    assert sim.stats.food_eaten_histogram == Counter(creature.food_eaten for creature in creatures)
+
+
+def test_stats_follow_feeding_and_predation_during_step() -> None:
+    sim = Simulation(SimulationConfig(width=8.0, height=8.0, creatures=60, food=300, seed=3))
+
+    for _ in range(60):
+        sim.step()
+
+    assert sim.predation_events > 0
+    assert_stats_match_population(sim)
+
+
+def test_stats_follow_adding_and_removing_creatures() -> None:
+    sim = Simulation(SimulationConfig(creatures=3, food=0, seed=1))
+    sim.feed_creature(sim.creatures[-1], 5)
+
+    sim.remove_creature()
+    sim.add_creature()
+    sim.add_creature()
+
+    assert_stats_match_population(sim)
+
+
+def test_recompute_stats_picks_up_changes_made_by_hand() -> None:
+    sim = Simulation(SimulationConfig(creatures=3, food=0, seed=1))
+    sim.creatures[1].mass = 9.0
+    sim.creatures[1].food_eaten = 4
+
+    sim.recompute_stats()
+
+    assert_stats_match_population(sim)
+    assert sim.stats.largest is sim.creatures[1]
+
+
+def test_stats_survive_copies_and_checkpoints() -> None:
+    sim = Simulation(SimulationConfig(creatures=20, food=80, seed=2))
+    for _ in range(10):
+        sim.step()
+
+    copied = copy.deepcopy(sim)
+    copied.step()
+    restored = Simulation.restore(sim.snapshot())
+    restored.step()
+
+    assert_stats_match_population(copied)
+    assert_stats_match_population(restored)
+
+
+def test_largest_skips_creatures_that_were_removed() -> None:
+    small, big = Creature(x=0.0, y=0.0, mass=1.0), Creature(x=0.0, y=0.0, mass=3.0)
+    stats = PopulationStats([small, big])
+
+    stats.remove(big)
+
+    assert stats.largest is small
+    assert stats.count == 1
+    assert stats.total_mass == 1.0
+    assert PopulationStats().max_mass == 0.0
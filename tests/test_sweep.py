@@ -0,0 +1,42 @@
+from io import StringIO
+
+from sim.simulation import SimulationConfig
+from sim.sweep import run_sweep, summarize_run, sweep_configs, write_summaries_csv
+
+
+def test_sweep_configs_cover_every_combination() -> None:
+    configs = sweep_configs(SimulationConfig(), seeds=range(3), speeds=[0.1, 0.2], food=[10, 20])
+
+    assert len(configs) == 12
+    assert [config.seed for config in configs[:3]] == [0, 1, 2]
+    assert {(config.speed, config.food) for config in configs} == {(0.1, 10), (0.1, 20), (0.2, 10), (0.2, 20)}
+
+
+def test_summarize_run_does_not_change_callers_config() -> None:
+    config = SimulationConfig(creatures=5, food=20, seed=3)
+
+    summary = summarize_run(config, ticks=5)
+
+    assert summary.ticks == 5
+    assert summary.final_creatures <= 5
+    assert config.creatures == 5
+
+
+def test_parallel_sweep_matches_serial_order() -> None:
+    configs = sweep_configs(SimulationConfig(creatures=6, food=30), seeds=range(6), speeds=[0.3, 0.8])
+
+    serial = run_sweep(configs, ticks=10, workers=1)
+    parallel = run_sweep(configs, ticks=10, workers=3)
+
+    assert parallel == serial
+    assert [summary.seed for summary in parallel] == [config.seed for config in configs]
+
+
+def test_write_summaries_csv_has_header_and_rows() -> None:
+    out = StringIO()
+
+    write_summaries_csv([summarize_run(SimulationConfig(creatures=2, food=5), ticks=2)], out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith("seed,speed,creatures,food,ticks")
+    assert len(lines) == 2
@@ -0,0 +1,131 @@
+from io import BytesIO
+
+import pytest
+
+from sim.simulation import Simulation, SimulationConfig
+from sim.trajectory import TrajectoryFile, TrajectoryRecorder, read_trajectory, record_run
+
+
+def test_creatures_get_stable_ids_that_survive_removal() -> None:
+    sim = Simulation(SimulationConfig(creatures=3, food=0, seed=7))
+    sim.creatures.pop(0)
+    sim.add_creature()
+
+    assert [creature.id for creature in sim.creatures] == [1, 2, 3]
+
+
+def test_recorder_writes_every_creature_row(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=4, food=10, seed=7))
+    path = tmp_path / "run.traj"
+
+    with open(path, "wb") as out, TrajectoryRecorder(out, chunk_rows=5) as recorder:
+        record_run(sim, ticks=3, recorder=recorder)
+
+    columns = read_trajectory(path)
+    assert list(columns["tick"][:4]) == [0, 0, 0, 0]
+    assert list(columns["tick"])[-1] == 3
+    assert columns["id"][-1] == sim.creatures[-1].id
+    assert columns["x"][-1] == sim.creatures[-1].x
+    assert len(columns["mass"]) == len(columns["food_eaten"])
+
+
+def test_recorder_flushes_whole_ticks_in_chunks() -> None:
+    sim = Simulation(SimulationConfig(creatures=4, food=0, seed=7, speed=0.0))
+    out = BytesIO()
+    recorder = TrajectoryRecorder(out, chunk_rows=10)
+
+    recorder.record(sim)
+    recorder.record(sim)
+    assert recorder.rows == 8
+    recorder.record(sim)
+
+    assert recorder.rows_written == 8
+    assert recorder.rows == 4
+
+
+def test_recorder_stride_skips_ticks(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=2, food=0, seed=7))
+    path = tmp_path / "run.traj"
+
+    with open(path, "wb") as out, TrajectoryRecorder(out, stride=5) as recorder:
+        record_run(sim, ticks=12, recorder=recorder)
+
+    assert sorted(set(read_trajectory(path)["tick"])) == [0, 5, 10]
+
+
+def test_recorder_grows_for_a_tick_bigger_than_a_chunk() -> None:
+    sim = Simulation(SimulationConfig(creatures=7, food=0, seed=7))
+    recorder = TrajectoryRecorder(BytesIO(), chunk_rows=3)
+
+    recorder.record(sim)
+
+    assert recorder.rows == 7
+
+
+def test_recorder_rejects_bad_stride() -> None:
+    with pytest.raises(ValueError, match="stride"):
+        TrajectoryRecorder(BytesIO(), stride=0)
+
+
+def test_trajectory_file_loads_any_tick_with_food(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=5, food=20, seed=7))
+    path = tmp_path / "run.traj"
+    with open(path, "wb") as out, TrajectoryRecorder(out, chunk_rows=12) as recorder:
+        record_run(sim, ticks=10, recorder=recorder)
+
+    with TrajectoryFile(path) as replay:
+        assert len(replay) == 11
+        assert (replay.world.width, replay.world.height) == (sim.world.width, sim.world.height)
+        last = replay.frame(10)
+        assert last.tick == 10
+        assert list(last.xs) == [creature.x for creature in sim.creatures]
+        assert list(last.ids) == [creature.id for creature in sim.creatures]
+        assert [(pellet.x, pellet.y) for pellet in last.food] == [(pellet.x, pellet.y) for pellet in sim.food]
+        assert replay.frame(0).tick == 0
+
+
+def test_closing_a_trajectory_file_releases_live_frames(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=3, food=4, seed=7))
+    path = tmp_path / "run.traj"
+    with open(path, "wb") as out, TrajectoryRecorder(out) as recorder:
+        record_run(sim, ticks=2, recorder=recorder)
+
+    replay = TrajectoryFile(path)
+    frame = replay.frame(1)
+    replay.close()
+
+    with pytest.raises(ValueError):
+        frame.xs[0]
+
+
+def test_trajectory_file_finds_frames_by_tick_with_stride(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=2, food=0, seed=7))
+    path = tmp_path / "run.traj"
+    with open(path, "wb") as out, TrajectoryRecorder(out, stride=5) as recorder:
+        record_run(sim, ticks=12, recorder=recorder)
+
+    with TrajectoryFile(path) as replay:
+        assert list(replay.ticks) == [0, 5, 10]
+        assert replay.position_for_tick(7) == 1
+        assert replay.position_for_tick(100) == 2
+        assert replay.position_for_tick(-3) == 0
+
+
+def test_trajectory_file_finds_frames_by_tick_when_ticks_are_uneven(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(creatures=2, food=0, seed=7))
+    path = tmp_path / "run.traj"
+    with open(path, "wb") as out, TrajectoryRecorder(out) as recorder:
+        for tick in (3, 4, 4, 9):
+            sim.tick = tick
+            recorder.record(sim)
+
+    with TrajectoryFile(path) as replay:
+        assert [replay.position_for_tick(tick) for tick in range(11)] == [0, 0, 0, 0, 2, 2, 2, 2, 2, 3, 3]
+
+
+def test_trajectory_file_rejects_unfinished_file(tmp_path) -> None:
+    path = tmp_path / "broken.traj"
+    path.write_bytes(b"not a trajectory at all, just some bytes")
+
+    with pytest.raises(ValueError, match="not a finished trajectory"):
+        TrajectoryFile(path)
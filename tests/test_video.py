@@ -0,0 +1,53 @@
+import sys
+
+import pygame
+import pytest
+
+from sim import video
+from sim.simulation import Simulation, SimulationConfig
+from sim.video import export_video
+
+
+def test_export_video_writes_numbered_png_frames(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(width=4, height=3, creatures=3, food=5, seed=7))
+
+    frames = export_video(sim, ticks=5, scale=10, radius_px=4, frame_dir=tmp_path, ticks_per_frame=2)
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert frames == 4
+    assert names == ["frame_000000.png", "frame_000001.png", "frame_000002.png", "frame_000003.png"]
+    assert sim.tick == 5
+    assert pygame.image.load(str(tmp_path / names[-1])).get_size() == (40, 30)
+
+
+def test_export_video_streams_raw_frames_to_a_pipe(tmp_path) -> None:
+    sim = Simulation(SimulationConfig(width=4, height=3, creatures=3, food=5, seed=7))
+    out = tmp_path / "raw.rgb"
+    command = f"{sys.executable} -c \"import sys; open(sys.argv[1], 'wb').write(sys.stdin.buffer.read())\" {out}"
+
+    frames = export_video(sim, ticks=3, scale=10, radius_px=4, pipe_command=command)
+
+    assert frames == 4
+    assert out.stat().st_size == frames * 40 * 30 * 3
+
+
+def test_export_video_closes_the_pipe_when_a_write_fails(monkeypatch) -> None:
+    closed = []
+
+    class FailingPipe:
+        def __init__(self, command: str, size: tuple[int, int]) -> None:
+            pass
+
+        def write(self, pixels: bytes) -> None:
+            raise BrokenPipeError("encoder went away")
+
+        def close(self) -> None:
+            closed.append(True)
+
+    monkeypatch.setattr(video, "RawVideoPipe", FailingPipe)
+    sim = Simulation(SimulationConfig(width=4, height=3, creatures=3, food=5, seed=7))
+
+    with pytest.raises(BrokenPipeError):
+        export_video(sim, ticks=3, scale=10, radius_px=4, pipe_command="encoder")
+
+    assert closed == [True]
@@ -0,0 +1,60 @@
+import time
+
+from sim.simulation import Simulation, SimulationConfig
+from sim.worker import SimulationWorker, pack_snapshot, unpack_snapshot
+
+
+def wait_for_tick(worker: SimulationWorker, tick: int, timeout_s: float = 10.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        frame = worker.wait_frame(0.1)
+        if frame is not None and frame.tick >= tick:
+            return frame
+    raise AssertionError(f"worker never reached tick {tick}")
+
+
+def test_snapshot_round_trips_creatures_and_food() -> None:
+    sim = Simulation(SimulationConfig(creatures=5, food=8, seed=7))
+    sim.step()
+
+    frame, ticks_per_second = unpack_snapshot(pack_snapshot(sim, 12.5))
+
+    assert frame.tick == sim.tick
+    assert frame.world == sim.world
+    assert frame.creatures == sim.creatures
+    assert frame.food == sim.food
+    assert ticks_per_second == 12.5
+
+
+def test_worker_publishes_the_same_states_as_stepping_in_process() -> None:
+    config = SimulationConfig(creatures=10, food=40, seed=3)
+    expected = Simulation(config)
+    for _ in range(5):
+        expected.step()
+
+    worker = SimulationWorker(Simulation(config), ticks=5)
+    try:
+        frame = wait_for_tick(worker, 5)
+    finally:
+        worker.close()
+
+    assert frame.creatures == expected.creatures
+    assert frame.food == expected.food
+
+
+def test_worker_applies_forwarded_buttons() -> None:
+    worker = SimulationWorker(Simulation(SimulationConfig(creatures=3, food=5, seed=7)), ticks=0)
+    try:
+        first = worker.wait_frame(10.0)
+        worker.send_button("More Creatures")
+        worker.send_button("Less Food")
+        frame = worker.wait_frame(10.0)
+        while frame is not None and len(frame.ids) == 3:
+            frame = worker.wait_frame(10.0)
+    finally:
+        worker.close()
+
+    assert first is not None and len(first.ids) == 3
+    assert frame is not None
+    assert len(frame.ids) == 4
+    assert len(frame.food_xs) == 4
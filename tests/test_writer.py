@@ -0,0 +1,22 @@
+import threading
+
+import pytest
+
+from sim.writer import BackgroundWriter
+
+
+def test_background_writer_runs_jobs_in_order_off_the_calling_thread() -> None:
+    threads = []
+    with BackgroundWriter(max_pending=2) as writer:
+        for index in range(5):
+            writer.submit(lambda index=index: threads.append(threading.current_thread()) or index)
+    assert writer.completed() == [0, 1, 2, 3, 4]
+    assert threading.current_thread() not in threads
+
+
+def test_background_writer_reraises_job_errors() -> None:
+    writer = BackgroundWriter()
+    writer.submit(lambda: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        writer.close()